@@ -0,0 +1,70 @@
+"""Tempo de importação dos cinco programas, com e sem o Tk.
+
+Cada medida roda num interpretador novo: importa o programa pelas funções
+de domínio (sem abrir janela) e confere se o tkinter foi carregado. Para
+comparar com o comportamento antigo, em que todo programa importava o
+tkinter no topo, mede também a importação seguida de carregar_interface().
+
+    python benchmark_inicializacao.py
+    python benchmark_inicializacao.py --repeticoes 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+PROGRAMAS = (
+    "boletim escolar.py",
+    "calculadora de estética.py",
+    "calculadora de vsm.py",
+    "locadora de veículos.py",
+    "rifa.py",
+)
+
+# roda no interpretador filho: argv = [caminho, carregar_gui]
+_MEDIR = """
+import importlib.util, json, sys, time
+inicio = time.perf_counter()
+spec = importlib.util.spec_from_file_location("programa", sys.argv[1])
+modulo = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(modulo)
+if sys.argv[2] == "1":
+    modulo.carregar_interface()
+segundos = time.perf_counter() - inicio
+print(json.dumps({"segundos": segundos, "tkinter": "tkinter" in sys.modules}))
+"""
+
+def medir(programa, carregar_gui, repeticoes):
+    """Mediana (s) de `repeticoes` importações e se o tkinter ficou carregado."""
+    tempos = []
+    tkinter = False
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-c", _MEDIR, os.path.join(DIRETORIO, programa), "1" if carregar_gui else "0"],
+            cwd=DIRETORIO, capture_output=True, text=True, check=True).stdout
+        resultado = json.loads(saida)
+        tempos.append(resultado["segundos"])
+        tkinter = resultado["tkinter"]
+    return statistics.median(tempos), tkinter
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de importação dos programas, com e sem o Tk.")
+    parser.add_argument("--repeticoes", type=int, default=7, help="interpretadores por medida (padrão 7)")
+    args = parser.parse_args(argv)
+
+    print(f"{'programa':<28} {'domínio':>10} {'com Tk':>10} {'ganho':>10}  tkinter carregado")
+    falhou = False
+    for programa in PROGRAMAS:
+        dominio, carregou = medir(programa, False, args.repeticoes)
+        com_tk, _ = medir(programa, True, args.repeticoes)
+        print(f"{programa:<28} {dominio * 1000:>8.1f}ms {com_tk * 1000:>8.1f}ms {(com_tk - dominio) * 1000:>8.1f}ms"
+              f"  {'sim (ERRO)' if carregou else 'não'}")
+        falhou |= carregou
+    return 1 if falhou else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""Paridade e desempenho das calculadoras de VSM e de potencial estético.
+
+Gera uma grade densa, amostras aleatórias e os pontos de fronteira de cada
+curva de regras_pontuacao.json; confere que o caminho escalar e o vetorizado
+de cada calculadora dão exatamente o mesmo resultado, e que ambos batem com
+as fórmulas escritas à mão que as calculadoras usavam antes de
+regras_pontuacao (congeladas abaixo); mede pontuações por segundo e,
+opcionalmente, grava ou compara com uma linha de base (JSON).
+
+    python benchmark_pontuacao.py
+    python benchmark_pontuacao.py --salvar-baseline baseline_pontuacao.json
+    python benchmark_pontuacao.py --comparar baseline_pontuacao.json
+
+Sai com código 1 se houver divergência, se as pontuações mudarem em relação
+à linha de base ou se o desempenho cair mais que a tolerância.
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+import regras_pontuacao
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+# faixas realistas de entrada: altura (m), peso (kg), gordura (%), ombro e cintura (cm)
+FAIXAS = {
+    "altura": (1.40, 2.20),
+    "peso": (40.0, 150.0),
+    "gordura": (3.0, 45.0),
+    "ombro": (30.0, 70.0),
+    "cintura": (25.0, 70.0),
+}
+TIPICO = {"altura": 1.80, "peso": 80.0, "gordura": 12.0, "ombro": 50.0, "cintura": 40.0}
+COLUNAS = tuple(FAIXAS)
+
+# ===== Referência congelada =====
+# Fórmulas das calculadoras antes de regras_pontuacao.json, copiadas como
+# estavam. Não altere: servem para provar que o motor de regras não mudou
+# nenhuma pontuação.
+
+def referencia_vsm(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
+    """Percentual da calculadora de VSM original, ou None se a entrada é inválida."""
+    try:
+        if altura_m <= 0 or largura_cintura <= 0:
+            raise ZeroDivisionError
+        massa_magra = peso * (100 - percentual_gordura) / 100
+        immf = massa_magra / (altura_m * altura_m)
+        p = largura_ombro / largura_cintura
+    except ZeroDivisionError:
+        return None
+
+    if altura_m < 1.65:
+        pontos_altura = 0.0
+    elif 1.65 <= altura_m <= 1.82:
+        pontos_altura = 2.0 * ((altura_m - 1.65) / (1.82 - 1.65))
+    elif 1.82 < altura_m <= 1.87:
+        pontos_altura = 2.0
+    elif 1.87 < altura_m <= 2.05:
+        pontos_altura = 2.0 * (1.0 - ((altura_m - 1.87) / (2.05 - 1.87)))
+    else:
+        pontos_altura = 0.0
+
+    faixa_gordura = 35.0 - 13.0
+    if percentual_gordura > 35.0:
+        pontos_gordura = 0.0
+    elif 13.0 <= percentual_gordura <= 35.0:
+        pontos_gordura = 3.0 * (1.0 - ((percentual_gordura - 13.0) / faixa_gordura))
+    elif 10.0 <= percentual_gordura < 13.0:
+        pontos_gordura = 3.0
+    elif percentual_gordura < 10.0:
+        pontos_gordura = 3.0 * (1.0 - ((10.0 - percentual_gordura) / faixa_gordura))
+    else:
+        pontos_gordura = 0.0
+
+    if 1.6 <= p <= 1.7:
+        pontos_proporcao = 2.0
+    elif 1.0 <= p < 1.6:
+        pontos_proporcao = 2.0 * ((p - 1.0) / (1.6 - 1.0))
+    else:
+        pontos_proporcao = 0.0
+
+    if immf >= 23.0:
+        pontos_immf = 3.0
+    elif 16.0 <= immf < 23.0:
+        pontos_immf = 3.0 * ((immf - 16.0) / (23.0 - 16.0))
+    else:
+        pontos_immf = 0.0
+
+    pontos_totais = (max(0.0, pontos_altura) + max(0.0, pontos_gordura)
+                     + max(0.0, pontos_immf) + max(0.0, pontos_proporcao))
+    return (pontos_totais / (2.0 + 3.0 + 3.0 + 2.0)) * 100
+
+def referencia_estetica(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
+    """Percentual da calculadora de potencial estético original, ou None."""
+    try:
+        if altura_m <= 0 or largura_cintura <= 0:
+            raise ZeroDivisionError
+        massa_magra = peso * (100 - percentual_gordura) / 100
+        immf = massa_magra / (altura_m ** 2)
+        proporcao = largura_ombro / largura_cintura
+    except ZeroDivisionError:
+        return None
+
+    pontos_altura = max(0, 2 * (1 - abs(altura_m - 1.85) / 1.85))
+    pontos_gordura = max(0, 3 * (1 - abs(percentual_gordura - 12) / 12))
+    pontos_immf = max(0, 3 * (1 - abs(immf - 23) / 23))
+    pontos_proporcao = max(0, 2 * (1 - abs(proporcao - 1.6) / 1.6))
+    pontos_totais = pontos_altura + pontos_gordura + pontos_immf + pontos_proporcao
+    return (pontos_totais / (2 + 3 + 3 + 2)) * 100
+
+REFERENCIAS = {"vsm": referencia_vsm, "estetica": referencia_estetica}
+# o motor interpola as curvas de forma genérica e difere das fórmulas acima
+# só no último ulp (~1e-14 pp); a classificação tem de ser idêntica
+TOLERANCIA_REFERENCIA = 1e-9  # pontos percentuais
+
+def _carregar(arquivo, nome):
+    """Importa um script da pasta (os nomes têm espaços e acentos)."""
+    spec = importlib.util.spec_from_file_location(nome, os.path.join(DIRETORIO, arquivo))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+def _vizinhos(x):
+    return (math.nextafter(x, -math.inf), x, math.nextafter(x, math.inf))
+
+def pontos_de_fronteira():
+    """Linhas que caem exatamente sobre (e a um ulp de) cada ponto de quebra
+    das curvas de todos os modelos, variando uma métrica por vez."""
+    quebras = {m: set() for m in regras_pontuacao.METRICAS}
+    for modelo in regras_pontuacao.carregar_modelos().values():
+        for metrica, curva in modelo.curvas.items():
+            quebras[metrica].update(x for x, _ in curva.pontos)
+
+    linhas = []
+    base = [TIPICO[c] for c in COLUNAS]
+    a, g, c = TIPICO["altura"], TIPICO["gordura"], TIPICO["cintura"]
+    for x in sorted(quebras["altura"]):
+        linhas += [[v] + base[1:] for v in _vizinhos(x)]
+    for x in sorted(quebras["gordura"]):
+        linhas += [base[:2] + [v] + base[3:] for v in _vizinhos(x)]
+    for x in sorted(quebras["immf"]):
+        # peso que leva o IMMF ao ponto de quebra
+        linhas += [[a, v, g] + base[3:] for v in _vizinhos(x * a * a * 100 / (100 - g))]
+    for x in sorted(quebras["proporcao"]):
+        linhas += [base[:3] + [v, c] for v in _vizinhos(x * c)]
+    # entradas inválidas e degeneradas
+    linhas += [[0.0] + base[1:], base[:4] + [0.0], [-1.0] + base[1:], base[:4] + [-5.0]]
+    return np.array(linhas, dtype=float)
+
+def gerar_amostras(pontos_grade=10, aleatorias=200_000, semente=1234):
+    """Grade com `pontos_grade` valores por coluna, amostras uniformes e
+    fronteiras. Devolve um array (n, 5) nas colunas de COLUNAS."""
+    eixos = [np.linspace(ini, fim, pontos_grade) for ini, fim in FAIXAS.values()]
+    grade = np.stack(np.meshgrid(*eixos, indexing="ij"), axis=-1).reshape(-1, len(COLUNAS))
+    rng = np.random.default_rng(semente)
+    baixo, alto = np.array(list(FAIXAS.values())).T
+    aleatorio = rng.uniform(baixo, alto, size=(aleatorias, len(COLUNAS)))
+    return np.concatenate([grade, aleatorio, pontos_de_fronteira()])
+
+def _implementacoes():
+    """{nome: (escalar(linha) -> percentual|None, lote(colunas) -> array de percentuais)}."""
+    vsm = _carregar("calculadora de vsm.py", "calculadora_vsm")
+    estetica = _carregar("calculadora de estética.py", "calculadora_estetica")
+
+    def vsm_escalar(linha):
+        dados, erro = vsm.calcular_pontos(*linha)
+        return None if erro else dados['percentual']
+
+    def estetica_escalar(linha):
+        dados, erro = estetica.calcular_dados(*linha)
+        return None if erro else dados['percentual']
+
+    return {
+        "vsm": (vsm_escalar, lambda colunas: vsm.calcular_pontos_lote(*colunas)['percentual']),
+        "estetica": (estetica_escalar, lambda colunas: estetica.MODELO.pontuar_lote(*colunas)['percentual']),
+    }, vsm
+
+def _cronometrar(funcao, repeticoes=1):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao()
+    return resultado, (time.perf_counter() - inicio) / repeticoes
+
+def _divergencias(linhas, a, b, nome_a, nome_b, exemplos, tolerancia=0.0):
+    """Linhas em que `a` e `b` diferem mais que `tolerancia` (NaN = inválido
+    nos dois conta como igual)."""
+    iguais = (np.abs(a - b) <= tolerancia) | (np.isnan(a) & np.isnan(b))
+    divergentes = np.flatnonzero(~iguais)
+    return {
+        "total": int(divergentes.size),
+        "exemplos": [
+            {"entrada": linhas[i], nome_a: float(a[i]), nome_b: float(b[i])}
+            for i in divergentes[:exemplos]
+        ],
+    }
+
+def _assinatura(valores):
+    """SHA-256 dos bits dos resultados (NaN = inválido), para detectar qualquer mudança."""
+    return hashlib.sha256(np.ascontiguousarray(valores, dtype="<f8").tobytes()).hexdigest()
+
+def executar(amostras, repeticoes_lote=5, exemplos=5):
+    """Confere a paridade e mede o desempenho. Devolve o relatório (dict)."""
+    linhas = amostras.tolist()
+    colunas = amostras.T
+    implementacoes, vsm = _implementacoes()
+    relatorio = {"amostras": len(linhas), "por_segundo": {}, "assinaturas": {}, "divergencias": {}}
+
+    percentuais = {}
+    for nome, (escalar, lote) in implementacoes.items():
+        res_escalar, t_escalar = _cronometrar(lambda: [escalar(l) for l in linhas])
+        res_lote, t_lote = _cronometrar(lambda: lote(colunas), repeticoes_lote)
+        res_escalar = np.array([math.nan if r is None else r for r in res_escalar])
+
+        relatorio["divergencias"][nome] = _divergencias(linhas, res_escalar, res_lote,
+                                                        "escalar", "lote", exemplos)
+        referencia = REFERENCIAS[nome]
+        res_referencia = [referencia(*l) for l in linhas]
+        res_referencia = np.array([math.nan if r is None else r for r in res_referencia])
+        relatorio["divergencias"][f"{nome}_referencia"] = _divergencias(
+            linhas, res_referencia, res_escalar, "referencia", "calculadora", exemplos,
+            TOLERANCIA_REFERENCIA)
+        relatorio["por_segundo"][f"{nome}_escalar"] = len(linhas) / t_escalar
+        relatorio["por_segundo"][f"{nome}_lote"] = len(linhas) / t_lote
+        relatorio["assinaturas"][nome] = _assinatura(res_escalar)
+        percentuais[nome] = res_escalar
+
+    # a classificação vetorizada precisa coincidir com a escalar
+    pct = percentuais["vsm"]
+    classes_lote = vsm.classificar_potencial_lote(pct)
+    classes_escalar = ["" if math.isnan(p) else vsm.classificar_potencial(p) for p in pct.tolist()]
+    relatorio["divergencias"]["vsm_classificacao"] = {
+        "total": int(sum(a != b for a, b in zip(classes_escalar, classes_lote.tolist()))),
+        "exemplos": [],
+    }
+    # ... e as diferenças de ulp em relação à referência não podem mudar a faixa
+    classes_referencia = ["" if r is None else vsm.classificar_potencial(r)
+                          for r in (referencia_vsm(*l) for l in linhas)]
+    relatorio["divergencias"]["vsm_classificacao_referencia"] = {
+        "total": int(sum(a != b for a, b in zip(classes_escalar, classes_referencia))),
+        "exemplos": [],
+    }
+
+    # as duas calculadoras discordam por definição; registra o quanto
+    validos = ~np.isnan(percentuais["vsm"])
+    diferenca = percentuais["vsm"][validos] - percentuais["estetica"][validos]
+    relatorio["vsm_menos_estetica"] = {
+        "media": float(diferenca.mean()),
+        "media_absoluta": float(np.abs(diferenca).mean()),
+        "maxima_absoluta": float(np.abs(diferenca).max()),
+    }
+    return relatorio
+
+def comparar(relatorio, baseline, tolerancia):
+    """Lista de problemas em relação à linha de base."""
+    problemas = []
+    if baseline.get("amostras") != relatorio["amostras"]:
+        problemas.append(f"baseline com {baseline.get('amostras')} amostras, execução com {relatorio['amostras']}"
+                         " (use os mesmos parâmetros)")
+    for nome, assinatura in baseline.get("assinaturas", {}).items():
+        if relatorio["assinaturas"].get(nome) != assinatura:
+            problemas.append(f"pontuações de '{nome}' mudaram em relação à baseline")
+    for nome, taxa in baseline.get("por_segundo", {}).items():
+        atual = relatorio["por_segundo"].get(nome)
+        if atual is not None and atual < taxa * (1 - tolerancia):
+            problemas.append(f"'{nome}' caiu de {taxa:,.0f} para {atual:,.0f} pontuações/s")
+    return problemas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paridade e desempenho das calculadoras.")
+    parser.add_argument("--grade", type=int, default=10, help="valores por coluna na grade (padrão 10)")
+    parser.add_argument("--aleatorias", type=int, default=200_000, help="amostras aleatórias (padrão 200000)")
+    parser.add_argument("--semente", type=int, default=1234)
+    parser.add_argument("--salvar-baseline", metavar="ARQUIVO")
+    parser.add_argument("--comparar", metavar="ARQUIVO")
+    parser.add_argument("--tolerancia", type=float, default=0.3,
+                        help="queda de desempenho aceita em relação à baseline (padrão 0.3 = 30%%)")
+    args = parser.parse_args(argv)
+
+    amostras = gerar_amostras(args.grade, args.aleatorias, args.semente)
+    relatorio = executar(amostras)
+    relatorio["parametros"] = {"grade": args.grade, "aleatorias": args.aleatorias, "semente": args.semente}
+    relatorio["ambiente"] = {"python": platform.python_version(), "numpy": np.__version__,
+                             "maquina": platform.machine()}
+
+    print(f"{relatorio['amostras']} amostras")
+    for nome, taxa in relatorio["por_segundo"].items():
+        print(f"  {nome:<20} {taxa:>14,.0f} pontuações/s")
+    falhou = False
+    for nome, d in relatorio["divergencias"].items():
+        print(f"  paridade {nome:<28} {'OK' if d['total'] == 0 else str(d['total']) + ' divergências'}")
+        for exemplo in d["exemplos"]:
+            print(f"    {exemplo}")
+        falhou |= d["total"] > 0
+    dif = relatorio["vsm_menos_estetica"]
+    print(f"  VSM - estética: média {dif['media']:+.2f} pp, média absoluta {dif['media_absoluta']:.2f} pp,"
+          f" máxima {dif['maxima_absoluta']:.2f} pp")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            problemas = comparar(relatorio, json.load(f), args.tolerancia)
+        for problema in problemas:
+            print(f"  REGRESSÃO: {problema}")
+        if not problemas:
+            print("  sem regressões em relação à baseline")
+        falhou |= bool(problemas)
+
+    if args.salvar_baseline:
+        with open(args.salvar_baseline, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"baseline gravada em {args.salvar_baseline}")
+    return 1 if falhou else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
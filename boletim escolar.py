@@ -1,6 +1,16 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
 from datetime import datetime
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import functools
+import itertools
+import json
+import math
+import os
+import queue
+import threading
+import time
 
 # ==========================
 # Dados/Modelo (Listas e Dicionários)
@@ -32,6 +42,97 @@ CLASSES = [
 # }
 ALUNOS: dict[str, dict] = {}
 
+# Histórico acadêmico (anos letivos fechados), chave (nome_curto, sequência).
+# A sequência cresce a cada fechamento, então repetir uma classe (reprovação,
+# volta de classe) gera um ano novo em vez de sobrescrever o anterior.
+# Cada ano fechado é guardado de forma compacta:
+# {
+#   "classe": str, "seq": int,
+#   "materias": (str, ...),             # ordem das matérias
+#   "notas": array("d"),                # 4 notas por matéria, NaN = sem nota
+#   "medias": array("d"),               # média final por matéria, NaN = sem notas
+#   "status": str, "abaixo7": int,      # status pré-calculado do ano
+#   "fechado_em": str (AAAA-MM-DD)
+# }
+HISTORICO: dict[tuple[str, int], dict] = {}
+
+# Índice aluno -> sequências dos anos fechados, na ordem em que foram fechados
+_HISTORICO_POR_ALUNO: dict[str, list[int]] = {}
+_SEQ_HISTORICO = itertools.count(1)
+
+# ==========================
+# Instrumentação (opcional)
+# ==========================
+# Ative com a variável de ambiente BOLETIM_PERFIL=1. Desativada, o decorador
+# devolve a própria função e não há custo algum por chamada.
+
+PERFIL_ATIVO = os.environ.get("BOLETIM_PERFIL", "") not in ("", "0")
+TAMANHO_BUFFER_PERFIL = 1024
+
+# nome -> {"chamadas": int, "total": float (s), "recentes": deque[float] (s)}
+_PERFIL: dict[str, dict] = {}
+_PERFIL_LOCK = threading.Lock()
+
+
+def instrumentar(func):
+    if not PERFIL_ATIVO:
+        return func
+    # as classes da interface são definidas dentro de carregar_interface();
+    # a chave fica "BoletimApp._desenhar_boletim", sem o prefixo "<locals>"
+    chave = func.__qualname__.rpartition("<locals>.")[2]
+    reg = _PERFIL.setdefault(chave, {
+        "chamadas": 0, "total": 0.0, "recentes": deque(maxlen=TAMANHO_BUFFER_PERFIL)
+    })
+
+    @functools.wraps(func)
+    def medido(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            dt = time.perf_counter() - t0
+            with _PERFIL_LOCK:
+                reg["chamadas"] += 1
+                reg["total"] += dt
+                reg["recentes"].append(dt)
+    return medido
+
+
+def _percentil(ordenados: list[float], p: float) -> float:
+    if not ordenados:
+        return 0.0
+    k = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[k]
+
+
+def resumo_perfil() -> dict[str, dict]:
+    """Por função: chamadas, tempo acumulado e p50/p95/p99 das chamadas recentes (ms)."""
+    with _PERFIL_LOCK:
+        copia = {n: (r["chamadas"], r["total"], sorted(r["recentes"])) for n, r in _PERFIL.items()}
+    return {
+        nome: {
+            "chamadas": chamadas,
+            "total_ms": total * 1000,
+            "p50_ms": _percentil(recentes, 50) * 1000,
+            "p95_ms": _percentil(recentes, 95) * 1000,
+            "p99_ms": _percentil(recentes, 99) * 1000,
+        }
+        for nome, (chamadas, total, recentes) in sorted(copia.items())
+    }
+
+
+def salvar_perfil_json(caminho: str):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resumo_perfil(), f, ensure_ascii=False, indent=2)
+
+
+def zerar_perfil():
+    with _PERFIL_LOCK:
+        for r in _PERFIL.values():
+            r["chamadas"] = 0
+            r["total"] = 0.0
+            r["recentes"].clear()
+
 # ==========================
 # Funções de domínio (CRUD e regras)
 # ==========================
@@ -73,6 +174,7 @@ def incluir_aluno(nome_curto: str, nome_completo: str, idade: int,
 def excluir_aluno(nome_curto: str):
     if nome_curto in ALUNOS:
         del ALUNOS[nome_curto]
+        excluir_historico(nome_curto)
     else:
         raise KeyError("Aluno não encontrado.")
 
@@ -101,6 +203,7 @@ def excluir_materia_opcional(nome_curto: str, materia: str):
         del a["boletim"][materia]
 
 
+@instrumentar
 def set_nota(nome_curto: str, materia: str, bimestre: int, nota: float | None):
     if nome_curto not in ALUNOS:
         raise KeyError("Aluno não encontrado.")
@@ -118,6 +221,7 @@ def excluir_nota(nome_curto: str, materia: str, bimestre: int):
     set_nota(nome_curto, materia, bimestre, None)
 
 
+@instrumentar
 def media_materia(registro_materia: dict) -> float | None:
     notas = [registro_materia.get(f"b{i}") for i in range(1, 5)]
     notas_presentes = [n for n in notas if n is not None]
@@ -126,6 +230,7 @@ def media_materia(registro_materia: dict) -> float | None:
     return sum(notas_presentes) / len(notas_presentes)
 
 
+@instrumentar
 def status_aluno(nome_curto: str) -> tuple[str, int]:
     """Retorna (status, qtd_materias_abaixo_7).
     Aprovado: nenhuma média < 7
@@ -135,9 +240,12 @@ def status_aluno(nome_curto: str) -> tuple[str, int]:
     if nome_curto not in ALUNOS:
         raise KeyError("Aluno não encontrado.")
     a = ALUNOS[nome_curto]
+    return _status_por_medias(media_materia(r) for r in a["boletim"].values())
+
+
+def _status_por_medias(medias) -> tuple[str, int]:
     abaixo7 = 0
-    for materia, registros in a["boletim"].items():
-        m = media_materia(registros)
+    for m in medias:
         if m is not None and m < 7:
             abaixo7 += 1
     if abaixo7 == 0:
@@ -148,475 +256,1077 @@ def status_aluno(nome_curto: str) -> tuple[str, int]:
         return ("ALUNO REPROVADO", abaixo7)
 
 
+@instrumentar
 def materias_do_aluno(nome_curto: str) -> list[str]:
-    a = ALUNOS[nome_curto]
+    return _materias_do_registro(ALUNOS[nome_curto])
+
+
+def _materias_do_registro(a: dict) -> list[str]:
     base = _materias_da_classe(a["classe"])
     # Garantir união com opcionais já existentes no boletim
     extras = [m for m in a["boletim"].keys() if m not in base]
     return base + sorted(set(extras))
 
 # ==========================
-# Interface Tkinter
+# Histórico acadêmico (multi-anos)
 # ==========================
 
-class BoletimApp(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("Boletim Escolar – Tkinter")
-        self.geometry("1080x680")
-        self.minsize(980, 620)
-
-        self._build_ui()
-
-    # ---------- UI Builders ----------
-    def _build_ui(self):
-        nb = ttk.Notebook(self)
-        nb.pack(fill=tk.BOTH, expand=True)
-
-        self.tab_alunos = ttk.Frame(nb)
-        self.tab_notas = ttk.Frame(nb)
-        self.tab_boletim = ttk.Frame(nb)
-
-        nb.add(self.tab_alunos, text="Alunos")
-        nb.add(self.tab_notas, text="Notas")
-        nb.add(self.tab_boletim, text="Boletim")
-
-        self._build_tab_alunos()
-        self._build_tab_notas()
-        self._build_tab_boletim()
-
-    def _build_tab_alunos(self):
-        frm = self.tab_alunos
-
-        # Esquerda: Lista de alunos
-        left = ttk.Frame(frm)
-        left.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=8, pady=8)
-
-        ttk.Label(left, text="Alunos (selecione para editar)").pack(anchor=tk.W)
-        self.lb_alunos = tk.Listbox(left, height=20)
-        self.lb_alunos.pack(fill=tk.BOTH, expand=True)
-        self.lb_alunos.bind("<<ListboxSelect>>", self._on_select_aluno)
-
-        btns_left = ttk.Frame(left)
-        btns_left.pack(fill=tk.X, pady=(6, 0))
-        ttk.Button(btns_left, text="Excluir Aluno", command=self._excluir_aluno).pack(side=tk.LEFT)
-
-        # Direita: Formulário
-        right = ttk.Frame(frm)
-        right.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=8, pady=8)
-
-        frm_form = ttk.LabelFrame(right, text="Cadastro/Atualização de Aluno")
-        frm_form.pack(fill=tk.X, padx=4, pady=4)
-
-        # Linha 1
-        row = ttk.Frame(frm_form)
-        row.pack(fill=tk.X, pady=2)
-        ttk.Label(row, text="Nome curto (chave):").grid(row=0, column=0, sticky=tk.W, padx=4)
-        self.ent_nome = ttk.Entry(row, width=20)
-        self.ent_nome.grid(row=0, column=1, sticky=tk.W)
-
-        ttk.Label(row, text="Nome completo:").grid(row=0, column=2, sticky=tk.W, padx=12)
-        self.ent_nome_completo = ttk.Entry(row)
-        self.ent_nome_completo.grid(row=0, column=3, sticky=tk.EW)
-        row.columnconfigure(3, weight=1)
-
-        # Linha 2
-        row2 = ttk.Frame(frm_form)
-        row2.pack(fill=tk.X, pady=2)
-        ttk.Label(row2, text="Idade:").grid(row=0, column=0, sticky=tk.W, padx=4)
-        self.ent_idade = ttk.Entry(row2, width=8)
-        self.ent_idade.grid(row=0, column=1, sticky=tk.W)
-
-        ttk.Label(row2, text="Pais/Responsáveis (opcional):").grid(row=0, column=2, sticky=tk.W, padx=12)
-        self.ent_pais = ttk.Entry(row2)
-        self.ent_pais.grid(row=0, column=3, sticky=tk.EW)
-        row2.columnconfigure(3, weight=1)
-
-        # Linha 3
-        row3 = ttk.Frame(frm_form)
-        row3.pack(fill=tk.X, pady=2)
-        ttk.Label(row3, text="Aniversário (DD/MM/AAAA, opcional):").grid(row=0, column=0, sticky=tk.W, padx=4)
-        self.ent_aniv = ttk.Entry(row3, width=14)
-        self.ent_aniv.grid(row=0, column=1, sticky=tk.W)
-
-        ttk.Label(row3, text="Classe:").grid(row=0, column=2, sticky=tk.W, padx=12)
-        self.cmb_classe = ttk.Combobox(row3, values=[c["classe"] for c in CLASSES], state="readonly")
-        self.cmb_classe.grid(row=0, column=3, sticky=tk.W)
-        self.cmb_classe.current(0)
-
-        # Botões
-        btns = ttk.Frame(frm_form)
-        btns.pack(fill=tk.X, pady=6)
-        ttk.Button(btns, text="Incluir / Atualizar", command=self._incluir_ou_atualizar_aluno).pack(side=tk.LEFT)
-
-        # Materias Opcionais
-        frm_opc = ttk.LabelFrame(right, text="Matérias Opcionais do Aluno Selecionado")
-        frm_opc.pack(fill=tk.BOTH, expand=True, padx=4, pady=6)
-
-        top_opc = ttk.Frame(frm_opc)
-        top_opc.pack(fill=tk.X, pady=4)
-        ttk.Label(top_opc, text="Nova matéria opcional:").pack(side=tk.LEFT)
-        self.ent_materia_opc = ttk.Entry(top_opc)
-        self.ent_materia_opc.pack(side=tk.LEFT, padx=6)
-        ttk.Button(top_opc, text="Adicionar", command=self._adicionar_materia_opc).pack(side=tk.LEFT)
-        ttk.Button(top_opc, text="Remover selecionada", command=self._remover_materia_opc).pack(side=tk.LEFT, padx=6)
-
-        self.lb_materias_opc = tk.Listbox(frm_opc, height=8)
-        self.lb_materias_opc.pack(fill=tk.BOTH, expand=True)
-
-    def _build_tab_notas(self):
-        frm = self.tab_notas
-
-        top = ttk.Frame(frm)
-        top.pack(fill=tk.X, padx=8, pady=8)
-
-        ttk.Label(top, text="Aluno:").pack(side=tk.LEFT)
-        self.cmb_aluno_notas = ttk.Combobox(top, values=[], state="readonly")
-        self.cmb_aluno_notas.pack(side=tk.LEFT, padx=6)
-        self.cmb_aluno_notas.bind("<<ComboboxSelected>>", self._on_select_aluno_notas)
-
-        ttk.Label(top, text="Matéria:").pack(side=tk.LEFT, padx=(16, 0))
-        self.cmb_materia = ttk.Combobox(top, values=[], state="readonly", width=24)
-        self.cmb_materia.pack(side=tk.LEFT, padx=6)
-
-        ttk.Label(top, text="Bimestre:").pack(side=tk.LEFT, padx=(16, 0))
-        self.cmb_bim = ttk.Combobox(top, values=[1, 2, 3, 4], state="readonly", width=5)
-        self.cmb_bim.pack(side=tk.LEFT, padx=6)
-        self.cmb_bim.current(0)
-
-        ttk.Label(top, text="Nota:").pack(side=tk.LEFT, padx=(16, 0))
-        self.ent_nota = ttk.Entry(top, width=8)
-        self.ent_nota.pack(side=tk.LEFT, padx=6)
-
-        ttk.Button(top, text="Incluir/Atualizar Nota", command=self._incluir_nota).pack(side=tk.LEFT, padx=(16, 6))
-        ttk.Button(top, text="Excluir Nota", command=self._excluir_nota).pack(side=tk.LEFT)
-
-        # Tabela simples das notas da matéria selecionada
-        self.frm_grid_notas = ttk.LabelFrame(frm, text="Notas da Matéria (bimestres)")
-        self.frm_grid_notas.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
-
-        self.grid_labels = []  # [(row_labels)] para redesenho
-
-    def _build_tab_boletim(self):
-        frm = self.tab_boletim
-
-        top = ttk.Frame(frm)
-        top.pack(fill=tk.X, padx=8, pady=8)
-
-        ttk.Label(top, text="Aluno:").pack(side=tk.LEFT)
-        self.cmb_aluno_boletim = ttk.Combobox(top, values=[], state="readonly")
-        self.cmb_aluno_boletim.pack(side=tk.LEFT, padx=6)
-        self.cmb_aluno_boletim.bind("<<ComboboxSelected>>", self._desenhar_boletim)
-
-        self.lbl_status = ttk.Label(top, text="", font=("Segoe UI", 11, "bold"))
-        self.lbl_status.pack(side=tk.RIGHT)
-
-        self.canvas_boletim = tk.Canvas(frm)
-        self.canvas_boletim.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
-
-        self.inner_boletim = ttk.Frame(self.canvas_boletim)
-        self.canvas_boletim.create_window((0, 0), window=self.inner_boletim, anchor="nw")
-
-        self.inner_boletim.bind("<Configure>", lambda e: self.canvas_boletim.configure(scrollregion=self.canvas_boletim.bbox("all")))
-
-    # ---------- Helpers UI ----------
-    def _refresh_comboboxes(self):
-        alunos = sorted(ALUNOS.keys())
-        for cmb in (self.cmb_aluno_notas, self.cmb_aluno_boletim):
-            sel = cmb.get()
-            cmb["values"] = alunos
-            if sel in alunos:
-                cmb.set(sel)
-            elif alunos:
-                cmb.current(0)
-
-    def _refresh_lista_alunos(self):
-        self.lb_alunos.delete(0, tk.END)
-        for k in sorted(ALUNOS.keys()):
-            a = ALUNOS[k]
-            self.lb_alunos.insert(tk.END, f"{a['nome']} – {a['nome_completo']} ({a['classe']})")
-
-    def _get_selected_aluno_key(self) -> str | None:
-        sel = self.lb_alunos.curselection()
-        if not sel:
-            return None
-        texto = self.lb_alunos.get(sel[0])
-        # antes do ' – ' está o nome curto
-        key = texto.split(" – ")[0]
-        return key
-
-    def _carregar_aluno_no_form(self, key: str):
-        a = ALUNOS[key]
-        self.ent_nome.delete(0, tk.END); self.ent_nome.insert(0, a["nome"])
-        self.ent_nome_completo.delete(0, tk.END); self.ent_nome_completo.insert(0, a["nome_completo"])
-        self.ent_idade.delete(0, tk.END); self.ent_idade.insert(0, str(a["idade"]))
-        self.ent_pais.delete(0, tk.END); self.ent_pais.insert(0, a["pais"]) 
-        self.ent_aniv.delete(0, tk.END); self.ent_aniv.insert(0, a["aniversario"]) 
+def _ordem_classe(classe: str) -> int:
+    for i, c in enumerate(CLASSES):
+        if c["classe"] == classe:
+            return i
+    return len(CLASSES)
+
+
+def _nota_ou_nan(v: float | None) -> float:
+    return math.nan if v is None else float(v)
+
+
+def _nan_ou_nota(v: float) -> float | None:
+    return None if math.isnan(v) else v
+
+
+def fechar_ano(nome_curto: str, proxima_classe: str | None = None):
+    """Arquiva o boletim da classe atual no histórico (forma compacta).
+    Médias e status do ano são calculados uma única vez, aqui.
+    Se `proxima_classe` for informada, o aluno passa para ela com boletim novo.
+    """
+    if nome_curto not in ALUNOS:
+        raise KeyError("Aluno não encontrado.")
+    if proxima_classe is not None and _ordem_classe(proxima_classe) >= len(CLASSES):
+        raise ValueError("Classe inválida.")
+    a = ALUNOS[nome_curto]
+    classe = a["classe"]
+
+    materias = tuple(materias_do_aluno(nome_curto))
+    notas = array("d")
+    medias = array("d")
+    medias_py = []
+    for materia in materias:
+        reg = a["boletim"].get(materia, {})
+        notas.extend(_nota_ou_nan(reg.get(f"b{i}")) for i in range(1, 5))
+        m = media_materia(reg)
+        medias.append(_nota_ou_nan(m))
+        medias_py.append(m)
+    st, q = _status_por_medias(medias_py)
+
+    seq = next(_SEQ_HISTORICO)
+    HISTORICO[(nome_curto, seq)] = {
+        "classe": classe,
+        "seq": seq,
+        "materias": materias,
+        "notas": notas,
+        "medias": medias,
+        "status": st,
+        "abaixo7": q,
+        "fechado_em": datetime.now().strftime("%Y-%m-%d"),
+    }
+    _HISTORICO_POR_ALUNO.setdefault(nome_curto, []).append(seq)
+
+    if proxima_classe is not None:
+        a["classe"] = proxima_classe
+        a["boletim"] = _cria_boletim_inicial(proxima_classe, a["materias_opc"])
+
+
+def boletim_do_historico(nome_curto: str, seq: int) -> dict:
+    """Reconstrói o boletim (mesmo formato de ALUNOS[...]["boletim"]) de um ano
+    fechado, identificado pela sequência vista em historico_aluno()."""
+    reg = HISTORICO.get((nome_curto, seq))
+    if reg is None:
+        raise KeyError("Ano não encontrado no histórico.")
+    notas = reg["notas"]
+    return {
+        m: {f"b{i + 1}": _nan_ou_nota(notas[j * 4 + i]) for i in range(4)}
+        for j, m in enumerate(reg["materias"])
+    }
+
+
+def historico_aluno(nome_curto: str, incluir_atual: bool = True) -> list[dict]:
+    """Linha do tempo do aluno, do ano mais antigo ao mais recente.
+    Anos fechados usam médias/status pré-calculados (não relê as notas).
+    Cada item: {"classe", "fechado", "seq" (None no ano em curso), "status",
+    "abaixo7", "medias": {materia: média|None}}
+    """
+    if nome_curto not in ALUNOS and nome_curto not in _HISTORICO_POR_ALUNO:
+        raise KeyError("Aluno não encontrado.")
+    linha = []
+    for seq in _HISTORICO_POR_ALUNO.get(nome_curto, []):
+        reg = HISTORICO[(nome_curto, seq)]
+        linha.append({
+            "classe": reg["classe"],
+            "fechado": True,
+            "seq": seq,
+            "status": reg["status"],
+            "abaixo7": reg["abaixo7"],
+            "medias": {m: _nan_ou_nota(v) for m, v in zip(reg["materias"], reg["medias"])},
+        })
+    if incluir_atual and nome_curto in ALUNOS:
+        a = ALUNOS[nome_curto]
+        st, q = status_aluno(nome_curto)
+        linha.append({
+            "classe": a["classe"],
+            "fechado": False,
+            "seq": None,
+            "status": st,
+            "abaixo7": q,
+            "medias": {m: media_materia(a["boletim"].get(m, {})) for m in materias_do_aluno(nome_curto)},
+        })
+    return linha
+
+
+def excluir_historico(nome_curto: str):
+    for seq in _HISTORICO_POR_ALUNO.pop(nome_curto, []):
+        HISTORICO.pop((nome_curto, seq), None)
+
+# ==========================
+# Operações em lote (podem rodar em segundo plano)
+# ==========================
+# Todas aceitam `progresso(feitos, total)`; quem executa pode interromper a
+# operação levantando TarefaCancelada dentro desse callback.
+# As que rodam num thread não tocam em ALUNOS: a leitura do CSV só interpreta
+# as linhas (aplicar_notas grava no thread do Tk) e a exportação e as
+# estatísticas leem um instantaneo_alunos() tirado no thread do Tk.
+
+COLUNAS_CSV_NOTAS = ["nome", "nome_completo", "idade", "classe", "materia", "bimestre", "nota"]
+
+
+def ler_notas_csv(caminho: str, progresso=None) -> tuple[list[tuple], list[str]]:
+    """Lê e valida um CSV de notas com cabeçalho (separador ',' ou ';'):
+    nome, nome_completo, idade, classe, materia, bimestre, nota
+    Não altera ALUNOS. Retorna (linhas, erros); cada linha é
+    (nº da linha, nome, nome_completo, idade, classe, materia, bimestre, nota).
+    """
+    # utf-8-sig: o CSV salvo pelo Excel começa com BOM, que grudaria em "nome"
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        amostra = f.read(4096)
+        f.seek(0)
         try:
-            idx = [c["classe"] for c in CLASSES].index(a["classe"]) 
-        except ValueError:
-            idx = 0
-        self.cmb_classe.current(idx)
-        # materias opcionais
-        self.lb_materias_opc.delete(0, tk.END)
-        for m in a["materias_opc"]:
-            self.lb_materias_opc.insert(tk.END, m)
-
-    def _on_select_aluno(self, _evt=None):
-        key = self._get_selected_aluno_key()
-        if key:
-            self._carregar_aluno_no_form(key)
-            self._refresh_comboboxes()
-            # também atualiza combo de matérias na aba Notas, se aluno estiver selecionado
-            self._update_materias_combo_for_aluno(key)
-
-    def _update_materias_combo_for_aluno(self, key: str):
-        mats = materias_do_aluno(key)
-        self.cmb_materia["values"] = mats
-        if mats:
-            self.cmb_materia.current(0)
-        self._desenha_grid_notas()
-
-    # ---------- Ações (callbacks) ----------
-    def _incluir_ou_atualizar_aluno(self):
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=",;") if amostra else csv.excel
+        except csv.Error:  # uma coluna só, ou amostra sem separador reconhecível
+            dialeto = csv.excel
+        leitor = csv.DictReader(f, dialect=dialeto)
+        if "nome" not in (leitor.fieldnames or []):
+            return [], ["Linha 1: coluna 'nome' ausente no cabeçalho."]
+        registros = list(leitor)
+
+    total = len(registros)
+    linhas = []
+    erros = []
+    for i, ln in enumerate(registros, start=1):
+        try:
+            if not (ln.get("nome") or "").strip():
+                raise ValueError("Nome vazio.")
+            nota_txt = (ln.get("nota") or "").strip().replace(",", ".")
+            nota = float(nota_txt) if nota_txt else None
+            if nota is not None and (nota < 0 or nota > 10):
+                raise ValueError("Nota deve estar entre 0 e 10.")
+            linhas.append((i + 1, (ln.get("nome") or "").strip(), (ln.get("nome_completo") or "").strip(),
+                           int(ln.get("idade") or 0), (ln.get("classe") or "").strip(),
+                           (ln.get("materia") or "").strip(), int(ln.get("bimestre") or 0), nota))
+        except ValueError as e:
+            erros.append(f"Linha {i + 1}: {e}")
+        if progresso:
+            progresso(i, total)
+    return linhas, erros
+
+
+def aplicar_notas(linhas: list[tuple]) -> tuple[int, list[str]]:
+    """Grava as linhas de ler_notas_csv; alunos inexistentes são incluídos.
+    Retorna (linhas_importadas, erros)."""
+    importadas = 0
+    erros = []
+    for num, nome, nome_completo, idade, classe, materia, bimestre, nota in linhas:
         try:
-            nome = self.ent_nome.get().strip()
-            nome_completo = self.ent_nome_completo.get().strip()
-            idade_txt = self.ent_idade.get().strip()
-            idade = int(idade_txt)
-            pais = self.ent_pais.get().strip()
-            aniversario = self.ent_aniv.get().strip()
-            classe = self.cmb_classe.get()
-
-            if nome in ALUNOS:
-                # atualizar
-                a = ALUNOS[nome]
-                a["nome_completo"] = nome_completo or a["nome_completo"]
-                a["idade"] = idade
-                a["pais"] = pais
-                a["aniversario"] = aniversario
-                if classe != a["classe"]:
-                    # mudou de classe -> reconstruir boletim com matérias da nova classe + opcionais atuais
-                    a["classe"] = classe
-                    a["boletim"] = _cria_boletim_inicial(classe, a["materias_opc"])
-                messagebox.showinfo("OK", "Aluno atualizado.")
-            else:
-                incluir_aluno(nome, nome_completo, idade, classe, pais, aniversario)
-                messagebox.showinfo("OK", "Aluno incluído.")
+            if nome not in ALUNOS:
+                incluir_aluno(nome, nome_completo, idade, classe)
+            if materia:
+                set_nota(nome, materia, bimestre, nota)
+            importadas += 1
+        except (ValueError, KeyError) as e:
+            erros.append(f"Linha {num}: {e}")
+    return importadas, erros
+
+
+def importar_notas_csv(caminho: str, progresso=None) -> tuple[int, list[str]]:
+    """Lê e grava um CSV de notas no mesmo thread. Retorna (linhas_importadas, erros)."""
+    linhas, erros_leitura = ler_notas_csv(caminho, progresso)
+    importadas, erros = aplicar_notas(linhas)
+    return importadas, _erros_por_linha(erros_leitura + erros)
+
+
+def _erros_por_linha(erros: list[str]) -> list[str]:
+    """Ordena mensagens "Linha N: ..." pelo número da linha."""
+    return sorted(erros, key=lambda e: int(e.split()[1].rstrip(":")))
+
+
+def instantaneo_alunos() -> list[dict]:
+    """Cópia dos alunos (boletins inclusive) para uma tarefa em segundo plano
+    ler sem disputar os dicionários com a interface."""
+    return [{**a, "materias_opc": list(a["materias_opc"]),
+             "boletim": {m: dict(reg) for m, reg in a["boletim"].items()}}
+            for a in ALUNOS.values()]
+
+
+def exportar_boletins_csv(caminho: str, progresso=None, alunos: list[dict] | None = None) -> int:
+    """Exporta o boletim atual de todos os alunos (uma linha por matéria). Retorna o nº de linhas.
+    `alunos` é um instantaneo_alunos(); sem ele lê ALUNOS diretamente."""
+    alunos = list(ALUNOS.values()) if alunos is None else alunos
+    total = len(alunos)
+    linhas = 0
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter=";")
+        w.writerow(["nome", "classe", "materia", "b1", "b2", "b3", "b4", "media", "status"])
+        for i, a in enumerate(alunos, start=1):
+            st, _ = _status_por_medias(media_materia(r) for r in a["boletim"].values())
+            for materia in _materias_do_registro(a):
+                reg = a["boletim"].get(materia, {})
+                med = media_materia(reg)
+                w.writerow([a["nome"], a["classe"], materia]
+                           + ["" if reg.get(f"b{b}") is None else f"{reg[f'b{b}']:.1f}" for b in range(1, 5)]
+                           + ["" if med is None else f"{med:.2f}", st])
+                linhas += 1
+            if progresso:
+                progresso(i, total)
+    return linhas
+
+
+def estatisticas_alunos(progresso=None, alunos: list[dict] | None = None) -> dict:
+    """Estatísticas gerais: alunos por status e por classe, média por matéria.
+    `alunos` é um instantaneo_alunos(); sem ele lê ALUNOS diretamente."""
+    alunos = list(ALUNOS.values()) if alunos is None else alunos
+    total = len(alunos)
+    por_status: dict[str, int] = {}
+    por_classe: dict[str, int] = {}
+    somas: dict[str, list[float]] = {}  # materia -> [soma, qtd]
+    for i, a in enumerate(alunos, start=1):
+        st, _ = _status_por_medias(media_materia(r) for r in a["boletim"].values())
+        por_status[st] = por_status.get(st, 0) + 1
+        por_classe[a["classe"]] = por_classe.get(a["classe"], 0) + 1
+        for materia, reg in a["boletim"].items():
+            med = media_materia(reg)
+            if med is not None:
+                acc = somas.setdefault(materia, [0.0, 0])
+                acc[0] += med
+                acc[1] += 1
+        if progresso:
+            progresso(i, total)
+    return {
+        "total": total,
+        "por_status": por_status,
+        "por_classe": dict(sorted(por_classe.items(), key=lambda kv: _ordem_classe(kv[0]))),
+        "media_materia": {m: s / q for m, (s, q) in sorted(somas.items())},
+    }
 
-            self._refresh_lista_alunos()
-            self._refresh_comboboxes()
-            if nome in ALUNOS:
-                self._update_materias_combo_for_aluno(nome)
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    def _excluir_aluno(self):
-        key = self._get_selected_aluno_key()
-        if not key:
-            messagebox.showwarning("Atenção", "Selecione um aluno na lista.")
-            return
-        if messagebox.askyesno("Confirmar", f"Excluir o aluno '{key}'?"):
+# ==========================
+# Execução em segundo plano
+# ==========================
+
+class TarefaCancelada(Exception):
+    """Levantada dentro do callback de progresso quando a tarefa foi cancelada."""
+
+
+class ExecutorTarefas:
+    """Roda funções pesadas num pool de threads e entrega progresso e
+    resultado no thread do Tk via `after()` (o mainloop nunca bloqueia).
+    As funções recebem `progresso=` e devem chamá-lo periodicamente.
+    """
+    INTERVALO_MS = 16          # ~60 quadros/s
+    INTERVALO_PROGRESSO = 0.05  # s entre avisos de progresso vindos do worker
+
+    def __init__(self, widget: "tk.Misc", max_workers: int = 2):
+        self._widget = widget
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="boletim")
+        self._fila: queue.Queue = queue.Queue()
+        self._tarefas: dict[int, dict] = {}
+        self._seq = 0
+        self._agendado = None
+
+    def submeter(self, funcao, *args, ao_progresso=None, ao_concluir=None, ao_erro=None,
+                 ao_cancelar=None, **kwargs) -> int:
+        self._seq += 1
+        tid = self._seq
+        cancelar = threading.Event()
+        ultimo = [0.0]
+
+        def progresso(feitos: int, total: int):
+            if cancelar.is_set():
+                raise TarefaCancelada()
+            agora = time.monotonic()
+            if feitos >= total or agora - ultimo[0] >= self.INTERVALO_PROGRESSO:
+                ultimo[0] = agora
+                self._fila.put((tid, "progresso", (feitos, total)))
+
+        def executar():
             try:
-                excluir_aluno(key)
+                r = funcao(*args, progresso=progresso, **kwargs)
+                self._fila.put((tid, "ok", r))
+            except TarefaCancelada:
+                self._fila.put((tid, "cancelada", None))
+            except Exception as e:
+                self._fila.put((tid, "erro", e))
+
+        self._tarefas[tid] = {
+            "cancelar": cancelar, "ao_progresso": ao_progresso, "ao_concluir": ao_concluir,
+            "ao_erro": ao_erro, "ao_cancelar": ao_cancelar,
+        }
+        self._pool.submit(executar)
+        self._agendar()
+        return tid
+
+    def cancelar(self, tid: int | None = None):
+        for t, info in self._tarefas.items():
+            if tid is None or t == tid:
+                info["cancelar"].set()
+
+    def ocupado(self) -> bool:
+        return bool(self._tarefas)
+
+    def encerrar(self):
+        self.cancelar()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._agendado is not None:
+            self._widget.after_cancel(self._agendado)
+            self._agendado = None
+
+    def _agendar(self):
+        if self._agendado is None:
+            self._agendado = self._widget.after(self.INTERVALO_MS, self._drenar)
+
+    def _drenar(self):
+        self._agendado = None
+        eventos = []
+        try:
+            while True:
+                eventos.append(self._fila.get_nowait())
+        except queue.Empty:
+            pass
+
+        # só o último progresso de cada tarefa interessa para a UI
+        ultimo_prog = {}
+        for tid, tipo, dado in eventos:
+            if tipo == "progresso":
+                ultimo_prog[tid] = dado
+        for tid, dado in ultimo_prog.items():
+            info = self._tarefas.get(tid)
+            if info and info["ao_progresso"]:
+                info["ao_progresso"](*dado)
+
+        for tid, tipo, dado in eventos:
+            if tipo == "progresso":
+                continue
+            info = self._tarefas.pop(tid, None)
+            if info is None:
+                continue
+            if tipo == "ok" and info["ao_concluir"]:
+                info["ao_concluir"](dado)
+            elif tipo == "erro" and info["ao_erro"]:
+                info["ao_erro"](dado)
+            elif tipo == "cancelada" and info["ao_cancelar"]:
+                info["ao_cancelar"]()
+
+        if self._tarefas:
+            self._agendar()
+
+# ==========================
+# Interface Tkinter
+# ==========================
+# A interface só é definida por carregar_interface(), chamada no __main__:
+# quem importa este arquivo pelas funções de notas não carrega o Tk.
+
+tk = ttk = messagebox = filedialog = None
+BoletimApp = None
+
+
+def carregar_interface():
+    """Importa o tkinter e define BoletimApp (uma vez só). Devolve a classe."""
+    global tk, ttk, messagebox, filedialog, BoletimApp
+    if BoletimApp is not None:
+        return BoletimApp
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+
+    class BoletimApp(tk.Toplevel):
+        def __init__(self, master=None):
+            # Sozinho o programa cria a própria raiz (oculta) e a encerra ao
+            # fechar; no lançador a janela é um Toplevel da raiz compartilhada.
+            self._raiz_propria = master is None
+            if master is None:
+                master = tk.Tk()
+                master.withdraw()
+            super().__init__(master)
+            self.title("Boletim Escolar – Tkinter")
+            self.geometry("1080x680")
+            self.minsize(980, 620)
+
+            self.tarefas = ExecutorTarefas(self)
+            self._build_ui()
+            self.protocol("WM_DELETE_WINDOW", self._fechar)
+
+        def _fechar(self):
+            self.tarefas.encerrar()
+            (self.master if self._raiz_propria else self).destroy()
+
+        # ---------- UI Builders ----------
+        def _build_ui(self):
+            menubar = tk.Menu(self)
+            mnu_ferr = tk.Menu(menubar, tearoff=False)
+            mnu_ferr.add_command(label="Importar notas (CSV)...", command=self._importar_notas)
+            mnu_ferr.add_command(label="Exportar boletins (CSV)...", command=self._exportar_boletins)
+            mnu_ferr.add_command(label="Estatísticas", command=self._estatisticas)
+            menubar.add_cascade(label="Ferramentas", menu=mnu_ferr)
+            if PERFIL_ATIVO:
+                mnu_dep = tk.Menu(menubar, tearoff=False)
+                mnu_dep.add_command(label="Painel de desempenho", command=self._abrir_painel_perfil)
+                mnu_dep.add_command(label="Salvar perfil (JSON)...", command=self._salvar_perfil)
+                menubar.add_cascade(label="Depuração", menu=mnu_dep)
+            self.config(menu=menubar)
+
+            self._build_barra_tarefas()
+
+            nb = ttk.Notebook(self)
+            nb.pack(fill=tk.BOTH, expand=True)
+
+            self.tab_alunos = ttk.Frame(nb)
+            self.tab_notas = ttk.Frame(nb)
+            self.tab_boletim = ttk.Frame(nb)
+            self.tab_historico = ttk.Frame(nb)
+
+            nb.add(self.tab_alunos, text="Alunos")
+            nb.add(self.tab_notas, text="Notas")
+            nb.add(self.tab_boletim, text="Boletim")
+            nb.add(self.tab_historico, text="Histórico")
+
+            self._build_tab_alunos()
+            self._build_tab_notas()
+            self._build_tab_boletim()
+            self._build_tab_historico()
+
+        def _build_barra_tarefas(self):
+            barra = ttk.Frame(self)
+            barra.pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=(0, 6))
+            self.lbl_tarefa = ttk.Label(barra, text="")
+            self.lbl_tarefa.pack(side=tk.LEFT)
+            self.btn_cancelar_tarefa = ttk.Button(barra, text="Cancelar", command=self.tarefas.cancelar,
+                                                  state=tk.DISABLED)
+            self.btn_cancelar_tarefa.pack(side=tk.RIGHT)
+            self.pb_tarefa = ttk.Progressbar(barra, length=240, mode="determinate")
+            self.pb_tarefa.pack(side=tk.RIGHT, padx=6)
+
+        def _build_tab_alunos(self):
+            frm = self.tab_alunos
+
+            # Esquerda: Lista de alunos
+            left = ttk.Frame(frm)
+            left.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=8, pady=8)
+
+            ttk.Label(left, text="Alunos (selecione para editar)").pack(anchor=tk.W)
+            self.lb_alunos = tk.Listbox(left, height=20)
+            self.lb_alunos.pack(fill=tk.BOTH, expand=True)
+            self.lb_alunos.bind("<<ListboxSelect>>", self._on_select_aluno)
+
+            btns_left = ttk.Frame(left)
+            btns_left.pack(fill=tk.X, pady=(6, 0))
+            ttk.Button(btns_left, text="Excluir Aluno", command=self._excluir_aluno).pack(side=tk.LEFT)
+
+            # Direita: Formulário
+            right = ttk.Frame(frm)
+            right.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=8, pady=8)
+
+            frm_form = ttk.LabelFrame(right, text="Cadastro/Atualização de Aluno")
+            frm_form.pack(fill=tk.X, padx=4, pady=4)
+
+            # Linha 1
+            row = ttk.Frame(frm_form)
+            row.pack(fill=tk.X, pady=2)
+            ttk.Label(row, text="Nome curto (chave):").grid(row=0, column=0, sticky=tk.W, padx=4)
+            self.ent_nome = ttk.Entry(row, width=20)
+            self.ent_nome.grid(row=0, column=1, sticky=tk.W)
+
+            ttk.Label(row, text="Nome completo:").grid(row=0, column=2, sticky=tk.W, padx=12)
+            self.ent_nome_completo = ttk.Entry(row)
+            self.ent_nome_completo.grid(row=0, column=3, sticky=tk.EW)
+            row.columnconfigure(3, weight=1)
+
+            # Linha 2
+            row2 = ttk.Frame(frm_form)
+            row2.pack(fill=tk.X, pady=2)
+            ttk.Label(row2, text="Idade:").grid(row=0, column=0, sticky=tk.W, padx=4)
+            self.ent_idade = ttk.Entry(row2, width=8)
+            self.ent_idade.grid(row=0, column=1, sticky=tk.W)
+
+            ttk.Label(row2, text="Pais/Responsáveis (opcional):").grid(row=0, column=2, sticky=tk.W, padx=12)
+            self.ent_pais = ttk.Entry(row2)
+            self.ent_pais.grid(row=0, column=3, sticky=tk.EW)
+            row2.columnconfigure(3, weight=1)
+
+            # Linha 3
+            row3 = ttk.Frame(frm_form)
+            row3.pack(fill=tk.X, pady=2)
+            ttk.Label(row3, text="Aniversário (DD/MM/AAAA, opcional):").grid(row=0, column=0, sticky=tk.W, padx=4)
+            self.ent_aniv = ttk.Entry(row3, width=14)
+            self.ent_aniv.grid(row=0, column=1, sticky=tk.W)
+
+            ttk.Label(row3, text="Classe:").grid(row=0, column=2, sticky=tk.W, padx=12)
+            self.cmb_classe = ttk.Combobox(row3, values=[c["classe"] for c in CLASSES], state="readonly")
+            self.cmb_classe.grid(row=0, column=3, sticky=tk.W)
+            self.cmb_classe.current(0)
+
+            # Botões
+            btns = ttk.Frame(frm_form)
+            btns.pack(fill=tk.X, pady=6)
+            ttk.Button(btns, text="Incluir / Atualizar", command=self._incluir_ou_atualizar_aluno).pack(side=tk.LEFT)
+
+            # Materias Opcionais
+            frm_opc = ttk.LabelFrame(right, text="Matérias Opcionais do Aluno Selecionado")
+            frm_opc.pack(fill=tk.BOTH, expand=True, padx=4, pady=6)
+
+            top_opc = ttk.Frame(frm_opc)
+            top_opc.pack(fill=tk.X, pady=4)
+            ttk.Label(top_opc, text="Nova matéria opcional:").pack(side=tk.LEFT)
+            self.ent_materia_opc = ttk.Entry(top_opc)
+            self.ent_materia_opc.pack(side=tk.LEFT, padx=6)
+            ttk.Button(top_opc, text="Adicionar", command=self._adicionar_materia_opc).pack(side=tk.LEFT)
+            ttk.Button(top_opc, text="Remover selecionada", command=self._remover_materia_opc).pack(side=tk.LEFT, padx=6)
+
+            self.lb_materias_opc = tk.Listbox(frm_opc, height=8)
+            self.lb_materias_opc.pack(fill=tk.BOTH, expand=True)
+
+        def _build_tab_notas(self):
+            frm = self.tab_notas
+
+            top = ttk.Frame(frm)
+            top.pack(fill=tk.X, padx=8, pady=8)
+
+            ttk.Label(top, text="Aluno:").pack(side=tk.LEFT)
+            self.cmb_aluno_notas = ttk.Combobox(top, values=[], state="readonly")
+            self.cmb_aluno_notas.pack(side=tk.LEFT, padx=6)
+            self.cmb_aluno_notas.bind("<<ComboboxSelected>>", self._on_select_aluno_notas)
+
+            ttk.Label(top, text="Matéria:").pack(side=tk.LEFT, padx=(16, 0))
+            self.cmb_materia = ttk.Combobox(top, values=[], state="readonly", width=24)
+            self.cmb_materia.pack(side=tk.LEFT, padx=6)
+
+            ttk.Label(top, text="Bimestre:").pack(side=tk.LEFT, padx=(16, 0))
+            self.cmb_bim = ttk.Combobox(top, values=[1, 2, 3, 4], state="readonly", width=5)
+            self.cmb_bim.pack(side=tk.LEFT, padx=6)
+            self.cmb_bim.current(0)
+
+            ttk.Label(top, text="Nota:").pack(side=tk.LEFT, padx=(16, 0))
+            self.ent_nota = ttk.Entry(top, width=8)
+            self.ent_nota.pack(side=tk.LEFT, padx=6)
+
+            ttk.Button(top, text="Incluir/Atualizar Nota", command=self._incluir_nota).pack(side=tk.LEFT, padx=(16, 6))
+            ttk.Button(top, text="Excluir Nota", command=self._excluir_nota).pack(side=tk.LEFT)
+
+            # Tabela simples das notas da matéria selecionada
+            self.frm_grid_notas = ttk.LabelFrame(frm, text="Notas da Matéria (bimestres)")
+            self.frm_grid_notas.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+
+            self.grid_labels = []  # [(row_labels)] para redesenho
+
+        def _build_tab_boletim(self):
+            frm = self.tab_boletim
+
+            top = ttk.Frame(frm)
+            top.pack(fill=tk.X, padx=8, pady=8)
+
+            ttk.Label(top, text="Aluno:").pack(side=tk.LEFT)
+            self.cmb_aluno_boletim = ttk.Combobox(top, values=[], state="readonly")
+            self.cmb_aluno_boletim.pack(side=tk.LEFT, padx=6)
+            self.cmb_aluno_boletim.bind("<<ComboboxSelected>>", self._desenhar_boletim)
+
+            self.lbl_status = ttk.Label(top, text="", font=("Segoe UI", 11, "bold"))
+            self.lbl_status.pack(side=tk.RIGHT)
+
+            self.canvas_boletim = tk.Canvas(frm)
+            self.canvas_boletim.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+
+            self.inner_boletim = ttk.Frame(self.canvas_boletim)
+            self.canvas_boletim.create_window((0, 0), window=self.inner_boletim, anchor="nw")
+
+            self.inner_boletim.bind("<Configure>", lambda e: self.canvas_boletim.configure(scrollregion=self.canvas_boletim.bbox("all")))
+
+        def _build_tab_historico(self):
+            frm = self.tab_historico
+
+            top = ttk.Frame(frm)
+            top.pack(fill=tk.X, padx=8, pady=8)
+
+            ttk.Label(top, text="Aluno:").pack(side=tk.LEFT)
+            self.cmb_aluno_hist = ttk.Combobox(top, values=[], state="readonly")
+            self.cmb_aluno_hist.pack(side=tk.LEFT, padx=6)
+            self.cmb_aluno_hist.bind("<<ComboboxSelected>>", self._desenhar_historico)
+
+            ttk.Button(top, text="Fechar ano e promover", command=self._fechar_ano).pack(side=tk.RIGHT)
+
+            cols = ("classe", "situacao", "status", "abaixo7", "media_geral")
+            self.tree_hist = ttk.Treeview(frm, columns=cols, show="headings", height=12)
+            for c, (h, w) in zip(cols, [("Classe", 100), ("Situação", 100), ("Status", 220),
+                                         ("Médias < 7", 100), ("Média geral", 110)]):
+                self.tree_hist.heading(c, text=h)
+                self.tree_hist.column(c, width=w, anchor="w")
+            self.tree_hist.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+
+        # ---------- Helpers UI ----------
+        @instrumentar
+        def _refresh_comboboxes(self):
+            alunos = sorted(ALUNOS.keys())
+            for cmb in (self.cmb_aluno_notas, self.cmb_aluno_boletim, self.cmb_aluno_hist):
+                sel = cmb.get()
+                cmb["values"] = alunos
+                if sel in alunos:
+                    cmb.set(sel)
+                elif alunos:
+                    cmb.current(0)
+
+        @instrumentar
+        def _refresh_lista_alunos(self):
+            self.lb_alunos.delete(0, tk.END)
+            for k in sorted(ALUNOS.keys()):
+                a = ALUNOS[k]
+                self.lb_alunos.insert(tk.END, f"{a['nome']} – {a['nome_completo']} ({a['classe']})")
+
+        def _get_selected_aluno_key(self) -> str | None:
+            sel = self.lb_alunos.curselection()
+            if not sel:
+                return None
+            texto = self.lb_alunos.get(sel[0])
+            # antes do ' – ' está o nome curto
+            key = texto.split(" – ")[0]
+            return key
+
+        def _carregar_aluno_no_form(self, key: str):
+            a = ALUNOS[key]
+            self.ent_nome.delete(0, tk.END); self.ent_nome.insert(0, a["nome"])
+            self.ent_nome_completo.delete(0, tk.END); self.ent_nome_completo.insert(0, a["nome_completo"])
+            self.ent_idade.delete(0, tk.END); self.ent_idade.insert(0, str(a["idade"]))
+            self.ent_pais.delete(0, tk.END); self.ent_pais.insert(0, a["pais"]) 
+            self.ent_aniv.delete(0, tk.END); self.ent_aniv.insert(0, a["aniversario"]) 
+            try:
+                idx = [c["classe"] for c in CLASSES].index(a["classe"]) 
+            except ValueError:
+                idx = 0
+            self.cmb_classe.current(idx)
+            # materias opcionais
+            self.lb_materias_opc.delete(0, tk.END)
+            for m in a["materias_opc"]:
+                self.lb_materias_opc.insert(tk.END, m)
+
+        def _on_select_aluno(self, _evt=None):
+            key = self._get_selected_aluno_key()
+            if key:
+                self._carregar_aluno_no_form(key)
+                self._refresh_comboboxes()
+                # também atualiza combo de matérias na aba Notas, se aluno estiver selecionado
+                self._update_materias_combo_for_aluno(key)
+
+        def _update_materias_combo_for_aluno(self, key: str):
+            mats = materias_do_aluno(key)
+            self.cmb_materia["values"] = mats
+            if mats:
+                self.cmb_materia.current(0)
+            self._desenha_grid_notas()
+
+        # ---------- Ações (callbacks) ----------
+        def _incluir_ou_atualizar_aluno(self):
+            try:
+                nome = self.ent_nome.get().strip()
+                nome_completo = self.ent_nome_completo.get().strip()
+                idade_txt = self.ent_idade.get().strip()
+                idade = int(idade_txt)
+                pais = self.ent_pais.get().strip()
+                aniversario = self.ent_aniv.get().strip()
+                classe = self.cmb_classe.get()
+
+                if nome in ALUNOS:
+                    # atualizar
+                    a = ALUNOS[nome]
+                    a["nome_completo"] = nome_completo or a["nome_completo"]
+                    a["idade"] = idade
+                    a["pais"] = pais
+                    a["aniversario"] = aniversario
+                    if classe != a["classe"]:
+                        # mudou de classe -> arquiva o ano atual no histórico e
+                        # reconstrói o boletim com matérias da nova classe + opcionais atuais
+                        fechar_ano(nome, classe)
+                    messagebox.showinfo("OK", "Aluno atualizado.")
+                else:
+                    incluir_aluno(nome, nome_completo, idade, classe, pais, aniversario)
+                    messagebox.showinfo("OK", "Aluno incluído.")
+
                 self._refresh_lista_alunos()
                 self._refresh_comboboxes()
-                self.lb_materias_opc.delete(0, tk.END)
-                messagebox.showinfo("OK", "Aluno excluído.")
+                if nome in ALUNOS:
+                    self._update_materias_combo_for_aluno(nome)
             except Exception as e:
                 messagebox.showerror("Erro", str(e))
 
-    def _adicionar_materia_opc(self):
-        key = self._get_selected_aluno_key()
-        if not key:
-            messagebox.showwarning("Atenção", "Selecione um aluno na lista.")
-            return
-        materia = self.ent_materia_opc.get().strip()
-        if not materia:
-            messagebox.showwarning("Atenção", "Informe o nome da matéria opcional.")
-            return
-        try:
-            incluir_materia_opcional(key, materia)
-            self.lb_materias_opc.insert(tk.END, materia)
-            self._update_materias_combo_for_aluno(key)
-            messagebox.showinfo("OK", f"Matéria '{materia}' adicionada.")
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    def _remover_materia_opc(self):
-        key = self._get_selected_aluno_key()
-        if not key:
-            messagebox.showwarning("Atenção", "Selecione um aluno na lista.")
-            return
-        sel = self.lb_materias_opc.curselection()
-        if not sel:
-            messagebox.showwarning("Atenção", "Selecione a matéria opcional a remover.")
-            return
-        materia = self.lb_materias_opc.get(sel[0])
-        try:
-            excluir_materia_opcional(key, materia)
-            self.lb_materias_opc.delete(sel[0])
-            self._update_materias_combo_for_aluno(key)
-            messagebox.showinfo("OK", f"Matéria '{materia}' removida.")
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    def _on_select_aluno_notas(self, _evt=None):
-        key = self.cmb_aluno_notas.get()
-        if key:
-            self._update_materias_combo_for_aluno(key)
-
-    def _incluir_nota(self):
-        key = self.cmb_aluno_notas.get()
-        materia = self.cmb_materia.get()
-        try:
-            b = int(self.cmb_bim.get())
-        except Exception:
-            b = 1
-        txt = self.ent_nota.get().strip()
-        if not key or not materia:
-            messagebox.showwarning("Atenção", "Selecione aluno e matéria.")
-            return
-        if not txt:
-            messagebox.showwarning("Atenção", "Informe a nota.")
-            return
-        try:
-            nota = float(txt)
-            if nota < 0 or nota > 10:
-                raise ValueError("Nota deve estar entre 0 e 10.")
-            set_nota(key, materia, b, nota)
-            self._desenha_grid_notas()
-            if self.cmb_aluno_boletim.get() == key:
-                self._desenhar_boletim()
-            messagebox.showinfo("OK", "Nota registrada.")
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
+        def _excluir_aluno(self):
+            key = self._get_selected_aluno_key()
+            if not key:
+                messagebox.showwarning("Atenção", "Selecione um aluno na lista.")
+                return
+            if messagebox.askyesno("Confirmar", f"Excluir o aluno '{key}'?"):
+                try:
+                    excluir_aluno(key)
+                    self._refresh_lista_alunos()
+                    self._refresh_comboboxes()
+                    self.lb_materias_opc.delete(0, tk.END)
+                    messagebox.showinfo("OK", "Aluno excluído.")
+                except Exception as e:
+                    messagebox.showerror("Erro", str(e))
+
+        def _adicionar_materia_opc(self):
+            key = self._get_selected_aluno_key()
+            if not key:
+                messagebox.showwarning("Atenção", "Selecione um aluno na lista.")
+                return
+            materia = self.ent_materia_opc.get().strip()
+            if not materia:
+                messagebox.showwarning("Atenção", "Informe o nome da matéria opcional.")
+                return
+            try:
+                incluir_materia_opcional(key, materia)
+                self.lb_materias_opc.insert(tk.END, materia)
+                self._update_materias_combo_for_aluno(key)
+                messagebox.showinfo("OK", f"Matéria '{materia}' adicionada.")
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
 
-    def _excluir_nota(self):
-        key = self.cmb_aluno_notas.get()
-        materia = self.cmb_materia.get()
-        try:
-            b = int(self.cmb_bim.get())
-        except Exception:
-            b = 1
-        if not key or not materia:
-            messagebox.showwarning("Atenção", "Selecione aluno e matéria.")
-            return
-        try:
-            excluir_nota(key, materia, b)
-            self._desenha_grid_notas()
-            if self.cmb_aluno_boletim.get() == key:
-                self._desenhar_boletim()
-            messagebox.showinfo("OK", "Nota excluída.")
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    # ---------- Grids/Tabelas desenhadas com Labels (permite cores por célula) ----------
-    def _clear_grid_labels(self):
-        for row in self.grid_labels:
-            for w in row:
-                w.destroy()
-        self.grid_labels.clear()
+        def _remover_materia_opc(self):
+            key = self._get_selected_aluno_key()
+            if not key:
+                messagebox.showwarning("Atenção", "Selecione um aluno na lista.")
+                return
+            sel = self.lb_materias_opc.curselection()
+            if not sel:
+                messagebox.showwarning("Atenção", "Selecione a matéria opcional a remover.")
+                return
+            materia = self.lb_materias_opc.get(sel[0])
+            try:
+                excluir_materia_opcional(key, materia)
+                self.lb_materias_opc.delete(sel[0])
+                self._update_materias_combo_for_aluno(key)
+                messagebox.showinfo("OK", f"Matéria '{materia}' removida.")
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
 
-    def _desenha_grid_notas(self):
-        self._clear_grid_labels()
-        for w in self.frm_grid_notas.winfo_children():
-            if isinstance(w, ttk.Frame) and w is not self.frm_grid_notas:
-                w.destroy()
-        # Cabeçalho
-        header = ttk.Frame(self.frm_grid_notas)
-        header.pack(fill=tk.X, padx=6, pady=6)
-        ttk.Label(header, text="B1", width=6, anchor="center").grid(row=0, column=0)
-        ttk.Label(header, text="B2", width=6, anchor="center").grid(row=0, column=1)
-        ttk.Label(header, text="B3", width=6, anchor="center").grid(row=0, column=2)
-        ttk.Label(header, text="B4", width=6, anchor="center").grid(row=0, column=3)
-        ttk.Label(header, text="Média", width=8, anchor="center").grid(row=0, column=4)
-
-        key = self.cmb_aluno_notas.get()
-        materia = self.cmb_materia.get()
-        if not key or not materia or key not in ALUNOS:
-            return
-        a = ALUNOS[key]
-        reg = a["boletim"].get(materia, {"b1": None, "b2": None, "b3": None, "b4": None})
-
-        rowf = ttk.Frame(self.frm_grid_notas)
-        rowf.pack(fill=tk.X, padx=6, pady=4)
-        row_widgets = []
-        for i in range(1, 5):
-            val = reg.get(f"b{i}")
-            txt = "" if val is None else f"{val:.1f}"
-            color = ("red" if (val is not None and val < 7) else "blue") if val is not None else "black"
-            lbl = tk.Label(rowf, text=txt, width=6, anchor="center", fg=color)
-            lbl.grid(row=0, column=i-1, padx=2)
-            row_widgets.append(lbl)
-        med = media_materia(reg)
-        txtm = "" if med is None else f"{med:.2f}"
-        colm = ("red" if (med is not None and med < 7) else "blue") if med is not None else "black"
-        lblm = tk.Label(rowf, text=txtm, width=8, anchor="center", fg=colm, font=("Segoe UI", 10, "bold"))
-        lblm.grid(row=0, column=4, padx=2)
-        row_widgets.append(lblm)
-        self.grid_labels.append(row_widgets)
-
-    # ---------- Boletim Completo (por aluno) ----------
-    def _desenhar_boletim(self, _evt=None):
-        for w in self.inner_boletim.winfo_children():
-            w.destroy()
-        key = self.cmb_aluno_boletim.get()
-        if not key or key not in ALUNOS:
-            self.lbl_status.config(text="")
-            return
-
-        a = ALUNOS[key]
-        materias = materias_do_aluno(key)
-
-        # Cabeçalho
-        header = ttk.Frame(self.inner_boletim)
-        header.grid(row=0, column=0, sticky="w", pady=(0, 4))
-        ttk.Label(header, text="Matéria", width=22).grid(row=0, column=0, padx=4)
-        for i, title in enumerate(["B1", "B2", "B3", "B4", "Média"]):
-            ttk.Label(header, text=title, width=8, anchor="center").grid(row=0, column=i+1, padx=2)
-
-        # Linhas por matéria
-        r = 1
-        for materia in materias:
+        def _on_select_aluno_notas(self, _evt=None):
+            key = self.cmb_aluno_notas.get()
+            if key:
+                self._update_materias_combo_for_aluno(key)
+
+        def _incluir_nota(self):
+            key = self.cmb_aluno_notas.get()
+            materia = self.cmb_materia.get()
+            try:
+                b = int(self.cmb_bim.get())
+            except Exception:
+                b = 1
+            txt = self.ent_nota.get().strip()
+            if not key or not materia:
+                messagebox.showwarning("Atenção", "Selecione aluno e matéria.")
+                return
+            if not txt:
+                messagebox.showwarning("Atenção", "Informe a nota.")
+                return
+            try:
+                nota = float(txt)
+                if nota < 0 or nota > 10:
+                    raise ValueError("Nota deve estar entre 0 e 10.")
+                set_nota(key, materia, b, nota)
+                self._desenha_grid_notas()
+                if self.cmb_aluno_boletim.get() == key:
+                    self._desenhar_boletim()
+                messagebox.showinfo("OK", "Nota registrada.")
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
+
+        def _excluir_nota(self):
+            key = self.cmb_aluno_notas.get()
+            materia = self.cmb_materia.get()
+            try:
+                b = int(self.cmb_bim.get())
+            except Exception:
+                b = 1
+            if not key or not materia:
+                messagebox.showwarning("Atenção", "Selecione aluno e matéria.")
+                return
+            try:
+                excluir_nota(key, materia, b)
+                self._desenha_grid_notas()
+                if self.cmb_aluno_boletim.get() == key:
+                    self._desenhar_boletim()
+                messagebox.showinfo("OK", "Nota excluída.")
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
+
+        # ---------- Grids/Tabelas desenhadas com Labels (permite cores por célula) ----------
+        def _clear_grid_labels(self):
+            for row in self.grid_labels:
+                for w in row:
+                    w.destroy()
+            self.grid_labels.clear()
+
+        @instrumentar
+        def _desenha_grid_notas(self):
+            self._clear_grid_labels()
+            for w in self.frm_grid_notas.winfo_children():
+                if isinstance(w, ttk.Frame) and w is not self.frm_grid_notas:
+                    w.destroy()
+            # Cabeçalho
+            header = ttk.Frame(self.frm_grid_notas)
+            header.pack(fill=tk.X, padx=6, pady=6)
+            ttk.Label(header, text="B1", width=6, anchor="center").grid(row=0, column=0)
+            ttk.Label(header, text="B2", width=6, anchor="center").grid(row=0, column=1)
+            ttk.Label(header, text="B3", width=6, anchor="center").grid(row=0, column=2)
+            ttk.Label(header, text="B4", width=6, anchor="center").grid(row=0, column=3)
+            ttk.Label(header, text="Média", width=8, anchor="center").grid(row=0, column=4)
+
+            key = self.cmb_aluno_notas.get()
+            materia = self.cmb_materia.get()
+            if not key or not materia or key not in ALUNOS:
+                return
+            a = ALUNOS[key]
             reg = a["boletim"].get(materia, {"b1": None, "b2": None, "b3": None, "b4": None})
-            ttk.Label(self.inner_boletim, text=materia, width=22).grid(row=r, column=0, sticky="w", padx=4, pady=1)
+
+            rowf = ttk.Frame(self.frm_grid_notas)
+            rowf.pack(fill=tk.X, padx=6, pady=4)
+            row_widgets = []
             for i in range(1, 5):
                 val = reg.get(f"b{i}")
                 txt = "" if val is None else f"{val:.1f}"
                 color = ("red" if (val is not None and val < 7) else "blue") if val is not None else "black"
-                tk.Label(self.inner_boletim, text=txt, width=8, anchor="center", fg=color).grid(row=r, column=i, padx=2)
+                lbl = tk.Label(rowf, text=txt, width=6, anchor="center", fg=color)
+                lbl.grid(row=0, column=i-1, padx=2)
+                row_widgets.append(lbl)
             med = media_materia(reg)
             txtm = "" if med is None else f"{med:.2f}"
             colm = ("red" if (med is not None and med < 7) else "blue") if med is not None else "black"
-            tk.Label(self.inner_boletim, text=txtm, width=8, anchor="center", fg=colm, font=("Segoe UI", 10, "bold")).grid(row=r, column=5, padx=2)
-            r += 1
+            lblm = tk.Label(rowf, text=txtm, width=8, anchor="center", fg=colm, font=("Segoe UI", 10, "bold"))
+            lblm.grid(row=0, column=4, padx=2)
+            row_widgets.append(lblm)
+            self.grid_labels.append(row_widgets)
+
+        # ---------- Boletim Completo (por aluno) ----------
+        @instrumentar
+        def _desenhar_boletim(self, _evt=None):
+            for w in self.inner_boletim.winfo_children():
+                w.destroy()
+            key = self.cmb_aluno_boletim.get()
+            if not key or key not in ALUNOS:
+                self.lbl_status.config(text="")
+                return
+
+            a = ALUNOS[key]
+            materias = materias_do_aluno(key)
+
+            # Cabeçalho
+            header = ttk.Frame(self.inner_boletim)
+            header.grid(row=0, column=0, sticky="w", pady=(0, 4))
+            ttk.Label(header, text="Matéria", width=22).grid(row=0, column=0, padx=4)
+            for i, title in enumerate(["B1", "B2", "B3", "B4", "Média"]):
+                ttk.Label(header, text=title, width=8, anchor="center").grid(row=0, column=i+1, padx=2)
+
+            # Linhas por matéria
+            r = 1
+            for materia in materias:
+                reg = a["boletim"].get(materia, {"b1": None, "b2": None, "b3": None, "b4": None})
+                ttk.Label(self.inner_boletim, text=materia, width=22).grid(row=r, column=0, sticky="w", padx=4, pady=1)
+                for i in range(1, 5):
+                    val = reg.get(f"b{i}")
+                    txt = "" if val is None else f"{val:.1f}"
+                    color = ("red" if (val is not None and val < 7) else "blue") if val is not None else "black"
+                    tk.Label(self.inner_boletim, text=txt, width=8, anchor="center", fg=color).grid(row=r, column=i, padx=2)
+                med = media_materia(reg)
+                txtm = "" if med is None else f"{med:.2f}"
+                colm = ("red" if (med is not None and med < 7) else "blue") if med is not None else "black"
+                tk.Label(self.inner_boletim, text=txtm, width=8, anchor="center", fg=colm, font=("Segoe UI", 10, "bold")).grid(row=r, column=5, padx=2)
+                r += 1
+
+            # Status final
+            st, q = status_aluno(key)
+            self.lbl_status.config(text=f"{st}  |  Médias < 7: {q}")
+
+        # ---------- Histórico ----------
+        @instrumentar
+        def _desenhar_historico(self, _evt=None):
+            self.tree_hist.delete(*self.tree_hist.get_children())
+            key = self.cmb_aluno_hist.get()
+            if not key or key not in ALUNOS:
+                return
+            for ano in historico_aluno(key):
+                medias = [m for m in ano["medias"].values() if m is not None]
+                geral = f"{sum(medias) / len(medias):.2f}" if medias else ""
+                self.tree_hist.insert("", tk.END, values=(
+                    ano["classe"], "Fechado" if ano["fechado"] else "Em curso",
+                    ano["status"], ano["abaixo7"], geral
+                ))
+
+        def _fechar_ano(self):
+            key = self.cmb_aluno_hist.get()
+            if not key or key not in ALUNOS:
+                messagebox.showwarning("Atenção", "Selecione um aluno.")
+                return
+            classes = [c["classe"] for c in CLASSES]
+            idx = classes.index(ALUNOS[key]["classe"]) if ALUNOS[key]["classe"] in classes else len(classes) - 1
+            proxima = classes[idx + 1] if idx + 1 < len(classes) else None
+            msg = f"Fechar o ano de '{key}'" + (f" e promover para {proxima}?" if proxima else "?")
+            if not messagebox.askyesno("Confirmar", msg):
+                return
+            try:
+                fechar_ano(key, proxima)
+                self._refresh_lista_alunos()
+                self._update_materias_combo_for_aluno(key)
+                if self.cmb_aluno_boletim.get() == key:
+                    self._desenhar_boletim()
+                self._desenhar_historico()
+                messagebox.showinfo("OK", "Ano letivo arquivado no histórico.")
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
 
-        # Status final
-        st, q = status_aluno(key)
-        self.lbl_status.config(text=f"{st}  |  Médias < 7: {q}")
+        # ---------- Tarefas em segundo plano ----------
+        def _iniciar_tarefa(self, titulo: str, funcao, *args, ao_concluir=None, **kwargs):
+            if self.tarefas.ocupado():
+                messagebox.showwarning("Atenção", "Aguarde a tarefa em andamento terminar.")
+                return
 
-    # ---------- Inicialização visual ----------
-    def popular_exemplo(self):
-        # Alguns exemplos para testar rapidamente
-        try:
-            incluir_aluno("joao", "João da Silva", 11, "5º ano", "Maria/Paulo", "12/03/2014")
-            incluir_aluno("ana", "Ana Pereira", 13, "7º ano", "Carla/Rafael", "05/09/2012")
-            incluir_materia_opcional("ana", "Robótica")
-            set_nota("joao", "Português", 1, 6.5)
-            set_nota("joao", "Matemática", 1, 8.0)
-            set_nota("joao", "Matemática", 2, 7.0)
-            set_nota("ana", "Robótica", 1, 9.5)
-            set_nota("ana", "História", 1, 6.0)
-        except Exception:
-            pass
-        self._refresh_lista_alunos()
-        self._refresh_comboboxes()
-        if self.cmb_aluno_notas.get():
-            self._update_materias_combo_for_aluno(self.cmb_aluno_notas.get())
+            def progresso(feitos, total):
+                self.pb_tarefa.config(maximum=max(total, 1), value=feitos)
+                self.lbl_tarefa.config(text=f"{titulo}: {feitos}/{total}")
+
+            def fim():
+                self.pb_tarefa.config(value=0)
+                self.lbl_tarefa.config(text="")
+                self.btn_cancelar_tarefa.config(state=tk.DISABLED)
+
+            def concluir(resultado):
+                fim()
+                if ao_concluir:
+                    ao_concluir(resultado)
+
+            def erro(e):
+                fim()
+                messagebox.showerror("Erro", str(e))
+
+            def cancelada():
+                fim()
+                messagebox.showinfo("Cancelado", f"{titulo} cancelado.")
+
+            self.lbl_tarefa.config(text=f"{titulo}...")
+            self.btn_cancelar_tarefa.config(state=tk.NORMAL)
+            self.tarefas.submeter(funcao, *args, ao_progresso=progresso, ao_concluir=concluir,
+                                  ao_erro=erro, ao_cancelar=cancelada, **kwargs)
+
+        def _importar_notas(self):
+            caminho = filedialog.askopenfilename(title="Importar notas",
+                                                 filetypes=[("CSV", "*.csv"), ("Todos", "*.*")])
+            if not caminho:
+                return
+
+            def concluir(resultado):
+                # o worker só leu o arquivo; a gravação em ALUNOS é aqui, no thread do Tk
+                linhas, erros = resultado
+                importadas, erros_gravacao = aplicar_notas(linhas)
+                erros = _erros_por_linha(erros + erros_gravacao)
+                self._refresh_lista_alunos()
+                self._refresh_comboboxes()
+                if self.cmb_aluno_notas.get():
+                    self._update_materias_combo_for_aluno(self.cmb_aluno_notas.get())
+                self._desenhar_boletim()
+                msg = f"{importadas} linha(s) importada(s)."
+                if erros:
+                    msg += f"\n{len(erros)} erro(s):\n" + "\n".join(erros[:10])
+                    if len(erros) > 10:
+                        msg += "\n..."
+                messagebox.showinfo("Importação", msg)
+
+            self._iniciar_tarefa("Lendo notas", ler_notas_csv, caminho, ao_concluir=concluir)
+
+        def _exportar_boletins(self):
+            caminho = filedialog.asksaveasfilename(title="Exportar boletins", defaultextension=".csv",
+                                                   filetypes=[("CSV", "*.csv")])
+            if not caminho:
+                return
+            self._iniciar_tarefa("Exportando boletins", exportar_boletins_csv, caminho,
+                                 ao_concluir=lambda n: messagebox.showinfo("Exportação", f"{n} linha(s) exportada(s)."),
+                                 alunos=instantaneo_alunos())
+
+        def _estatisticas(self):
+            def concluir(est):
+                linhas = [f"Alunos: {est['total']}", ""]
+                linhas += [f"{st}: {q}" for st, q in est["por_status"].items()]
+                linhas += [""] + [f"{c}: {q} aluno(s)" for c, q in est["por_classe"].items()]
+                linhas += [""] + [f"{m}: média {v:.2f}" for m, v in est["media_materia"].items()]
+                messagebox.showinfo("Estatísticas", "\n".join(linhas))
+
+            self._iniciar_tarefa("Calculando estatísticas", estatisticas_alunos, ao_concluir=concluir,
+                                 alunos=instantaneo_alunos())
+
+        # ---------- Depuração / desempenho ----------
+        def _abrir_painel_perfil(self):
+            janela = tk.Toplevel(self)
+            janela.title("Desempenho")
+            janela.geometry("760x320")
+
+            cols = ("funcao", "chamadas", "total", "p50", "p95", "p99")
+            tree = ttk.Treeview(janela, columns=cols, show="headings")
+            for c, (h, w) in zip(cols, [("Função", 280), ("Chamadas", 90), ("Total (ms)", 100),
+                                         ("p50 (ms)", 90), ("p95 (ms)", 90), ("p99 (ms)", 90)]):
+                tree.heading(c, text=h)
+                tree.column(c, width=w, anchor="w" if c == "funcao" else "e")
+            tree.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+
+            def atualizar():
+                if not janela.winfo_exists():
+                    return
+                tree.delete(*tree.get_children())
+                for nome, r in resumo_perfil().items():
+                    tree.insert("", tk.END, values=(
+                        nome, r["chamadas"], f"{r['total_ms']:.2f}",
+                        f"{r['p50_ms']:.3f}", f"{r['p95_ms']:.3f}", f"{r['p99_ms']:.3f}"
+                    ))
+                janela.after(1000, atualizar)
+
+            btns = ttk.Frame(janela)
+            btns.pack(fill=tk.X, padx=8, pady=(0, 8))
+            ttk.Button(btns, text="Zerar", command=zerar_perfil).pack(side=tk.LEFT)
+            ttk.Button(btns, text="Salvar JSON...", command=self._salvar_perfil).pack(side=tk.LEFT, padx=6)
+            atualizar()
+
+        def _salvar_perfil(self):
+            caminho = filedialog.asksaveasfilename(title="Salvar perfil", defaultextension=".json",
+                                                   filetypes=[("JSON", "*.json")])
+            if not caminho:
+                return
+            try:
+                salvar_perfil_json(caminho)
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
+
+        # ---------- Inicialização visual ----------
+        def popular_exemplo(self):
+            # Alguns exemplos para testar rapidamente
+            try:
+                incluir_aluno("joao", "João da Silva", 11, "5º ano", "Maria/Paulo", "12/03/2014")
+                incluir_aluno("ana", "Ana Pereira", 13, "7º ano", "Carla/Rafael", "05/09/2012")
+                incluir_materia_opcional("ana", "Robótica")
+                set_nota("joao", "Português", 1, 6.5)
+                set_nota("joao", "Matemática", 1, 8.0)
+                set_nota("joao", "Matemática", 2, 7.0)
+                set_nota("ana", "Robótica", 1, 9.5)
+                set_nota("ana", "História", 1, 6.0)
+            except Exception:
+                pass
+            self._refresh_lista_alunos()
+            self._refresh_comboboxes()
+            if self.cmb_aluno_notas.get():
+                self._update_materias_combo_for_aluno(self.cmb_aluno_notas.get())
+
+    return BoletimApp
 
 
 if __name__ == "__main__":
-    app = BoletimApp()
+    app = carregar_interface()()
     app.popular_exemplo()
     app.mainloop()
@@ -1,6 +1,17 @@
-import tkinter as tk
-from tkinter import messagebox
-import math
+import functools
+import sys
+
+import regras_pontuacao
+
+# O Tk só é importado quando a janela abre (carregar_interface), para que o
+# cálculo possa ser usado sem display, em lote ou num servidor.
+tk = messagebox = None
+
+def carregar_interface():
+    """Importa o tkinter para os nomes globais usados pela janela."""
+    global tk, messagebox
+    import tkinter as tk
+    from tkinter import messagebox
 
 # Dicionário global para armazenar os campos de entrada (Entry widgets)
 entradas = {}
@@ -9,45 +20,65 @@ def formatar_float(entrada_str):
     """Converte string com vírgula ou ponto para float."""
     return float(entrada_str.replace(',', '.'))
 
-def calcular_pontos(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
-    """Contém toda a lógica de cálculo do potencial estético."""
-    
-    # 1. Cálculo dos Indicadores
-    try:
-        if altura_m <= 0 or largura_cintura <= 0:
-            raise ZeroDivisionError
+# Regras de pontuação: modelo "estetica" em regras_pontuacao.json
+MODELO = regras_pontuacao.obter_modelo("estetica")
+
+def calcular_dados(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
+    """Calcula o potencial estético com as regras do MODELO.
+    Retorna (dados, None) ou (None, mensagem de erro)."""
+    dados, erro = MODELO.pontuar(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura)
+    if erro:
+        return None, erro
+    return {
+        'immf': dados['immf'],
+        'proporcao': dados['proporcao'],
+        'percentual': dados['percentual']
+    }, None
 
-        massa_magra = peso * (100 - percentual_gordura) / 100
-        immf = massa_magra / (altura_m ** 2)
-        proporcao_ombro_cintura = largura_ombro / largura_cintura
-        
-    except ZeroDivisionError:
-        return "Erro: Altura e cintura devem ser maiores que zero."
-    
-    # 2. Cálculo dos Pontos
-    pontos_altura = 2 * (1 - abs(altura_m - 1.85) / 1.85)
-    pontos_gordura = 3 * (1 - abs(percentual_gordura - 12) / 12)
-    pontos_immf = 3 * (1 - abs(immf - 23) / 23)
-    pontos_proporcao = 2 * (1 - abs(proporcao_ombro_cintura - 1.6) / 1.6)
-
-    # 3. Ajuste de Pontos para evitar valores negativos
-    pontos_altura = max(0, pontos_altura)
-    pontos_gordura = max(0, pontos_gordura)
-    pontos_immf = max(0, pontos_immf)
-    pontos_proporcao = max(0, pontos_proporcao)
-
-    # 4. Cálculo Final do Potencial
-    pontos_totais = pontos_altura + pontos_gordura + pontos_immf + pontos_proporcao
-    pontos_maximos = 2 + 3 + 3 + 2
-    potencial_estetico = (pontos_totais / pontos_maximos) * 100
+def calcular_pontos(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
+    """Calcula e devolve o texto do resultado (ou a mensagem de erro)."""
+    dados, erro = calcular_dados(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura)
+    if erro:
+        return erro
 
     resultado_formatado = (
         f"--- Resultados ---\n"
-        f"IMMF: {immf:.2f} | Proporção O/C: {proporcao_ombro_cintura:.2f}\n"
-        f"Seu Potencial Estético é de {potencial_estetico:.2f}%"
+        f"IMMF: {dados['immf']:.2f} | Proporção O/C: {dados['proporcao']:.2f}\n"
+        f"Seu Potencial Estético é de {dados['percentual']:.2f}%"
     )
     return resultado_formatado
 
+TAMANHO_CACHE = 4096
+
+@functools.lru_cache(maxsize=TAMANHO_CACHE)
+def calcular_pontos_em_cache(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
+    """calcular_pontos memorizado pela tupla de entradas já convertidas (LRU)."""
+    return calcular_pontos(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura)
+
+# --- Processamento em lote pela linha de comando (ver processamento_lote.py) ---
+CAMPOS_AVALIACAO = ("altura", "peso", "gordura", "ombro", "cintura")
+CAMPOS_RESULTADO = ("immf", "proporcao", "percentual", "erro")
+
+def pontuar_registros(registros):
+    """Pontua um bloco de registros (altura em cm, como na interface) e
+    devolve cópias com os CAMPOS_RESULTADO."""
+    linhas = []
+    for registro in registros:
+        linha = dict(registro)
+        try:
+            altura_cm, peso, gordura, ombro, cintura = (
+                formatar_float(str(registro[c])) for c in CAMPOS_AVALIACAO)
+        except (KeyError, TypeError, ValueError):
+            linha['erro'] = "Erro: campos ausentes ou não numéricos."
+        else:
+            dados, erro = calcular_dados(altura_cm / 100, peso, gordura, ombro, cintura)
+            if erro:
+                linha['erro'] = erro
+            else:
+                linha.update(dados)
+        linhas.append(linha)
+    return linhas
+
 def calcular_e_exibir():
     """Função chamada pelo botão para pegar dados e mostrar o resultado."""
     try:
@@ -62,7 +93,7 @@ def calcular_e_exibir():
         altura_m = altura_cm / 100
         
         # Chama a função de cálculo
-        resultado = calcular_pontos(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura)
+        resultado = calcular_pontos_em_cache(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura)
         
         # Atualiza o rótulo de resultado
         entradas['resultado_label'].config(text=resultado)
@@ -72,12 +103,41 @@ def calcular_e_exibir():
     except Exception as e:
         messagebox.showerror("Erro", str(e))
 
-def criar_interface():
-    """Configura e exibe a janela principal do Tkinter."""
+# --- Recálculo ao vivo (com atraso) enquanto o usuário digita ---
+ATRASO_RECALCULO_MS = 150
+_recalculo_agendado = None  # id do after() pendente
+_variaveis_formulario = {}  # StringVar de cada campo (mantém os traces vivos)
+
+def recalcular_ao_vivo():
+    """Recalcula sem diálogos; com campos incompletos só mostra o aviso no rótulo."""
+    global _recalculo_agendado
+    _recalculo_agendado = None
+    try:
+        altura_cm, peso, gordura, ombro, cintura = (
+            formatar_float(entradas[c].get()) for c in CAMPOS_AVALIACAO)
+    except ValueError:
+        entradas['resultado_label'].config(text="Aguardando dados...")
+        return
+    resultado = calcular_pontos_em_cache(altura_cm / 100, peso, gordura, ombro, cintura)
+    entradas['resultado_label'].config(text=resultado)
+
+def agendar_recalculo(*_):
+    """Trace dos campos: (re)agenda o recálculo para ATRASO_RECALCULO_MS depois da última alteração."""
+    global _recalculo_agendado
+    rotulo = entradas['resultado_label']
+    if _recalculo_agendado is not None:
+        rotulo.after_cancel(_recalculo_agendado)
+    _recalculo_agendado = rotulo.after(ATRASO_RECALCULO_MS, recalcular_ao_vivo)
+
+def criar_interface(master=None):
+    """Configura e exibe a janela principal do Tkinter. Sem `master` ela é a
+    raiz do programa e roda o mainloop; com `master` (o lançador) é um
+    Toplevel dele. Devolve a janela."""
     global entradas
+    carregar_interface()
     
     # Configuração básica da janela
-    janela = tk.Tk()
+    janela = tk.Tk() if master is None else tk.Toplevel(master)
     janela.title("Calculadora de Potencial Estético")
     janela.geometry("400x400")
     
@@ -118,7 +178,21 @@ def criar_interface():
     entradas['resultado_label'] = tk.Label(janela, text="Aguardando dados...", justify=tk.LEFT, fg='blue')
     entradas['resultado_label'].grid(row=6, column=0, columnspan=2, padx=padx_val, pady=pady_val)
 
-    janela.mainloop()
-
-# Inicia a aplicação
-criar_interface()
\ No newline at end of file
+    # Recálculo ao vivo: cada campo ganha uma StringVar com trace
+    for campo in CAMPOS_AVALIACAO:
+        variavel = tk.StringVar(janela)
+        variavel.trace_add("write", agendar_recalculo)
+        entradas[campo].config(textvariable=variavel)
+        _variaveis_formulario[campo] = variavel
+
+    if master is None:
+        janela.mainloop()
+    return janela
+
+# Inicia a aplicação (com argumentos: processamento em lote, ex. entrada.csv saida.csv)
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        import processamento_lote
+        sys.exit(processamento_lote.main(sys.argv[1:], pontuar_registros, CAMPOS_RESULTADO,
+                                         "Calcula o potencial estético de cada avaliação de um arquivo CSV/JSONL."))
+    criar_interface()
\ No newline at end of file
@@ -1,5 +1,29 @@
-import tkinter as tk
-from tkinter import messagebox
+import bisect
+import csv
+import functools
+import heapq
+import math
+import os
+import sys
+from array import array
+from datetime import date
+
+import regras_pontuacao
+
+try:
+    import numpy as np
+except ImportError:  # só o cálculo em lote depende do NumPy
+    np = None
+
+# O Tk só é importado quando a janela abre (carregar_interface), para que o
+# cálculo possa ser usado sem display, em lote ou num servidor.
+tk = filedialog = messagebox = None
+
+def carregar_interface():
+    """Importa o tkinter para os nomes globais usados pelas janelas."""
+    global tk, filedialog, messagebox
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
 
 # ---- dicionário global para guardar os widgets de entrada ----
 entradas = {}
@@ -29,6 +53,20 @@ CLASSIFICAÇÃO VSM (Valor Sociocultural da Métrica):
 - 100%: Parabéns, você é um Deus Grego!
 """
 
+# --- Regras de pontuação (modelo "vsm" em regras_pontuacao.json) ---
+MODELO = regras_pontuacao.obter_modelo("vsm")
+
+# (limite mínimo, mensagem) em ordem decrescente; 100% exato é tratado à parte
+FAIXAS_CLASSIFICACAO = [
+    (90.0, "Parabéns, você é um Chad!"),
+    (80.0, "Parabéns, você é um Chad Light!"),
+    (70.0, "Legal, você está acima da média."),
+    (60.0, "Você é mediano."),
+    (50.0, "Que pena, você está abaixo da média."),
+]
+MENSAGEM_MAXIMA = "Parabéns, você é um Deus Grego!"
+MENSAGEM_MINIMA = "Que pena, você é um subfive."  # 0.0 a 49.999...%
+
 def formatar_float(entrada_str):
     """Converte string com vírgula ou ponto para float."""
     return float(entrada_str.replace(',', '.'))
@@ -36,178 +74,836 @@ def formatar_float(entrada_str):
 def classificar_potencial(potencial_estetico):
     """Retorna a mensagem de classificação com base na pontuação."""
     if potencial_estetico == 100.0:
-        return "Parabéns, você é um Deus Grego!"
-    elif potencial_estetico >= 90.0:
-        return "Parabéns, você é um Chad!"
-    elif potencial_estetico >= 80.0:
-        return "Parabéns, você é um Chad Light!"
-    elif potencial_estetico >= 70.0:
-        return "Legal, você está acima da média."
-    elif potencial_estetico >= 60.0:
-        return "Você é mediano."
-    elif potencial_estetico >= 50.0:
-        return "Que pena, você está abaixo da média."
-    else:  # 0.0 a 49.999...%
-        return "Que pena, você é um subfive."
+        return MENSAGEM_MAXIMA
+    for limite, mensagem in FAIXAS_CLASSIFICACAO:
+        if potencial_estetico >= limite:
+            return mensagem
+    return MENSAGEM_MINIMA
+
+def _formatacao(dados):
+    """Converte o resultado do modelo nas chaves usadas pela interface."""
+    pontos = dados['pontos']
+    return {
+        'immf': dados['immf'],
+        'proporcao': dados['proporcao'],
+        'pa': pontos['altura'],
+        'pg': pontos['gordura'],
+        'pi': pontos['immf'],
+        'pp': pontos['proporcao'],
+        'pt': dados['pt'],
+        'pm': dados['pm'],
+        'percentual': dados['percentual']
+    }
 
 def calcular_pontos(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
-    """Contém toda a lógica de cálculo do potencial estético."""
-    # Constantes
-    PONTOS_MAX_ALTURA = 2.0
-    PONTOS_MAX_GORDURA = 3.0
-    PONTOS_MAX_IMMF = 3.0
-    PONTOS_MAX_PROPORCAO = 2.0
-    FAIXA_PROPORCIONAL_GORDURA = 35.0 - 13.0
-
-    # 1. Cálculo dos Indicadores
+    """Calcula o potencial estético com as regras do MODELO.
+    Retorna (dados_formatacao, None) ou (None, mensagem de erro)."""
+    dados, erro = MODELO.pontuar(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura)
+    if erro:
+        return None, erro
+    return _formatacao(dados), None
+
+TAMANHO_CACHE = 4096
+
+@functools.lru_cache(maxsize=TAMANHO_CACHE)
+def calcular_pontos_em_cache(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
+    """calcular_pontos memorizado pela tupla de entradas já convertidas (LRU).
+    O dicionário devolvido é compartilhado entre chamadas: não o altere."""
+    return calcular_pontos(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura)
+
+def _exigir_numpy():
+    if np is None:
+        raise ImportError("O cálculo em lote requer o NumPy (pip install numpy).")
+
+def calcular_pontos_lote(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
+    """Versão vetorizada (NumPy) de calcular_pontos para muitas avaliações.
+    Recebe sequências/arrays do mesmo tamanho e devolve um dicionário de
+    arrays com as mesmas chaves de `dados_formatacao`, mais 'valido'
+    (False onde altura ou cintura <= 0; nessas linhas os valores são NaN)."""
+    _exigir_numpy()
+    dados = MODELO.pontuar_lote(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura)
+    resultado = _formatacao(dados)
+    resultado['valido'] = dados['valido']
+    return resultado
+
+def classificar_potencial_lote(percentuais):
+    """Versão vetorizada de classificar_potencial; linhas NaN ficam com ''."""
+    _exigir_numpy()
+    pct = np.asarray(percentuais, dtype=float)
+    condicoes = [pct == 100.0] + [pct >= limite for limite, _ in FAIXAS_CLASSIFICACAO] + [~np.isnan(pct)]
+    mensagens = [MENSAGEM_MAXIMA] + [msg for _, msg in FAIXAS_CLASSIFICACAO] + [MENSAGEM_MINIMA]
+    return np.select(condicoes, mensagens, default="")
+
+def carregar_avaliacoes_csv(caminho):
+    """Lê um CSV com as colunas altura (cm), peso, gordura, ombro e cintura
+    (mesmos campos da interface; aceita vírgula decimal e separador ';').
+    Devolve um dicionário de arrays, com a altura já convertida para metros."""
+    _exigir_numpy()
+    with open(caminho, newline="", encoding="utf-8") as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+        leitor = csv.DictReader(f, dialect=dialeto)
+        colunas = {c: [] for c in ("altura", "peso", "gordura", "ombro", "cintura")}
+        for linha in leitor:
+            for c, valores in colunas.items():
+                valores.append(formatar_float(linha[c]))
+    dados = {c: np.array(v, dtype=float) for c, v in colunas.items()}
+    dados["altura"] = dados["altura"] / 100.0
+    return dados
+
+def calcular_csv(caminho):
+    """Pontua todas as avaliações de um CSV de uma vez (ver carregar_avaliacoes_csv).
+    Devolve os arrays de calcular_pontos_lote mais 'classificacao'."""
+    d = carregar_avaliacoes_csv(caminho)
+    resultado = calcular_pontos_lote(d["altura"], d["peso"], d["gordura"], d["ombro"], d["cintura"])
+    resultado['classificacao'] = classificar_potencial_lote(resultado['percentual'])
+    return resultado
+
+# --- Processamento em lote pela linha de comando (ver processamento_lote.py) ---
+CAMPOS_AVALIACAO = ("altura", "peso", "gordura", "ombro", "cintura")
+CAMPOS_RESULTADO = ("immf", "proporcao", "percentual", "classificacao", "erro")
+
+def _valores_avaliacao(registro):
+    """Converte um registro (CSV/JSONL, altura em cm) nos argumentos de calcular_pontos."""
+    altura_cm, peso, gordura, ombro, cintura = (formatar_float(str(registro[c])) for c in CAMPOS_AVALIACAO)
+    return altura_cm / 100, peso, gordura, ombro, cintura
+
+def pontuar_registros(registros):
+    """Pontua um bloco de registros e devolve cópias com os CAMPOS_RESULTADO.
+    Usa calcular_pontos_lote quando o NumPy está disponível."""
+    linhas = [dict(r) for r in registros]
+    indices, valores = [], []
+    for i, linha in enumerate(linhas):
+        try:
+            valores.append(_valores_avaliacao(linha))
+            indices.append(i)
+        except (KeyError, TypeError, ValueError):
+            linha['erro'] = "Erro: campos ausentes ou não numéricos."
+
+    if np is not None and valores:
+        r = calcular_pontos_lote(*np.array(valores, dtype=float).T)
+        classes = classificar_potencial_lote(r['percentual']).tolist()
+        immf, proporcao, percentual = r['immf'].tolist(), r['proporcao'].tolist(), r['percentual'].tolist()
+        for j, i in enumerate(indices):
+            if classes[j]:
+                linhas[i].update(immf=immf[j], proporcao=proporcao[j],
+                                 percentual=percentual[j], classificacao=classes[j])
+            else:
+                linhas[i]['erro'] = calcular_pontos(*valores[j])[1]
+    else:
+        for i, v in zip(indices, valores):
+            dados, erro = calcular_pontos(*v)
+            if erro:
+                linhas[i]['erro'] = erro
+            else:
+                linhas[i].update(immf=dados['immf'], proporcao=dados['proporcao'],
+                                 percentual=dados['percentual'],
+                                 classificacao=classificar_potencial(dados['percentual']))
+    return linhas
+
+# --- Percentis da população (coortes por sexo e faixa de altura) ---
+FAIXA_ALTURA_CM = 5
+LIMITE_NOVOS_COORTE = 1024  # inserções pendentes antes de fundir com o array ordenado
+
+def normalizar_sexo(sexo):
+    """'M', 'F' ou '' (não informado / todos)."""
+    s = str(sexo or "").strip().upper()[:1]
+    return s if s in ("M", "F") else ""
+
+def chave_coorte(sexo, altura_cm):
+    """(sexo, início da faixa de altura em cm)."""
+    return normalizar_sexo(sexo), int(altura_cm // FAIXA_ALTURA_CM) * FAIXA_ALTURA_CM
+
+def _chaves_coorte(sexo, altura_cm):
+    """Coortes em que uma avaliação entra: a do sexo e a de todos ('')."""
+    chave = chave_coorte(sexo, altura_cm)
+    return (chave,) if chave[0] == "" else (chave, ("", chave[1]))
+
+class _Coorte:
+    """Pontuações de uma coorte: array ordenado + lista ordenada de inserções
+    recentes, fundidas no array quando passam de LIMITE_NOVOS_COORTE."""
+    __slots__ = ("ordenados", "novos")
+
+    def __init__(self, ordenados=None):
+        self.ordenados = ordenados if ordenados is not None else array("d")
+        self.novos = []
+
+    def __len__(self):
+        return len(self.ordenados) + len(self.novos)
+
+    def adicionar(self, valor):
+        bisect.insort(self.novos, valor)
+        if len(self.novos) >= LIMITE_NOVOS_COORTE:
+            self.compactar()
+
+    def compactar(self):
+        if self.novos:
+            self.ordenados = array("d", heapq.merge(self.ordenados, self.novos))
+            self.novos = []
+
+    def contar(self, valor):
+        """(quantos são menores, quantos são iguais)."""
+        menores = bisect.bisect_left(self.ordenados, valor) + bisect.bisect_left(self.novos, valor)
+        ate = bisect.bisect_right(self.ordenados, valor) + bisect.bisect_right(self.novos, valor)
+        return menores, ate - menores
+
+class IndicePercentis:
+    """Percentil do VSM dentro da coorte (sexo, faixa de altura).
+
+    Cada avaliação entra na coorte do seu sexo e na coorte '' (todos os sexos)
+    da mesma faixa. A consulta é uma busca binária por coorte."""
+
+    def __init__(self):
+        self._coortes = {}
+
+    def __len__(self):
+        return sum(len(c) for (sexo, _), c in self._coortes.items() if sexo == "")
+
+    def adicionar(self, sexo, altura_cm, percentual):
+        for chave in _chaves_coorte(sexo, altura_cm):
+            coorte = self._coortes.get(chave)
+            if coorte is None:
+                coorte = self._coortes[chave] = _Coorte()
+            coorte.adicionar(float(percentual))
+
+    def percentil(self, sexo, altura_cm, percentual):
+        """(percentil 0–100, tamanho da coorte) ou (None, 0) se a coorte está vazia.
+        Empates contam pela metade (posição média)."""
+        coorte = self._coortes.get(chave_coorte(sexo, altura_cm))
+        if not coorte:
+            return None, 0
+        menores, iguais = coorte.contar(float(percentual))
+        return 100.0 * (menores + 0.5 * iguais) / len(coorte), len(coorte)
+
+    def coortes(self):
+        """{(sexo, faixa): tamanho}, em ordem."""
+        return {chave: len(c) for chave, c in sorted(self._coortes.items())}
+
+    def mesclar(self, outro):
+        """Incorpora as coortes de outro índice (ex.: construído em outro lote)."""
+        for chave, coorte in outro._coortes.items():
+            coorte.compactar()
+            atual = self._coortes.get(chave)
+            if atual is None:
+                self._coortes[chave] = _Coorte(array("d", coorte.ordenados))
+            else:
+                atual.compactar()
+                atual.ordenados = array("d", heapq.merge(atual.ordenados, coorte.ordenados))
+
+    @classmethod
+    def de_csv(cls, caminho):
+        """Monta o índice de um CSV de resultados: colunas altura (cm), sexo
+        (opcional) e percentual (ex.: a saída da linha de comando). Sem a
+        coluna percentual, calcula a partir de peso, gordura, ombro e cintura.
+        Linhas inválidas são ignoradas. Devolve (índice, linhas ignoradas)."""
+        grupos = {}
+        ignoradas = 0
+        with open(caminho, newline="", encoding="utf-8") as f:
+            amostra = f.read(4096)
+            f.seek(0)
+            leitor = csv.DictReader(f, dialect=csv.Sniffer().sniff(amostra, delimiters=",;\t"))
+            tem_percentual = "percentual" in (leitor.fieldnames or ())
+            for linha in leitor:
+                try:
+                    altura_cm = formatar_float(linha["altura"])
+                    if tem_percentual:
+                        percentual = formatar_float(linha["percentual"])
+                    else:
+                        dados, erro = calcular_pontos(*_valores_avaliacao(linha))
+                        if erro:
+                            raise ValueError(erro)
+                        percentual = dados['percentual']
+                except (KeyError, TypeError, ValueError):
+                    ignoradas += 1
+                    continue
+                if percentual != percentual:  # NaN
+                    ignoradas += 1
+                    continue
+                for chave in _chaves_coorte(linha.get("sexo"), altura_cm):
+                    grupos.setdefault(chave, []).append(percentual)
+
+        indice = cls()
+        for chave, valores in grupos.items():
+            valores.sort()
+            indice._coortes[chave] = _Coorte(array("d", valores))
+        return indice, ignoradas
+
+INDICE_POPULACAO = IndicePercentis()
+
+def texto_percentil(sexo, altura_cm, percentual):
+    """Linha do resultado com o percentil na coorte, ou '' sem população carregada."""
+    pct, n = INDICE_POPULACAO.percentil(sexo, altura_cm, percentual)
+    if pct is None:
+        return ""
+    sexo_txt = {"M": "homens", "F": "mulheres"}.get(normalizar_sexo(sexo), "pessoas")
+    faixa = chave_coorte(sexo, altura_cm)[1]
+    return (f"Percentil: {pct:.0f}º entre {n} {sexo_txt} de "
+            f"{faixa}–{faixa + FAIXA_ALTURA_CM - 1} cm\n")
+
+def carregar_populacao():
+    """Escolhe o CSV de resultados anteriores e monta INDICE_POPULACAO."""
+    global INDICE_POPULACAO
+    caminho = filedialog.askopenfilename(
+        title="CSV de resultados da população",
+        filetypes=[("CSV", "*.csv"), ("Todos os arquivos", "*.*")])
+    if not caminho:
+        return
     try:
-        if altura_m <= 0 or largura_cintura <= 0:
-            raise ZeroDivisionError
-
-        massa_magra = peso * (100 - percentual_gordura) / 100
-        immf = massa_magra / (altura_m ** 2)
-        proporcao_ombro_cintura = largura_ombro / largura_cintura
-
-    except ZeroDivisionError:
-        return None, "Erro: Altura e cintura devem ser maiores que zero."
-
-    # --- PONTUAÇÃO DA ALTURA ---
-    pontos_altura = 0.0
-    if altura_m < 1.65:
-        pontos_altura = 0.0
-    elif 1.65 <= altura_m <= 1.82:
-        faixa_altura = 1.82 - 1.65
-        progresso = altura_m - 1.65
-        pontos_altura = PONTOS_MAX_ALTURA * (progresso / faixa_altura)
-    elif 1.82 < altura_m <= 1.87:
-        pontos_altura = PONTOS_MAX_ALTURA
-    elif 1.87 < altura_m <= 2.05:
-        altura_inicio_queda = 1.87
-        faixa_queda = 2.05 - altura_inicio_queda
-        distancia_percorrida = altura_m - altura_inicio_queda
-        fator_pontuacao = 1.0 - (distancia_percorrida / faixa_queda)
-        pontos_altura = PONTOS_MAX_ALTURA * fator_pontuacao
-    elif altura_m > 2.05:
-        pontos_altura = 0.0
-
-    # --- PONTUAÇÃO DA GORDURA ---
-    pontos_gordura = 0.0
-    if percentual_gordura > 35.0:
-        pontos_gordura = 0.0
-    elif 13.0 <= percentual_gordura <= 35.0:
-        progresso = percentual_gordura - 13.0
-        pontos_gordura = PONTOS_MAX_GORDURA * (1.0 - (progresso / FAIXA_PROPORCIONAL_GORDURA))
-    elif 10.0 <= percentual_gordura < 13.0:
-        pontos_gordura = PONTOS_MAX_GORDURA
-    elif percentual_gordura < 10.0:
-        distancia = 10.0 - percentual_gordura
-        pontos_gordura = PONTOS_MAX_GORDURA * (1.0 - (distancia / FAIXA_PROPORCIONAL_GORDURA))
-
-    # --- NOVA REGRA: PONTUAÇÃO OMBRO/CINTURA ---
-    # 1,6 a 1,7  -> máximo
-    # 1,0 a 1,6  -> interpolação linear 0..máximo
-    # < 1,0 e > 1,7 -> zero
-    p = proporcao_ombro_cintura
-    if 1.6 <= p <= 1.7:
-        pontos_proporcao = PONTOS_MAX_PROPORCAO
-    elif 1.0 <= p < 1.6:
-        # Linear: p=1.0 -> 0; p=1.6 -> max
-        pontos_proporcao = PONTOS_MAX_PROPORCAO * ((p - 1.0) / (1.6 - 1.0))
+        INDICE_POPULACAO, ignoradas = IndicePercentis.de_csv(caminho)
+    except (OSError, csv.Error) as e:
+        messagebox.showerror("População", f"Não foi possível ler o arquivo:\n{e}")
+        return
+    messagebox.showinfo("População", f"{len(INDICE_POPULACAO)} avaliações carregadas"
+                        f" ({ignoradas} linhas ignoradas).")
+
+# --- Histórico de avaliações por membro (séries temporais) ---
+ARQUIVO_HISTORICO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "historico_vsm.csv")
+COLUNAS_SERIE = ("altura", "peso", "gordura", "ombro", "cintura",
+                 "immf", "proporcao", "pa", "pg", "pi", "pp", "pt", "percentual")
+JANELA_MEDIA_MOVEL = 3
+
+class SerieMembro:
+    """Avaliações de um membro em colunas array('d') (entradas, pontuações e
+    percentual), ordenadas pela data; `datas` guarda o dia ordinal (array('l'))."""
+    __slots__ = ("nome", "datas", "colunas")
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.datas = array("l")
+        self.colunas = {c: array("d") for c in COLUNAS_SERIE}
+
+    def __len__(self):
+        return len(self.datas)
+
+    def adicionar(self, data, valores):
+        dia = data.toordinal()
+        if not self.datas or dia >= self.datas[-1]:
+            self.datas.append(dia)
+            for c, coluna in self.colunas.items():
+                coluna.append(valores[c])
+        else:  # avaliação retroativa
+            i = bisect.bisect_right(self.datas, dia)
+            self.datas.insert(i, dia)
+            for c, coluna in self.colunas.items():
+                coluna.insert(i, valores[c])
+
+    def _faixa(self, inicio=None, fim=None):
+        ini = 0 if inicio is None else bisect.bisect_left(self.datas, inicio.toordinal())
+        fim_i = len(self.datas) if fim is None else bisect.bisect_right(self.datas, fim.toordinal())
+        return ini, fim_i
+
+    def intervalo(self, inicio=None, fim=None, colunas=COLUNAS_SERIE):
+        """Avaliações entre as datas (inclusive): {'data': [date], coluna: array}."""
+        ini, fim_i = self._faixa(inicio, fim)
+        resultado = {'data': [date.fromordinal(d) for d in self.datas[ini:fim_i]]}
+        for c in colunas:
+            resultado[c] = self.colunas[c][ini:fim_i]
+        return resultado
+
+    def media_movel(self, coluna="percentual", janela=JANELA_MEDIA_MOVEL):
+        """Média das últimas `janela` avaliações, uma por avaliação
+        (no começo da série, a média do que houver)."""
+        valores = self.colunas[coluna]
+        medias = array("d")
+        soma = 0.0
+        for i, v in enumerate(valores):
+            soma += v
+            if i >= janela:
+                soma -= valores[i - janela]
+            medias.append(soma / min(i + 1, janela))
+        return medias
+
+    def ultima(self):
+        """(data, {coluna: valor}) da avaliação mais recente, ou None."""
+        if not self.datas:
+            return None
+        return date.fromordinal(self.datas[-1]), {c: col[-1] for c, col in self.colunas.items()}
+
+    def delta(self, coluna="percentual"):
+        """Variação da última avaliação em relação à anterior (None com menos de duas)."""
+        valores = self.colunas[coluna]
+        return valores[-1] - valores[-2] if len(valores) >= 2 else None
+
+class HistoricoAvaliacoes:
+    """Séries de todos os membros, com as avaliações acrescentadas a um CSV."""
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho
+        self._series = {}  # nome em casefold -> SerieMembro
+        if caminho and os.path.exists(caminho):
+            self._carregar()
+
+    def _carregar(self):
+        with open(self.caminho, newline="", encoding="utf-8") as f:
+            for linha in csv.DictReader(f):
+                try:
+                    valores = {c: float(linha[c]) for c in COLUNAS_SERIE}
+                    data = date.fromisoformat(linha["data"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                self._serie(linha["membro"]).adicionar(data, valores)
+
+    def _serie(self, membro):
+        chave = membro.strip().casefold()
+        serie = self._series.get(chave)
+        if serie is None:
+            serie = self._series[chave] = SerieMembro(membro.strip())
+        return serie
+
+    def membros(self):
+        return sorted((s.nome for s in self._series.values()), key=str.casefold)
+
+    def serie(self, membro):
+        """SerieMembro do membro, ou None se ele não tem avaliações."""
+        return self._series.get(membro.strip().casefold())
+
+    def registrar(self, membro, data, valores):
+        """Acrescenta uma avaliação. `valores` precisa ter todas as COLUNAS_SERIE."""
+        if not membro.strip():
+            raise ValueError("Informe o nome do membro.")
+        valores = {c: float(valores[c]) for c in COLUNAS_SERIE}
+        self._serie(membro).adicionar(data, valores)
+        if self.caminho:
+            novo = not os.path.exists(self.caminho)
+            with open(self.caminho, "a", newline="", encoding="utf-8") as f:
+                w = csv.writer(f)
+                if novo:
+                    w.writerow(("membro", "data") + COLUNAS_SERIE)
+                w.writerow([membro.strip(), data.isoformat()] + [repr(valores[c]) for c in COLUNAS_SERIE])
+
+HISTORICO = None  # HistoricoAvaliacoes, aberto por criar_interface()
+_ultima_avaliacao = None  # valores do último cálculo exibido (para "Salvar avaliação")
+
+def texto_delta(membro, percentual):
+    """Linha com a variação em relação à última avaliação salva do membro."""
+    serie = HISTORICO.serie(membro) if HISTORICO and membro.strip() else None
+    if not serie:
+        return ""
+    data, anterior = serie.ultima()
+    return (f"Desde {data.strftime('%d/%m/%Y')}: {percentual - anterior['percentual']:+.2f} pp"
+            f" ({len(serie)} avaliações salvas)\n")
+
+def salvar_avaliacao():
+    """Grava o último resultado calculado no histórico do membro."""
+    membro = entradas['membro'].get().strip()
+    if not membro:
+        messagebox.showwarning("Histórico", "Informe o nome do membro.")
+        return
+    if _recalculo_agendado is not None:  # campos alterados e ainda não recalculados
+        entradas['resultado_label'].after_cancel(_recalculo_agendado)
+        recalcular_ao_vivo()
+    if _ultima_avaliacao is None:
+        messagebox.showwarning("Histórico", "Calcule o potencial antes de salvar.")
+        return
+    try:
+        HISTORICO.registrar(membro, date.today(), _ultima_avaliacao)
+    except OSError as e:
+        messagebox.showerror("Histórico", f"Não foi possível gravar o histórico:\n{e}")
+        return
+    INDICE_POPULACAO.adicionar(entradas['sexo'].get(), _ultima_avaliacao['altura'],
+                               _ultima_avaliacao['percentual'])
+    serie = HISTORICO.serie(membro)
+    delta = serie.delta()
+    msg = f"Avaliação de {serie.nome} salva ({len(serie)} no histórico)."
+    if delta is not None:
+        msg += f"\nVariação desde a anterior: {delta:+.2f} pp"
+    messagebox.showinfo("Histórico", msg)
+
+METRICAS_GRAFICO = {
+    "percentual": "VSM (%)",
+    "peso": "Peso (kg)",
+    "gordura": "% Gordura",
+    "cintura": "Cintura (cm)",
+    "immf": "IMMF",
+}
+
+def desenhar_tendencia(canvas, serie, coluna):
+    """Desenha a série (pontos e linha) e a média móvel no canvas."""
+    canvas.delete("all")
+    largura, altura = int(canvas["width"]), int(canvas["height"])
+    esq, dir_, topo, base = 50, 15, 15, 35
+    valores = serie.colunas[coluna]
+    if not valores:
+        canvas.create_text(largura // 2, altura // 2, text="Sem avaliações salvas.")
+        return
+    medias = serie.media_movel(coluna)
+    if coluna == "percentual":
+        v_min, v_max = 0.0, 100.0
     else:
-        pontos_proporcao = 0.0
-
-    # --- PONTUAÇÃO DO IMMF ---
-    pontos_immf = 0.0
-    if immf >= 23.0:
-        pontos_immf = PONTOS_MAX_IMMF
-    elif 16.0 <= immf < 23.0:
-        faixa_proporcional = 23.0 - 16.0
-        progresso = immf - 16.0
-        pontos_immf = PONTOS_MAX_IMMF * (progresso / faixa_proporcional)
+        v_min, v_max = min(valores), max(valores)
+        folga = (v_max - v_min) * 0.1 or 1.0
+        v_min, v_max = v_min - folga, v_max + folga
+    d_min, d_max = serie.datas[0], serie.datas[-1]
+
+    def x(dia):
+        if d_max == d_min:
+            return (esq + largura - dir_) / 2
+        return esq + (dia - d_min) / (d_max - d_min) * (largura - esq - dir_)
+
+    def y(v):
+        return topo + (v_max - v) / (v_max - v_min) * (altura - topo - base)
+
+    # eixos e linhas de grade
+    for i in range(5):
+        v = v_min + (v_max - v_min) * i / 4
+        canvas.create_line(esq, y(v), largura - dir_, y(v), fill="#e0e0e0")
+        canvas.create_text(esq - 5, y(v), text=f"{v:.1f}", anchor="e", font=("TkDefaultFont", 8))
+    canvas.create_line(esq, topo, esq, altura - base)
+    canvas.create_line(esq, altura - base, largura - dir_, altura - base)
+    for dia, ancora in ((d_min, "nw"), (d_max, "ne")):
+        canvas.create_text(x(dia), altura - base + 5, anchor=ancora, font=("TkDefaultFont", 8),
+                           text=date.fromordinal(dia).strftime("%d/%m/%Y"))
+
+    pontos = [(x(d), y(v)) for d, v in zip(serie.datas, valores)]
+    if len(pontos) > 1:
+        canvas.create_line(*[c for p in pontos for c in p], fill="#1976D2", width=2)
+        canvas.create_line(*[c for d, m in zip(serie.datas, medias) for c in (x(d), y(m))],
+                           fill="#FF9800", dash=(4, 2))
+    for px, py in pontos:
+        canvas.create_oval(px - 3, py - 3, px + 3, py + 3, fill="#1976D2", outline="")
+
+def abrir_grafico_evolucao():
+    """Janela com a evolução do membro informado ao longo das avaliações."""
+    membro = entradas['membro'].get().strip()
+    serie = HISTORICO.serie(membro) if membro else None
+    if not serie:
+        messagebox.showinfo("Evolução", "Nenhuma avaliação salva para este membro.")
+        return
+
+    janela = tk.Toplevel()
+    janela.title(f"Evolução — {serie.nome}")
+    coluna = tk.StringVar(value="percentual")
+
+    topo = tk.Frame(janela)
+    topo.pack(fill=tk.X, padx=10, pady=5)
+    tk.Label(topo, text="Métrica:").pack(side=tk.LEFT)
+    rotulo_delta = tk.Label(topo, fg='blue')
+    canvas = tk.Canvas(janela, width=560, height=320, bg="white")
+
+    def redesenhar(*_):
+        desenhar_tendencia(canvas, serie, coluna.get())
+        delta = serie.delta(coluna.get())
+        rotulo_delta.config(text="" if delta is None else
+                            f"Desde a anterior: {delta:+.2f} | média móvel de {JANELA_MEDIA_MOVEL} em laranja")
+
+    tk.OptionMenu(topo, coluna, *METRICAS_GRAFICO, command=redesenhar).pack(side=tk.LEFT, padx=5)
+    rotulo_delta.pack(side=tk.LEFT, padx=10)
+    canvas.pack(padx=10, pady=(0, 10))
+    redesenhar()
+
+# --- Metas: menor mudança de peso, gordura ou cintura para atingir um VSM ---
+VARIAVEIS_META = ("peso", "gordura", "cintura")
+CAMPOS_META = ("meta_peso", "variacao_peso", "meta_gordura", "variacao_gordura",
+               "meta_cintura", "variacao_cintura")
+PASSO_META = 0.1  # precisão (kg, %, cm) com que as metas são apresentadas
+
+def faixas_de_meta():
+    """[(percentual mínimo, mensagem)] de todas as faixas acima de subfive, da mais alta à mais baixa."""
+    return [(100.0, MENSAGEM_MAXIMA)] + FAIXAS_CLASSIFICACAO
+
+def _percentual(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
+    dados, erro = MODELO.pontuar(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura)
+    return None if erro else dados['percentual']
+
+def _quebras(metrica):
+    curva = MODELO.curvas.get(metrica)
+    return [x for x, _ in curva.pontos] if curva else []
+
+TOLERANCIA_META = 1e-9  # largura relativa em que a fronteira é considerada exata
+
+def _refinar_fronteira(avaliar, inviavel, viavel, alvo):
+    """Bissecção até a fronteira entre um ponto abaixo do alvo e um que o atinge."""
+    for _ in range(200):
+        if abs(viavel - inviavel) <= TOLERANCIA_META * max(1.0, abs(viavel)):
+            break
+        meio = (inviavel + viavel) / 2
+        if avaliar(meio) >= alvo:
+            viavel = meio
+        else:
+            inviavel = meio
+    return viavel
+
+def _candidatos_meta(avaliar, t0, quebras, alvo, minimo, maximo):
+    """Pontos viáveis (avaliar(t) >= alvo) mais próximos de t0, um por trecho.
+
+    `avaliar` é linear entre quebras consecutivas e constante além delas, então
+    em cada trecho o conjunto viável é um intervalo cuja fronteira sai de uma
+    interpolação. Como o arredondamento perto das quebras pode deslocá-la, ela
+    é confirmada dos dois lados e refinada por bissecção quando não confere."""
+    pontos = set(quebras) | {t0}
+    inicio = min(pontos) - 1.0 if minimo is None else minimo
+    fim = max(pontos) + 1.0 if maximo is None else maximo
+    pontos = sorted(t for t in pontos | {inicio, fim} if inicio <= t <= fim)
+    valores = [avaliar(t) for t in pontos]
+
+    candidatos = []
+    for ta, fa, tb, fb in zip(pontos, valores, pontos[1:], valores[1:]):
+        ok_a, ok_b = fa >= alvo, fb >= alvo
+        if not (ok_a or ok_b):
+            continue
+        if ok_a and ok_b:
+            ini, fim_trecho = ta, tb
+        else:
+            viavel, inviavel = (ta, tb) if ok_a else (tb, ta)
+            t = min(max(ta + (alvo - fa) * (tb - ta) / (fb - fa), ta), tb)
+            if avaliar(t) < alvo:
+                t = _refinar_fronteira(avaliar, t, viavel, alvo)
+            else:
+                recuo = t + (inviavel - t) * TOLERANCIA_META
+                if avaliar(recuo) >= alvo:
+                    t = _refinar_fronteira(avaliar, inviavel, recuo, alvo)
+            ini, fim_trecho = (ta, t) if ok_a else (t, tb)
+        candidatos.append(min(max(t0, ini), fim_trecho))
+    return candidatos
+
+def _meta_variavel(avaliar_x, x0, t0, para_x, quebras, alvo, minimo=None, maximo=None):
+    """Valor da variável mais próximo de x0 que atinge o alvo, arredondado para
+    PASSO_META no sentido da mudança quando isso ainda atinge o alvo."""
+    candidatos = _candidatos_meta(lambda t: avaliar_x(para_x(t)), t0, quebras, alvo, minimo, maximo)
+    if not candidatos:
+        return {'valor': None, 'variacao': None, 'percentual': None}
+    x = min((para_x(t) for t in candidatos), key=lambda v: abs(v - x0))
+    if x != x0:
+        passos = x / PASSO_META
+        arredondado = (math.ceil(passos) if x > x0 else math.floor(passos)) * PASSO_META
+        arredondado = round(arredondado, 10)
+        if avaliar_x(arredondado) >= alvo:
+            x = arredondado
+    return {'valor': x, 'variacao': x - x0, 'percentual': avaliar_x(x)}
+
+def resolver_meta(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura, alvo):
+    """Menor mudança de cada variável de VARIAVEIS_META (uma de cada vez, as
+    outras fixas) para o VSM chegar a `alvo` (ex.: 80 para Chad Light).
+
+    Usa a estrutura das curvas do MODELO: o IMMF é linear no peso e na
+    gordura e a proporção é linear em 1/cintura, então a pontuação é linear
+    por partes em cada variável e as fronteiras saem por interpolação.
+    Devolve {variável: {'valor', 'variacao', 'percentual'}} ('valor' None se
+    mudar só essa variável não basta), ou None se as medidas são inválidas."""
+    if _percentual(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura) is None:
+        return None
+    quadrado_altura = altura_m * altura_m
+    resultado = {}
+
+    # peso: IMMF proporcional ao peso
+    fator = (100 - percentual_gordura) / 100 / quadrado_altura
+    quebras = [q / fator for q in _quebras("immf")] if fator > 0 else []
+    resultado['peso'] = _meta_variavel(
+        lambda x: _percentual(altura_m, x, percentual_gordura, largura_ombro, largura_cintura),
+        peso, peso, lambda t: t, quebras, alvo, minimo=0.0)
+
+    # gordura: pontos da gordura e IMMF lineares na gordura
+    quebras = _quebras("gordura")
+    if peso > 0:
+        quebras = quebras + [100 - q * 100 * quadrado_altura / peso for q in _quebras("immf")]
+    resultado['gordura'] = _meta_variavel(
+        lambda x: _percentual(altura_m, peso, x, largura_ombro, largura_cintura),
+        percentual_gordura, percentual_gordura, lambda t: t, quebras, alvo, minimo=0.0, maximo=100.0)
+
+    # cintura: pontos lineares na proporção ombro/cintura
+    quebras = [q for q in _quebras("proporcao") if q > 0]
+    if largura_ombro > 0 and quebras:
+        resultado['cintura'] = _meta_variavel(
+            lambda x: _percentual(altura_m, peso, percentual_gordura, largura_ombro, x),
+            largura_cintura, largura_ombro / largura_cintura, lambda t: largura_ombro / t,
+            quebras, alvo, minimo=min(quebras) / 2)
     else:
-        pontos_immf = 0.0
-
-    # Clamp
-    pontos_altura = max(0.0, pontos_altura)
-    pontos_gordura = max(0.0, pontos_gordura)
-    pontos_immf = max(0.0, pontos_immf)
-    pontos_proporcao = max(0.0, pontos_proporcao)
-
-    # Cálculo Final do Potencial
-    pontos_totais = pontos_altura + pontos_gordura + pontos_immf + pontos_proporcao
-    pontos_maximos = PONTOS_MAX_ALTURA + PONTOS_MAX_GORDURA + PONTOS_MAX_IMMF + PONTOS_MAX_PROPORCAO
-    potencial_estetico = (pontos_totais / pontos_maximos) * 100
-
-    dados_formatacao = {
-        'immf': immf,
-        'proporcao': proporcao_ombro_cintura,
-        'pa': pontos_altura,
-        'pg': pontos_gordura,
-        'pi': pontos_immf,
-        'pp': pontos_proporcao,
-        'pt': pontos_totais,
-        'pm': pontos_maximos,
-        'percentual': potencial_estetico
-    }
-    return dados_formatacao, None
+        atinge = _percentual(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura) >= alvo
+        resultado['cintura'] = {'valor': largura_cintura if atinge else None,
+                                'variacao': 0.0 if atinge else None, 'percentual': None}
+    return resultado
+
+def resolver_metas(avaliacoes, alvo):
+    """resolver_meta para uma lista de avaliações (tuplas na ordem de calcular_pontos)."""
+    return [resolver_meta(*avaliacao, alvo) for avaliacao in avaliacoes]
+
+def pontuar_metas(registros, alvo):
+    """pontuar_registros mais as colunas de CAMPOS_META (linha de comando com --meta)."""
+    linhas = pontuar_registros(registros)
+    for linha in linhas:
+        if linha.get('erro'):
+            continue
+        metas = resolver_meta(*_valores_avaliacao(linha), alvo)
+        for variavel in VARIAVEIS_META:
+            linha[f"meta_{variavel}"] = metas[variavel]['valor']
+            linha[f"variacao_{variavel}"] = metas[variavel]['variacao']
+    return linhas
+
+def _opcoes_linha_de_comando(parser):
+    parser.add_argument("--meta", type=float, metavar="PERCENTUAL",
+                        help="calcula também a menor mudança de peso, gordura e cintura para chegar a este VSM")
+
+    def preparar(args, pontuar_bloco, campos_saida):
+        if args.meta is None:
+            return pontuar_bloco, campos_saida
+        return functools.partial(pontuar_metas, alvo=args.meta), tuple(campos_saida) + CAMPOS_META
+    return preparar
+
+def abrir_metas():
+    """Janela que mostra, para a faixa escolhida, quanto mudar cada variável."""
+    try:
+        altura_cm, peso, gordura, ombro, cintura = (
+            formatar_float(entradas[c].get()) for c in CAMPOS_AVALIACAO)
+    except ValueError:
+        messagebox.showerror("Erro de Entrada", "Por favor, insira números válidos em todos os campos.")
+        return
+
+    faixas = faixas_de_meta()
+    rotulos = [f"{msg} ({limite:.0f}%)" for limite, msg in faixas]
+    janela = tk.Toplevel()
+    janela.title("Metas")
+    escolha = tk.StringVar(value=rotulos[2])
+    resultado = tk.Label(janela, justify=tk.LEFT, font=('Courier', 10), fg='blue')
+    unidades = {'peso': "kg", 'gordura': "%", 'cintura': "cm"}
+
+    def atualizar(*_):
+        alvo = faixas[rotulos.index(escolha.get())][0]
+        metas = resolver_meta(altura_cm / 100, peso, gordura, ombro, cintura, alvo)
+        if metas is None:
+            resultado.config(text="Altura e cintura devem ser maiores que zero.")
+            return
+        linhas = [f"Para chegar a {alvo:.0f}% (mudando só uma medida):", ""]
+        for variavel in VARIAVEIS_META:
+            meta = metas[variavel]
+            if meta['valor'] is None:
+                linhas.append(f"{variavel.capitalize():<8} não basta mudar só esta medida")
+            elif meta['variacao'] == 0:
+                linhas.append(f"{variavel.capitalize():<8} já atinge a faixa")
+            else:
+                linhas.append(f"{variavel.capitalize():<8} {meta['valor']:.1f} {unidades[variavel]}"
+                              f" ({meta['variacao']:+.1f})")
+        resultado.config(text="\n".join(linhas))
+
+    tk.OptionMenu(janela, escolha, *rotulos, command=atualizar).pack(padx=10, pady=5)
+    resultado.pack(padx=10, pady=(0, 10))
+    atualizar()
 
 def mostrar_explicacao():
     """Exibe o texto de ajuda quando o botão de interrogação é clicado."""
     messagebox.showinfo("Algoritmo de Pontuação", TEXTO_EXPLICACAO)
 
+# --- Recálculo ao vivo (com atraso) enquanto o usuário digita ---
+ATRASO_RECALCULO_MS = 150
+_recalculo_agendado = None  # id do after() pendente
+_variaveis_formulario = {}  # StringVar de cada campo (mantém os traces vivos)
+
+def _ler_formulario():
+    """Campos numéricos do formulário (altura em cm). ValueError se algum é inválido."""
+    return tuple(formatar_float(entradas[c].get()) for c in CAMPOS_AVALIACAO)
+
+def _descartar_avaliacao():
+    """O resultado na tela deixou de valer para os campos: "Salvar" recusa até o próximo cálculo."""
+    global _ultima_avaliacao
+    _ultima_avaliacao = None
+
+def _exibir_resultado(altura_cm, peso, percentual_gordura, largura_ombro, largura_cintura):
+    """Calcula (com cache) e mostra o resultado. Devolve a mensagem de erro, ou None."""
+    global _ultima_avaliacao
+    _ultima_avaliacao = None  # só volta a valer quando o novo resultado estiver na tela
+    dados_calculo, erro = calcular_pontos_em_cache(
+        altura_cm / 100.0, peso, percentual_gordura, largura_ombro, largura_cintura)
+    if erro:
+        return erro
+
+    percentual = dados_calculo['percentual']
+    classificacao = classificar_potencial(percentual)
+    percentil = texto_percentil(entradas['sexo'].get(), altura_cm, percentual)
+    delta = texto_delta(entradas['membro'].get(), percentual)
+    pontos_max_total = dados_calculo['pm']
+    curvas = MODELO.curvas
+
+    resultado_formatado = (
+        f"##### RESULTADO #####\n"
+        f"\n"
+        f"IMMF: {dados_calculo['immf']:.2f} | Proporção O/C: {dados_calculo['proporcao']:.2f}\n"
+        f"\n"
+        f"Pontuação Altura: {dados_calculo['pa']:.2f} / {curvas['altura'].maximo:.2f}\n"
+        f"Pontuação Gordura: {dados_calculo['pg']:.2f} / {curvas['gordura'].maximo:.2f}\n"
+        f"Pontuação IMMF: {dados_calculo['pi']:.2f} / {curvas['immf'].maximo:.2f}\n"
+        f"Pontuação Proporção: {dados_calculo['pp']:.2f} / {curvas['proporcao'].maximo:.2f}\n"
+        f"\n"
+        f"Pontuação Total VSM: {percentual:.2f}% ({dados_calculo['pt']:.2f} / {pontos_max_total:.2f})\n"
+        f"\n"
+        f"{percentil}"
+        f"{delta}"
+        f"CLASSIFICAÇÃO: {classificacao}"
+    )
+
+    entradas['resultado_label'].config(text=resultado_formatado)
+
+    _ultima_avaliacao = {
+        'altura': altura_cm, 'peso': peso, 'gordura': percentual_gordura,
+        'ombro': largura_ombro, 'cintura': largura_cintura,
+        **{c: dados_calculo[c] for c in COLUNAS_SERIE[5:]},
+    }
+    return None
+
 def calcular_e_exibir():
     """Função chamada pelo botão para pegar dados e mostrar o resultado."""
     try:
-        altura_cm = formatar_float(entradas['altura'].get())
-        peso = formatar_float(entradas['peso'].get())
-        percentual_gordura = formatar_float(entradas['gordura'].get())
-        largura_ombro = formatar_float(entradas['ombro'].get())
-        largura_cintura = formatar_float(entradas['cintura'].get())
+        valores = _ler_formulario()
 
-        if any(v < 0 for v in [altura_cm, peso, percentual_gordura, largura_ombro, largura_cintura]):
+        if any(v < 0 for v in valores):
+            _descartar_avaliacao()
             messagebox.showerror("Erro de Entrada", "Valores não podem ser negativos.")
             return
 
-        altura_m = altura_cm / 100.0
-
-        dados_calculo, erro = calcular_pontos(altura_m, peso, percentual_gordura, largura_ombro, largura_cintura)
+        erro = _exibir_resultado(*valores)
         if erro:
             messagebox.showerror("Erro de Cálculo", erro)
-            return
-
-        percentual = dados_calculo['percentual']
-        classificacao = classificar_potencial(percentual)
-        pontos_max_total = dados_calculo['pm']
-
-        resultado_formatado = (
-            f"##### RESULTADO #####\n"
-            f"\n"
-            f"IMMF: {dados_calculo['immf']:.2f} | Proporção O/C: {dados_calculo['proporcao']:.2f}\n"
-            f"\n"
-            f"Pontuação Altura: {dados_calculo['pa']:.2f} / 2.00\n"
-            f"Pontuação Gordura: {dados_calculo['pg']:.2f} / 3.00\n"
-            f"Pontuação IMMF: {dados_calculo['pi']:.2f} / 3.00\n"
-            f"Pontuação Proporção: {dados_calculo['pp']:.2f} / 2.00\n"
-            f"\n"
-            f"Pontuação Total VSM: {percentual:.2f}% ({dados_calculo['pt']:.2f} / {pontos_max_total:.2f})\n"
-            f"\n"
-            f"CLASSIFICAÇÃO: {classificacao}"
-        )
-
-        entradas['resultado_label'].config(text=resultado_formatado)
 
     except ValueError:
+        _descartar_avaliacao()
         messagebox.showerror("Erro de Entrada", "Por favor, insira números válidos em todos os campos.")
     except Exception as e:
+        _descartar_avaliacao()
         messagebox.showerror("Erro", str(e))
 
-def criar_interface():
-    """Configura e exibe a janela principal do Tkinter."""
-    global entradas
-
-    janela = tk.Tk()
+def recalcular_ao_vivo():
+    """Recalcula sem diálogos; com campos incompletos só mostra o aviso no rótulo."""
+    global _recalculo_agendado
+    _recalculo_agendado = None
+    rotulo = entradas['resultado_label']
+    try:
+        valores = _ler_formulario()
+    except ValueError:
+        _descartar_avaliacao()
+        rotulo.config(text="Aguardando dados...")
+        return
+    if any(v < 0 for v in valores):
+        _descartar_avaliacao()
+        rotulo.config(text="Valores não podem ser negativos.")
+        return
+    try:
+        erro = _exibir_resultado(*valores)
+    except Exception as e:
+        rotulo.config(text=f"Erro: {e}")
+        return
+    if erro:
+        rotulo.config(text=erro)
+
+def agendar_recalculo(*_):
+    """Trace dos campos: (re)agenda o recálculo para ATRASO_RECALCULO_MS depois da última alteração."""
+    global _recalculo_agendado
+    _descartar_avaliacao()
+    rotulo = entradas['resultado_label']
+    if _recalculo_agendado is not None:
+        rotulo.after_cancel(_recalculo_agendado)
+    _recalculo_agendado = rotulo.after(ATRASO_RECALCULO_MS, recalcular_ao_vivo)
+
+def criar_interface(master=None):
+    """Configura e exibe a janela principal do Tkinter. Sem `master` ela é a
+    raiz do programa e roda o mainloop; com `master` (o lançador) é um
+    Toplevel dele. Devolve a janela."""
+    global entradas, HISTORICO
+    carregar_interface()
+
+    HISTORICO = HistoricoAvaliacoes(ARQUIVO_HISTORICO)
+
+    janela = tk.Tk() if master is None else tk.Toplevel(master)
     janela.title("Calculadora de VSM")  # título solicitado
-    janela.geometry("480x500")
+    janela.geometry("480x620")
 
     padx_val, pady_val = 10, 5
 
@@ -217,6 +913,7 @@ def criar_interface():
 
     tk.Label(frame_titulo, text="CALCULADORA DE POTENCIAL").pack(side=tk.LEFT)
     tk.Button(frame_titulo, text="❓", command=mostrar_explicacao, width=2).pack(side=tk.LEFT, padx=5)
+    tk.Button(frame_titulo, text="População...", command=carregar_populacao).pack(side=tk.LEFT)
 
     # --- Widgets de Entrada de Dados ---
     tk.Label(janela, text="Altura (cm):").grid(row=1, column=0, padx=padx_val, pady=pady_val, sticky='w')
@@ -239,18 +936,46 @@ def criar_interface():
     entradas['cintura'] = tk.Entry(janela)
     entradas['cintura'].grid(row=5, column=1, padx=padx_val, pady=pady_val)
 
-    # --- Botão de Cálculo ---
-    tk.Button(janela, text="CALCULAR POTENCIAL", command=calcular_e_exibir,
-              bg='#4CAF50', fg='white').grid(row=6, column=0, columnspan=2, padx=padx_val, pady=15)
+    tk.Label(janela, text="Sexo (M/F, opcional):").grid(row=6, column=0, padx=padx_val, pady=pady_val, sticky='w')
+    entradas['sexo'] = tk.Entry(janela)
+    entradas['sexo'].grid(row=6, column=1, padx=padx_val, pady=pady_val)
+
+    tk.Label(janela, text="Membro (opcional):").grid(row=7, column=0, padx=padx_val, pady=pady_val, sticky='w')
+    entradas['membro'] = tk.Entry(janela)
+    entradas['membro'].grid(row=7, column=1, padx=padx_val, pady=pady_val)
+
+    # --- Botões de Cálculo e Histórico ---
+    frame_botoes = tk.Frame(janela)
+    frame_botoes.grid(row=8, column=0, columnspan=2, padx=padx_val, pady=15)
+    tk.Button(frame_botoes, text="CALCULAR POTENCIAL", command=calcular_e_exibir,
+              bg='#4CAF50', fg='white').pack(side=tk.LEFT)
+    tk.Button(frame_botoes, text="Salvar avaliação", command=salvar_avaliacao).pack(side=tk.LEFT, padx=5)
+    tk.Button(frame_botoes, text="Evolução...", command=abrir_grafico_evolucao).pack(side=tk.LEFT)
+    tk.Button(frame_botoes, text="Metas...", command=abrir_metas).pack(side=tk.LEFT, padx=5)
 
     # --- Label para Mostrar o Resultado ---
     entradas['resultado_label'] = tk.Label(
         janela, text="Aguardando dados...", justify=tk.LEFT, fg='blue', font=('Courier', 10)
     )
-    entradas['resultado_label'].grid(row=7, column=0, columnspan=2, padx=padx_val, pady=pady_val)
-
-    janela.mainloop()
-
-# iniciar
-criar_interface()
+    entradas['resultado_label'].grid(row=9, column=0, columnspan=2, padx=padx_val, pady=pady_val)
+
+    # recálculo ao vivo: cada campo ganha uma StringVar com trace
+    for campo in CAMPOS_AVALIACAO + ('sexo', 'membro'):
+        variavel = tk.StringVar(janela)
+        variavel.trace_add("write", agendar_recalculo)
+        entradas[campo].config(textvariable=variavel)
+        _variaveis_formulario[campo] = variavel
+
+    if master is None:
+        janela.mainloop()
+    return janela
+
+# iniciar (com argumentos: processamento em lote, ex. entrada.csv saida.csv)
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        import processamento_lote
+        sys.exit(processamento_lote.main(sys.argv[1:], pontuar_registros, CAMPOS_RESULTADO,
+                                         "Calcula o VSM de cada avaliação de um arquivo CSV/JSONL.",
+                                         opcoes=_opcoes_linha_de_comando))
+    criar_interface()
 
@@ -0,0 +1,196 @@
+"""Lançador único dos programas da recepção.
+
+Abre o boletim, a locadora, a rifa e as duas calculadoras como janelas
+(Toplevel) de uma só raiz Tk, num só processo. Cada programa só é importado
+quando é aberto pela primeira vez; abrir de novo traz a janela para a frente.
+
+    python lancador.py
+    python lancador.py --medir      # lançador x cinco processos separados
+
+A medida sobe cada programa num processo próprio (com a própria raiz, como
+na recepção hoje) e depois os cinco no lançador, e compara a memória
+residente máxima e o tempo até as janelas estarem desenhadas. Precisa de
+display, como os próprios programas.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+import tkinter as tk
+from tkinter import messagebox
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+def _abrir_boletim(modulo, master):
+    app = modulo.carregar_interface()(master)
+    app.popular_exemplo()
+    return app
+
+def _abrir_locadora(modulo, master):
+    return modulo.carregar_interface()(master)
+
+def _abrir_rifa(modulo, master):
+    return modulo.criar_menu_principal(master)
+
+def _abrir_calculadora(modulo, master):
+    return modulo.criar_interface(master)
+
+# (rótulo do botão, arquivo, abrir(módulo, master) -> janela)
+PROGRAMAS = (
+    ("Locadora de veículos", "locadora de veículos.py", _abrir_locadora),
+    ("Boletim escolar", "boletim escolar.py", _abrir_boletim),
+    ("Rifa", "rifa.py", _abrir_rifa),
+    ("Calculadora de VSM", "calculadora de vsm.py", _abrir_calculadora),
+    ("Calculadora de potencial estético", "calculadora de estética.py", _abrir_calculadora),
+)
+
+def _nome_modulo(arquivo):
+    return "programa_" + os.path.splitext(arquivo)[0].replace(" ", "_")
+
+def carregar_programa(arquivo):
+    """Importa um programa da pasta (os nomes têm espaços e acentos) uma vez só."""
+    nome = _nome_modulo(arquivo)
+    if nome not in sys.modules:
+        spec = importlib.util.spec_from_file_location(nome, os.path.join(DIRETORIO, arquivo))
+        modulo = importlib.util.module_from_spec(spec)
+        sys.modules[nome] = modulo
+        try:
+            spec.loader.exec_module(modulo)
+        except BaseException:
+            del sys.modules[nome]
+            raise
+    return sys.modules[nome]
+
+class Lancador:
+    """Janela com um botão por programa; guarda as janelas abertas."""
+
+    def __init__(self, raiz):
+        self.raiz = raiz
+        self.janelas = {}  # índice em PROGRAMAS -> janela aberta
+        raiz.title("Recepção")
+        raiz.resizable(False, False)
+        tk.Label(raiz, text="PROGRAMAS", font=("Arial", 14, "bold")).pack(pady=(12, 6))
+        for i, (rotulo, _, _) in enumerate(PROGRAMAS):
+            tk.Button(raiz, text=rotulo, width=34, command=lambda i=i: self.abrir(i)).pack(padx=16, pady=3)
+        self.lbl_status = tk.Label(raiz, fg="blue")
+        self.lbl_status.pack(pady=8)
+        raiz.protocol("WM_DELETE_WINDOW", self.fechar)
+        self._atualizar_status()
+
+    def abrir(self, indice):
+        janela = self.janelas.get(indice)
+        if janela is not None and janela.winfo_exists():
+            janela.deiconify()
+            janela.lift()
+            janela.focus_set()
+            return janela
+        rotulo, arquivo, abrir = PROGRAMAS[indice]
+        try:
+            janela = abrir(carregar_programa(arquivo), self.raiz)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Não foi possível abrir {rotulo}: {e}")
+            return None
+        if janela is not None:
+            self.janelas[indice] = janela
+        self._atualizar_status()
+        return janela
+
+    def _atualizar_status(self):
+        carregados = sum(1 for _, arquivo, _ in PROGRAMAS if _nome_modulo(arquivo) in sys.modules)
+        self.lbl_status.config(text=f"Programas carregados: {carregados} de {len(PROGRAMAS)}")
+
+    def fechar(self):
+        """Fecha cada janela pelo próprio protocolo (a rifa grava os dados ao sair)."""
+        for janela in list(self.janelas.values()):
+            if janela.winfo_exists():
+                comando = janela.protocol("WM_DELETE_WINDOW")
+                if comando:
+                    janela.tk.call(comando)
+                elif janela.winfo_exists():
+                    janela.destroy()
+        self.raiz.destroy()
+
+# ===== Medida: lançador x processos separados =====
+# roda num interpretador filho: argv = [índices separados por vírgula]
+_MEDIR = """
+import json, os, sys, time
+inicio = time.perf_counter()
+import tkinter as tk
+import lancador
+raiz = tk.Tk()
+app = lancador.Lancador(raiz) if len(sys.argv[1].split(",")) > 1 else None
+for i in map(int, sys.argv[1].split(",")):
+    if app:
+        app.abrir(i)
+    else:
+        _, arquivo, abrir = lancador.PROGRAMAS[i]
+        abrir(lancador.carregar_programa(arquivo), raiz)
+raiz.update()
+segundos = time.perf_counter() - inicio
+print(json.dumps({"segundos": segundos, "memoria_kib": lancador.memoria_maxima_kib()}), flush=True)
+raiz.destroy()
+"""
+
+def memoria_maxima_kib():
+    """Memória residente máxima do processo (KiB), ou None fora de Unix."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maximo // 1024 if sys.platform == "darwin" else maximo  # bytes no macOS
+
+def _rodar(indices):
+    """(segundos de parede até as janelas desenhadas, dados do filho)."""
+    inicio = time.perf_counter()
+    processo = subprocess.Popen([sys.executable, "-c", _MEDIR, ",".join(map(str, indices))],
+                                cwd=DIRETORIO, stdout=subprocess.PIPE, text=True)
+    linha = processo.stdout.readline()
+    segundos = time.perf_counter() - inicio
+    processo.wait()
+    if processo.returncode or not linha:
+        raise RuntimeError(f"a medida dos programas {indices} falhou (display disponível?)")
+    return segundos, json.loads(linha)
+
+def medir(repeticoes=3):
+    """Compara o lançador com os cinco programas em processos separados."""
+    todos = list(range(len(PROGRAMAS)))
+    separados = []
+    for _ in range(repeticoes):
+        separados.append([_rodar([i]) for i in todos])
+    juntos = [_rodar(todos) for _ in range(repeticoes)]
+
+    tempo_separados = min(sum(s for s, _ in rodada) for rodada in separados)
+    memoria_separados = min(sum(d["memoria_kib"] or 0 for _, d in rodada) for rodada in separados)
+    tempo_juntos = min(s for s, _ in juntos)
+    memoria_juntos = min(d["memoria_kib"] or 0 for _, d in juntos)
+
+    print(f"{'':<28} {'tempo':>10} {'memória':>12}")
+    for i, (rotulo, _, _) in enumerate(PROGRAMAS):
+        s, d = min((rodada[i] for rodada in separados), key=lambda r: r[0])
+        print(f"  {rotulo:<26} {s * 1000:>8.0f}ms {d['memoria_kib'] or 0:>9,} KiB")
+    print(f"{'cinco processos (soma)':<28} {tempo_separados * 1000:>8.0f}ms {memoria_separados:>9,} KiB")
+    print(f"{'lançador (um processo)':<28} {tempo_juntos * 1000:>8.0f}ms {memoria_juntos:>9,} KiB")
+    if memoria_separados:
+        print(f"economia: {1 - memoria_juntos / memoria_separados:.0%} da memória,"
+              f" {1 - tempo_juntos / tempo_separados:.0%} do tempo de partida")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Abre os programas da recepção num só processo.")
+    parser.add_argument("--medir", action="store_true", help="compara o lançador com cinco processos")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args(argv)
+    if args.medir:
+        medir(args.repeticoes)
+        return 0
+    raiz = tk.Tk()
+    Lancador(raiz)
+    raiz.mainloop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
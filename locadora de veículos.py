@@ -3,8 +3,10 @@
 # Copia este arquivo e execute com Python 3.x
 
 from datetime import datetime, date
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+import bisect
+import heapq
+import itertools
+import math
 
 # ===== Bases de dados (em memória) =====
 carros = []      # {"modelo": str, "placa": str, "cor": str, "valor_diaria": float}
@@ -22,7 +24,208 @@ def dias(inicio_str: str, fim_str: str) -> int:
     d2 = parse_data(fim_str)
     return max((d2 - d1).days, 1)
 
+# ===== Monitor de atrasos =====
+INTERVALO_MONITOR_MS = 60_000  # verificação periódica na GUI
+
+def encargo_atraso(loc, hoje=None):
+    """(dias de atraso, valor acumulado) de uma locação aberta cujo fim previsto
+    já passou: o que a devolução hoje cobraria a mais que o previsto, ou seja,
+    dias(início, hoje) - dias(início, fim) diárias; (0, 0.0) se não está atrasada.
+
+    Locação de um dia só (dias() conta no mínimo 1): devolver no dia seguinte
+    não custa nada a mais, só a partir do outro dia.
+
+    >>> loc = {"data_inicio": "2024-01-01", "data_fim": "2024-01-01", "valor_diaria": 100.0}
+    >>> encargo_atraso(loc, date(2024, 1, 2))
+    (0, 0.0)
+    >>> encargo_atraso(loc, date(2024, 1, 3))
+    (1, 100.0)
+    >>> encargo_atraso({**loc, "data_fim": "2024-01-05"}, date(2024, 1, 8))
+    (3, 300.0)
+    """
+    hoje = hoje or date.today()
+    if parse_data(loc["data_fim"]) >= hoje:
+        return 0, 0.0
+    atraso = dias(loc["data_inicio"], hoje.isoformat()) - dias(loc["data_inicio"], loc["data_fim"])
+    return atraso, round(atraso * float(loc["valor_diaria"]), 2)
+
+class MonitorAtrasos:
+    """Locações abertas num heap mínimo pela data prevista de devolução.
+
+    verificar() só retira do topo as que venceram desde a última chamada;
+    locações fechadas nesse meio-tempo são descartadas quando chegam ao topo."""
+
+    def __init__(self):
+        self._heap = []  # (dia ordinal do fim previsto, sequência, locação)
+        self._seq = itertools.count()
+        self.atrasadas = {}  # id(locação) -> locação aberta já vencida
+
+    def adicionar(self, loc):
+        heapq.heappush(self._heap, (parse_data(loc["data_fim"]).toordinal(), next(self._seq), loc))
+
+    def remover(self, loc):
+        """Chamado na devolução; a entrada do heap sai preguiçosamente."""
+        self.atrasadas.pop(id(loc), None)
+
+    def reconstruir(self, todas):
+        self._heap = [(parse_data(l["data_fim"]).toordinal(), next(self._seq), l)
+                      for l in todas if l["status"] == "aberta"]
+        heapq.heapify(self._heap)
+        self.atrasadas = {}
+
+    def verificar(self, hoje=None):
+        """Move para `atrasadas` as locações vencidas (fim previsto antes de hoje)
+        e devolve só as novas."""
+        limite = (hoje or date.today()).toordinal()
+        novas = []
+        while self._heap and self._heap[0][0] < limite:
+            _, _, loc = heapq.heappop(self._heap)
+            if loc["status"] == "aberta":
+                self.atrasadas[id(loc)] = loc
+                novas.append(loc)
+        return novas
+
+    def encargos(self, hoje=None):
+        """(quantidade de atrasadas, total de encargos acumulados)."""
+        total = sum(encargo_atraso(l, hoje)[1] for l in self.atrasadas.values())
+        return len(self.atrasadas), round(total, 2)
+
+MONITOR_ATRASOS = MonitorAtrasos()
+
+# ===== Índice de ocupação por data =====
+class IndiceOcupacao:
+    """Locações de cada placa ordenadas pelo dia de início, para buscar as que
+    cruzam uma janela de datas sem varrer `locacoes`.
+
+    Junto dos fins guarda o maior fim até cada posição (sempre crescente), então
+    a primeira locação que pode alcançar a janela sai por busca binária mesmo
+    que datas lançadas à mão se sobreponham. Dias são ordinais (date.toordinal)
+    e uma locação ocupa [início, fim), com pelo menos um dia, como em dias()."""
+
+    def __init__(self):
+        self._por_placa = {}  # placa -> (inícios, fins, maior fim até ali, locações)
+        self._sujas = set()   # placas com fim alterado desde a última consulta
+        self.primeiro_dia = None
+        self.ultimo_dia = None
+
+    @staticmethod
+    def _periodo(loc):
+        ini = parse_data(loc["data_inicio"]).toordinal()
+        return ini, max(parse_data(loc["data_fim"]).toordinal(), ini + 1)
+
+    def _estender(self, ini, fim):
+        if self.primeiro_dia is None or ini < self.primeiro_dia:
+            self.primeiro_dia = ini
+        if self.ultimo_dia is None or fim > self.ultimo_dia:
+            self.ultimo_dia = fim
+
+    def adicionar(self, loc):
+        ini, fim = self._periodo(loc)
+        placa = loc["carro"]["placa"]
+        inicios, fins, _, locs = self._por_placa.setdefault(placa, ([], [], [], []))
+        i = bisect.bisect_right(inicios, ini)
+        inicios.insert(i, ini)
+        fins.insert(i, fim)
+        locs.insert(i, loc)
+        self._sujas.add(placa)
+        self._estender(ini, fim)
+
+    def atualizar(self, loc):
+        """A devolução troca o fim previsto pelo real; refaz a placa na próxima consulta."""
+        self._sujas.add(loc["carro"]["placa"])
+        self._estender(*self._periodo(loc))
+
+    def reconstruir(self, todas):
+        self.__init__()
+        for loc in todas:
+            self.adicionar(loc)
+
+    def placas(self):
+        return self._por_placa.keys()
+
+    def _preparar(self, placa):
+        inicios, fins, maximos, locs = self._por_placa[placa]
+        fins[:] = [self._periodo(l)[1] for l in locs]
+        maior = -math.inf
+        maximos[:] = [maior := max(maior, f) for f in fins]
+        self._sujas.discard(placa)
+
+    def consultar(self, placa, dia_ini, dia_fim):
+        """Locações da placa que ocupam algum dia em [dia_ini, dia_fim), em ordem de início."""
+        if placa not in self._por_placa:
+            return []
+        if placa in self._sujas:
+            self._preparar(placa)
+        inicios, fins, maximos, locs = self._por_placa[placa]
+        i = bisect.bisect_right(maximos, dia_ini)
+        fim = bisect.bisect_left(inicios, dia_fim, lo=i)
+        return [locs[j] for j in range(i, fim) if fins[j] > dia_ini]
+
+INDICE_OCUPACAO = IndiceOcupacao()
+
+# ===== Histórico por cliente =====
+class ResumoCliente:
+    """Locações de um CPF e os agregados mantidos a cada agendamento e devolução.
+    `total_pago` soma só as locações fechadas; `dias_alugados` usa as diárias
+    previstas das abertas e as cobradas das fechadas."""
+
+    __slots__ = ("locacoes", "quantidade", "dias_alugados", "total_pago", "ultima_locacao")
+
+    def __init__(self):
+        self.locacoes = []
+        self.quantidade = 0
+        self.dias_alugados = 0
+        self.total_pago = 0.0
+        self.ultima_locacao = None  # data de início mais recente (AAAA-MM-DD)
+
+    @property
+    def media_dias(self):
+        return self.dias_alugados / self.quantidade if self.quantidade else 0.0
+
+class HistoricoClientes:
+    """Índice CPF -> ResumoCliente, consultado em O(1) no agendamento."""
+
+    def __init__(self):
+        self._por_cpf = {}
+
+    def resumo(self, cpf):
+        """Resumo do CPF (vazio se ele nunca alugou)."""
+        return self._por_cpf.get(cpf) or ResumoCliente()
+
+    def agendada(self, loc):
+        r = self._por_cpf.setdefault(loc["cliente_cpf"], ResumoCliente())
+        r.locacoes.append(loc)
+        r.quantidade += 1
+        r.dias_alugados += dias(loc["data_inicio"], loc["data_fim"])
+        # compara como data: registros antigos podem ter "2024-3-5" em vez de "2024-03-05"
+        if r.ultima_locacao is None or parse_data(loc["data_inicio"]) > parse_data(r.ultima_locacao):
+            r.ultima_locacao = loc["data_inicio"]
+
+    def devolvida(self, loc, dias_previstos, dias_cobrados):
+        r = self._por_cpf[loc["cliente_cpf"]]
+        r.dias_alugados += dias_cobrados - dias_previstos
+        r.total_pago = round(r.total_pago + loc["valor_total"], 2)
+
+    def reconstruir(self, todas):
+        self._por_cpf = {}
+        for loc in todas:
+            self.agendada(loc)
+            r = self._por_cpf[loc["cliente_cpf"]]
+            if loc["status"] == "fechada":
+                r.total_pago = round(r.total_pago + loc["valor_total"], 2)
+
+HISTORICO_CLIENTES = HistoricoClientes()
+
 # ===== Funções de domínio (sem I/O de console) =====
+def limpar_dados():
+    """Esvazia as bases em memória e os índices mantidos sobre elas."""
+    carros.clear()
+    clientes.clear()
+    locacoes.clear()
+    MONITOR_ATRASOS.reconstruir(locacoes)
+    INDICE_OCUPACAO.reconstruir(locacoes)
+    HISTORICO_CLIENTES.reconstruir(locacoes)
+
 def cadastrar_carro(modelo, placa, cor, diaria_txt):
     if any(c['placa'].lower() == placa.lower() for c in carros):
         raise ValueError("Veículo com esta placa já cadastrado.")
@@ -41,7 +244,9 @@ def agendar_locacao_gui(cpf, placa, data_inicio, data_prevista_fim):
     if not any(c['cpf'] == cpf for c in clientes):
         raise ValueError("Cliente não encontrado.")
     try:
-        _ = parse_data(data_inicio); _ = parse_data(data_prevista_fim)
+        # guardadas sempre como AAAA-MM-DD, mesmo que digitadas sem os zeros
+        data_inicio = parse_data(data_inicio).isoformat()
+        data_prevista_fim = parse_data(data_prevista_fim).isoformat()
     except Exception:
         raise ValueError("Data inválida. Use AAAA-MM-DD.")
     if parse_data(data_prevista_fim) < parse_data(data_inicio):
@@ -61,7 +266,7 @@ def agendar_locacao_gui(cpf, placa, data_inicio, data_prevista_fim):
     valor_total = round(qtd_dias * valor_diaria, 2)
 
     carro_removido = carros.pop(idx_car)
-    locacoes.append({
+    loc = {
         "cliente_nome": cli["nome"],
         "cliente_cpf": cli["cpf"],
         "carro": carro_removido,
@@ -70,7 +275,11 @@ def agendar_locacao_gui(cpf, placa, data_inicio, data_prevista_fim):
         "valor_diaria": valor_diaria,
         "valor_total": valor_total,
         "status": "aberta"
-    })
+    }
+    locacoes.append(loc)
+    MONITOR_ATRASOS.adicionar(loc)
+    INDICE_OCUPACAO.adicionar(loc)
+    HISTORICO_CLIENTES.agendada(loc)
     return qtd_dias, valor_diaria, valor_total
 
 def receber_carro_gui(idx_loc_aberta, data_real_fim, forma_pagamento, valor_dinheiro=None):
@@ -103,6 +312,7 @@ def receber_carro_gui(idx_loc_aberta, data_real_fim, forma_pagamento, valor_dinh
         troco = 0.0
 
     # atualizar locação e devolver carro
+    dias_previstos = dias(loc["data_inicio"], loc["data_fim"])
     for i, l in enumerate(locacoes):
         if l is loc:
             locacoes[i]["data_fim"] = data_real_fim
@@ -110,272 +320,584 @@ def receber_carro_gui(idx_loc_aberta, data_real_fim, forma_pagamento, valor_dinh
             locacoes[i]["status"] = "fechada"
             locacoes[i]["pagamento"] = forma_pagamento
             carros.append(locacoes[i]["carro"])
+            MONITOR_ATRASOS.remover(loc)
+            INDICE_OCUPACAO.atualizar(loc)
+            HISTORICO_CLIENTES.devolvida(loc, dias_previstos, qtd_dias)
             break
 
     return qtd_dias, novo_total, troco
 
 # ===== GUI =====
-class App(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("Locadora - Tkinter")
-        self.geometry("980x640")
-
-        nb = ttk.Notebook(self)
-        nb.pack(fill="both", expand=True, padx=8, pady=8)
-
-        self.tab_carros = ttk.Frame(nb)
-        self.tab_clientes = ttk.Frame(nb)
-        self.tab_locacoes = ttk.Frame(nb)
-        self.tab_relatorios = ttk.Frame(nb)
-
-        nb.add(self.tab_carros, text="Carros")
-        nb.add(self.tab_clientes, text="Clientes")
-        nb.add(self.tab_locacoes, text="Locações")
-        nb.add(self.tab_relatorios, text="Relatórios")
-
-        self._build_carros()
-        self._build_clientes()
-        self._build_locacoes()
-        self._build_relatorios()
-
-        self.refresh_all()
-
-    # ------ Carros ------
-    def _build_carros(self):
-        frm = ttk.LabelFrame(self.tab_carros, text="Cadastrar veículo")
-        frm.pack(fill="x", padx=8, pady=8)
-
-        self.ent_modelo = ttk.Entry(frm, width=30)
-        self.ent_placa  = ttk.Entry(frm, width=20)
-        self.ent_cor    = ttk.Entry(frm, width=20)
-        self.ent_diaria = ttk.Entry(frm, width=12)
-
-        ttk.Label(frm, text="Modelo:").grid(row=0, column=0, sticky="w", padx=4, pady=4)
-        self.ent_modelo.grid(row=0, column=1, sticky="w")
-        ttk.Label(frm, text="Placa:").grid(row=0, column=2, sticky="w", padx=4)
-        self.ent_placa.grid(row=0, column=3, sticky="w")
-        ttk.Label(frm, text="Cor:").grid(row=0, column=4, sticky="w", padx=4)
-        self.ent_cor.grid(row=0, column=5, sticky="w")
-        ttk.Label(frm, text="Diária (R$):").grid(row=0, column=6, sticky="w", padx=4)
-        self.ent_diaria.grid(row=0, column=7, sticky="w")
-
-        ttk.Button(frm, text="Adicionar", command=self.on_add_carro).grid(row=0, column=8, padx=8)
-
-        # tabela
-        self.tree_carros = ttk.Treeview(self.tab_carros, columns=("modelo","placa","cor","diaria"), show="headings", height=16)
-        for i, (h, w) in enumerate([("Modelo",260),("Placa",120),("Cor",120),("Diária (R$)",120)]):
-            self.tree_carros.heading(i, text=h)
-            self.tree_carros.column(i, width=w, anchor="w")
-        self.tree_carros.pack(fill="both", expand=True, padx=8, pady=4)
-
-    def on_add_carro(self):
-        try:
-            cadastrar_carro(self.ent_modelo.get(), self.ent_placa.get(), self.ent_cor.get(), self.ent_diaria.get())
-            self.ent_modelo.delete(0, tk.END); self.ent_placa.delete(0, tk.END)
-            self.ent_cor.delete(0, tk.END); self.ent_diaria.delete(0, tk.END)
-            self.refresh_all()
-            messagebox.showinfo("OK", "Veículo cadastrado.")
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    # ------ Clientes ------
-    def _build_clientes(self):
-        frm = ttk.LabelFrame(self.tab_clientes, text="Cadastrar cliente")
-        frm.pack(fill="x", padx=8, pady=8)
-
-        self.ent_nome = ttk.Entry(frm, width=30)
-        self.ent_cpf  = ttk.Entry(frm, width=20)
-        self.ent_cel  = ttk.Entry(frm, width=20)
-
-        ttk.Label(frm, text="Nome:").grid(row=0, column=0, sticky="w", padx=4, pady=4)
-        self.ent_nome.grid(row=0, column=1, sticky="w")
-        ttk.Label(frm, text="CPF:").grid(row=0, column=2, sticky="w", padx=4)
-        self.ent_cpf.grid(row=0, column=3, sticky="w")
-        ttk.Label(frm, text="Celular:").grid(row=0, column=4, sticky="w", padx=4)
-        self.ent_cel.grid(row=0, column=5, sticky="w")
-
-        ttk.Button(frm, text="Adicionar", command=self.on_add_cliente).grid(row=0, column=6, padx=8)
-
-        self.tree_clientes = ttk.Treeview(self.tab_clientes, columns=("nome","cpf","celular"), show="headings", height=18)
-        for i, (h, w) in enumerate([("Nome",320),("CPF",160),("Celular",160)]):
-            self.tree_clientes.heading(i, text=h)
-            self.tree_clientes.column(i, width=w, anchor="w")
-        self.tree_clientes.pack(fill="both", expand=True, padx=8, pady=4)
-
-    def on_add_cliente(self):
-        try:
-            cadastrar_cliente(self.ent_nome.get(), self.ent_cpf.get(), self.ent_cel.get())
-            self.ent_nome.delete(0, tk.END); self.ent_cpf.delete(0, tk.END); self.ent_cel.delete(0, tk.END)
-            self.refresh_all()
-            messagebox.showinfo("OK", "Cliente cadastrado.")
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    # ------ Locações ------
-    def _build_locacoes(self):
-        frm = ttk.LabelFrame(self.tab_locacoes, text="Agendar locação")
-        frm.pack(fill="x", padx=8, pady=8)
-
-        self.cbo_cpf = ttk.Combobox(frm, width=25, state="readonly")
-        self.cbo_placa = ttk.Combobox(frm, width=18, state="readonly")
-        self.ent_data_ini = ttk.Entry(frm, width=12)
-        self.ent_data_fim = ttk.Entry(frm, width=12)
-
-        ttk.Label(frm, text="Cliente (CPF):").grid(row=0, column=0, sticky="w", padx=4, pady=4)
-        self.cbo_cpf.grid(row=0, column=1, sticky="w")
-        ttk.Label(frm, text="Carro (placa):").grid(row=0, column=2, sticky="w", padx=6)
-        self.cbo_placa.grid(row=0, column=3, sticky="w")
-        ttk.Label(frm, text="Início (AAAA-MM-DD):").grid(row=0, column=4, sticky="w", padx=6)
-        self.ent_data_ini.grid(row=0, column=5, sticky="w")
-        ttk.Label(frm, text="Fim previsto (AAAA-MM-DD):").grid(row=0, column=6, sticky="w", padx=6)
-        self.ent_data_fim.grid(row=0, column=7, sticky="w")
-
-        ttk.Button(frm, text="Agendar", command=self.on_agendar).grid(row=0, column=8, padx=8)
-
-        # tabela locações
-        cols = ("status","cliente","cpf","modelo","placa","inicio","fim","diaria","total","pgto")
-        self.tree_loc = ttk.Treeview(self.tab_locacoes, columns=cols, show="headings", height=14)
-        headers = [("Status",90),("Cliente",180),("CPF",120),("Modelo",180),("Placa",100),
-                   ("Início",100),("Fim",100),("Diária",90),("Total",90),("Pagamento",120)]
-        for i, (h, w) in enumerate(headers):
-            self.tree_loc.heading(cols[i], text=h)
-            self.tree_loc.column(cols[i], width=w, anchor="w")
-        self.tree_loc.pack(fill="both", expand=True, padx=8, pady=4)
-
-        # Receber devolução
-        frm2 = ttk.LabelFrame(self.tab_locacoes, text="Receber devolução")
-        frm2.pack(fill="x", padx=8, pady=8)
-
-        ttk.Label(frm2, text="Selecione uma locação ABERTA na tabela acima.").grid(row=0, column=0, columnspan=2, sticky="w", padx=4, pady=2)
-        ttk.Label(frm2, text="Data fim real (AAAA-MM-DD):").grid(row=1, column=0, sticky="w", padx=4, pady=4)
-        self.ent_data_real = ttk.Entry(frm2, width=14)
-        self.ent_data_real.grid(row=1, column=1, sticky="w")
-
-        ttk.Label(frm2, text="Pagamento:").grid(row=1, column=2, sticky="w", padx=12)
-        self.cbo_pgto = ttk.Combobox(frm2, values=["Dinheiro","Pix","Cartão"], width=12, state="readonly")
-        self.cbo_pgto.grid(row=1, column=3, sticky="w")
-        self.ent_valor_din = ttk.Entry(frm2, width=12)
-        ttk.Label(frm2, text="Valor recebido (se Dinheiro):").grid(row=1, column=4, sticky="w", padx=12)
-        self.ent_valor_din.grid(row=1, column=5, sticky="w")
-
-        ttk.Button(frm2, text="Confirmar devolução", command=self.on_receber).grid(row=1, column=6, padx=12)
-
-    def on_agendar(self):
-        cpf = self.cbo_cpf.get()
-        placa = self.cbo_placa.get()
-        ini = self.ent_data_ini.get().strip()
-        fim = self.ent_data_fim.get().strip()
-        try:
-            qtd_dias, diaria, total = agendar_locacao_gui(cpf, placa, ini, fim)
-            self.refresh_all()
-            messagebox.showinfo("OK", f"Locação criada.\nDias: {qtd_dias}\nDiária: R$ {diaria:.2f}\nTotal: R$ {total:.2f}")
-            self.ent_data_ini.delete(0, tk.END); self.ent_data_fim.delete(0, tk.END)
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    def on_receber(self):
-        # pegar seleção que esteja ABERTA
-        selecionados = self.tree_loc.selection()
-        if not selecionados:
-            messagebox.showwarning("Atenção", "Selecione uma locação ABERTA na tabela.")
-            return
-        item_id = selecionados[0]
-        vals = self.tree_loc.item(item_id, "values")
-        if vals[0].lower() != "aberta":
-            messagebox.showwarning("Atenção", "A locação selecionada já está fechada.")
-            return
-
-        # localizar índice dentro da lista de abertas
-        abertas = [l for l in locacoes if l["status"] == "aberta"]
-        # mapeamos pela combinação cliente+placa+inicio
-        cliente, placa, inicio = vals[1], vals[4], vals[5]
-        idx = None
-        for i, l in enumerate(abertas):
-            if l["cliente_nome"] == cliente and l["carro"]["placa"] == placa and l["data_inicio"] == inicio:
-                idx = i; break
-        if idx is None:
-            messagebox.showerror("Erro", "Não foi possível localizar a locação aberta selecionada.")
-            return
-
-        data_real = self.ent_data_real.get().strip()
-        forma = self.cbo_pgto.get() or "Pix"
-        valor_din = self.ent_valor_din.get().strip() if forma == "Dinheiro" else None
-
-        try:
-            qtd, total, troco = receber_carro_gui(idx, data_real, forma, valor_din)
+# CalendarioOcupacao e App só são definidas por carregar_interface(), chamada
+# no __main__: quem importa este arquivo pelas funções de domínio não carrega o Tk.
+tk = ttk = messagebox = simpledialog = None
+CalendarioOcupacao = App = None
+
+class _PoolItens:
+    """Itens de um tipo reaproveitados entre redesenhos do Canvas: cada quadro
+    reposiciona os que precisa e esconde o resto, sem criar nem apagar itens."""
+
+    def __init__(self, canvas, tipo, **opcoes):
+        self.canvas, self.tipo, self.opcoes = canvas, tipo, opcoes
+        self.itens = []
+        self.usados = 0
+
+    def obter(self, *coords, **config):
+        if self.usados == len(self.itens):
+            self.itens.append(getattr(self.canvas, "create_" + self.tipo)(*coords, **self.opcoes))
+        item = self.itens[self.usados]
+        self.usados += 1
+        self.canvas.coords(item, *coords)
+        self.canvas.itemconfigure(item, state="normal", **config)
+        return item
+
+    def encerrar(self):
+        for item in self.itens[self.usados:]:
+            self.canvas.itemconfigure(item, state="hidden")
+        self.usados = 0
+
+def carregar_interface():
+    """Importa o tkinter e define as classes da interface (uma vez só). Devolve App."""
+    global tk, ttk, messagebox, simpledialog, CalendarioOcupacao, App
+    if App is not None:
+        return App
+    import tkinter as tk
+    from tkinter import ttk, messagebox, simpledialog
+
+    class CalendarioOcupacao(ttk.Frame):
+        """Gráfico de Gantt da frota: uma faixa por placa, uma barra por locação.
+
+        Só as faixas e os dias visíveis são consultados no INDICE_OCUPACAO e
+        desenhados, com itens reaproveitados, então o custo de cada quadro depende
+        do tamanho da janela e não da frota."""
+
+        ALTURA_FAIXA = 18
+        LARGURA_ROTULO = 90
+        ALTURA_CABECALHO = 22
+        ZOOM_MIN, ZOOM_MAX = 2.0, 48.0  # pixels por dia
+        CORES = {"aberta": "#4a90d9", "fechada": "#8fbf72", "atrasada": "#d9534f"}
+
+        def __init__(self, master):
+            super().__init__(master)
+            barra = ttk.Frame(self)
+            barra.pack(fill="x", padx=4, pady=4)
+            ttk.Button(barra, text="−", width=3, command=lambda: self.zoom(1 / 1.5)).pack(side="left")
+            ttk.Button(barra, text="+", width=3, command=lambda: self.zoom(1.5)).pack(side="left", padx=2)
+            ttk.Button(barra, text="Hoje", command=self.ir_para_hoje).pack(side="left", padx=6)
+            self.lbl_info = ttk.Label(barra, text="Clique numa barra para ver a locação.")
+            self.lbl_info.pack(side="left", padx=12)
+
+            area = ttk.Frame(self)
+            area.pack(fill="both", expand=True)
+            self.canvas = tk.Canvas(area, background="white", highlightthickness=0)
+            self.sb_y = ttk.Scrollbar(area, orient="vertical", command=self._rolar_y)
+            self.sb_x = ttk.Scrollbar(area, orient="horizontal", command=self._rolar_x)
+            self.canvas.grid(row=0, column=0, sticky="nsew")
+            self.sb_y.grid(row=0, column=1, sticky="ns")
+            self.sb_x.grid(row=1, column=0, sticky="ew")
+            area.rowconfigure(0, weight=1)
+            area.columnconfigure(0, weight=1)
+
+            c = self.canvas
+            self._grade = _PoolItens(c, "line", fill="#e6e6e6")
+            self._barras = _PoolItens(c, "rectangle", outline="")
+            self._textos_barra = _PoolItens(c, "text", anchor="w", font=("TkDefaultFont", 8), fill="white")
+            self._fundo_rotulos = c.create_rectangle(0, 0, 0, 0, fill="#f4f4f4", outline="")
+            self._fundo_cabecalho = c.create_rectangle(0, 0, 0, 0, fill="#f4f4f4", outline="")
+            self._rotulos = _PoolItens(c, "text", anchor="w", font=("TkDefaultFont", 8))
+            self._datas = _PoolItens(c, "text", anchor="w", font=("TkDefaultFont", 8))
+            self._linha_hoje = c.create_line(0, 0, 0, 0, fill="#b00020", width=2)
+
+            self.placas = []
+            self.px_por_dia = 12.0
+            self.primeiro_dia = self.ultimo_dia = date.today().toordinal()
+            self.dia_x = None   # dia (fracionário) na borda esquerda
+            self.y = 0.0        # pixels rolados na vertical
+            self._loc_do_item = {}
+            self._agendado = False
+
+            c.bind("<Configure>", lambda e: self.redesenhar())
+            c.bind("<MouseWheel>", self._roda)
+            c.bind("<Shift-MouseWheel>", lambda e: self._rolar_x("scroll", -1 if e.delta > 0 else 1, "units"))
+            c.bind("<Control-MouseWheel>", lambda e: self.zoom(1.25 if e.delta > 0 else 0.8))
+            c.bind("<Button-4>", lambda e: self._rolar_y("scroll", -3, "units"))
+            c.bind("<Button-5>", lambda e: self._rolar_y("scroll", 3, "units"))
+            c.bind("<Shift-Button-4>", lambda e: self._rolar_x("scroll", -1, "units"))
+            c.bind("<Shift-Button-5>", lambda e: self._rolar_x("scroll", 1, "units"))
+            c.tag_bind("barra", "<Button-1>", self._clique_barra)
+
+        # ---- dados ----
+        def atualizar(self):
+            """Relê a lista de placas e o período coberto; chamado a cada refresh da App."""
+            self.placas = sorted(set(INDICE_OCUPACAO.placas()).union(c["placa"] for c in carros))
+            hoje = date.today().toordinal()
+            self.primeiro_dia = min(INDICE_OCUPACAO.primeiro_dia or hoje, hoje) - 7
+            self.ultimo_dia = max(INDICE_OCUPACAO.ultimo_dia or hoje, hoje) + 30
+            if self.dia_x is None:
+                self.dia_x = hoje - 7
+            self.redesenhar()
+
+        # ---- geometria ----
+        def _area(self):
+            largura = max(self.canvas.winfo_width() - self.LARGURA_ROTULO, 1)
+            altura = max(self.canvas.winfo_height() - self.ALTURA_CABECALHO, 1)
+            return largura, altura
+
+        def _limitar(self):
+            largura, altura = self._area()
+            dias_visiveis = largura / self.px_por_dia
+            self.dia_x = min(max(self.dia_x, self.primeiro_dia), max(self.ultimo_dia - dias_visiveis, self.primeiro_dia))
+            altura_total = len(self.placas) * self.ALTURA_FAIXA
+            self.y = min(max(self.y, 0.0), max(altura_total - altura, 0.0))
+
+        def _rolar_y(self, acao, valor, unidade=None):
+            _, altura = self._area()
+            if acao == "moveto":
+                self.y = float(valor) * len(self.placas) * self.ALTURA_FAIXA
+            else:
+                passo = altura if unidade == "pages" else self.ALTURA_FAIXA
+                self.y += int(valor) * passo
+            self.redesenhar()
+
+        def _rolar_x(self, acao, valor, unidade=None):
+            largura, _ = self._area()
+            if acao == "moveto":
+                self.dia_x = self.primeiro_dia + float(valor) * (self.ultimo_dia - self.primeiro_dia)
+            else:
+                passo = largura / self.px_por_dia if unidade == "pages" else max(1.0, 40 / self.px_por_dia)
+                self.dia_x += int(valor) * passo
+            self.redesenhar()
+
+        def _roda(self, evento):
+            self._rolar_y("scroll", -3 if evento.delta > 0 else 3, "units")
+
+        def zoom(self, fator):
+            """Muda os pixels por dia mantendo o dia do centro da janela."""
+            largura, _ = self._area()
+            centro = self.dia_x + largura / self.px_por_dia / 2
+            self.px_por_dia = min(max(self.px_por_dia * fator, self.ZOOM_MIN), self.ZOOM_MAX)
+            self.dia_x = centro - largura / self.px_por_dia / 2
+            self.redesenhar()
+
+        def ir_para_hoje(self):
+            self.dia_x = date.today().toordinal() - 7
+            self.redesenhar()
+
+        # ---- desenho ----
+        def redesenhar(self):
+            """Agrupa os pedidos de redesenho do mesmo ciclo de eventos num só quadro."""
+            if not self._agendado:
+                self._agendado = True
+                self.after_idle(self._desenhar)
+
+        def _passo_datas(self):
+            for passo in (1, 2, 7, 14, 30, 61, 91, 182, 365):
+                if passo * self.px_por_dia >= 44:
+                    return passo
+            return 365
+
+        def _desenhar(self):
+            self._agendado = False
+            if self.dia_x is None:
+                return
+            self._limitar()
+            c = self.canvas
+            largura, altura = self._area()
+            x0, y0 = self.LARGURA_ROTULO, self.ALTURA_CABECALHO
+            px = self.px_por_dia
+            dia_ini = math.floor(self.dia_x)
+            dia_fim = math.ceil(self.dia_x + largura / px)
+            faixa_ini = int(self.y // self.ALTURA_FAIXA)
+            faixa_fim = min(len(self.placas), int((self.y + altura) // self.ALTURA_FAIXA) + 1)
+
+            def x_do_dia(dia):
+                return x0 + (dia - self.dia_x) * px
+
+            # grade e datas do cabeçalho
+            passo = self._passo_datas()
+            for dia in range(dia_ini - dia_ini % passo, dia_fim + 1, passo):
+                x = x_do_dia(dia)
+                if x < x0:
+                    continue
+                self._grade.obter(x, y0, x, y0 + altura)
+                self._datas.obter(x + 2, y0 / 2, text=date.fromordinal(dia).strftime("%d/%m/%y" if passo >= 30 else "%d/%m"))
+
+            # barras das faixas visíveis
+            hoje = date.today().toordinal()
+            self._loc_do_item = {}
+            for faixa in range(faixa_ini, faixa_fim):
+                placa = self.placas[faixa]
+                topo = y0 + faixa * self.ALTURA_FAIXA - self.y
+                self._rotulos.obter(4, topo + self.ALTURA_FAIXA / 2, text=placa)
+                for loc in INDICE_OCUPACAO.consultar(placa, dia_ini, dia_fim):
+                    ini, fim = IndiceOcupacao._periodo(loc)
+                    xa = max(x_do_dia(ini), x0)
+                    xb = min(x_do_dia(fim), x0 + largura)
+                    if loc["status"] == "aberta" and id(loc) in MONITOR_ATRASOS.atrasadas:
+                        cor = self.CORES["atrasada"]
+                    else:
+                        cor = self.CORES[loc["status"]]
+                    item = self._barras.obter(xa, topo + 2, xb, topo + self.ALTURA_FAIXA - 2, fill=cor, tags=("barra",))
+                    self._loc_do_item[item] = loc
+                    if xb - xa > 40:
+                        self._textos_barra.obter(xa + 3, topo + self.ALTURA_FAIXA / 2, text=loc["cliente_nome"])
+
+            x_hoje = x_do_dia(hoje)
+            if x0 <= x_hoje <= x0 + largura:
+                c.coords(self._linha_hoje, x_hoje, y0, x_hoje, y0 + altura)
+                c.itemconfigure(self._linha_hoje, state="normal")
+            else:
+                c.itemconfigure(self._linha_hoje, state="hidden")
+
+            c.coords(self._fundo_rotulos, 0, 0, x0, y0 + altura)
+            c.coords(self._fundo_cabecalho, 0, 0, x0 + largura, y0)
+            for pool in (self._grade, self._barras, self._textos_barra, self._rotulos, self._datas):
+                pool.encerrar()
+            # rótulos e cabeçalho por cima das barras que passam por baixo deles
+            for item in (self._fundo_rotulos, self._fundo_cabecalho, *self._rotulos.itens, *self._datas.itens):
+                c.tag_raise(item)
+
+            altura_total = max(len(self.placas) * self.ALTURA_FAIXA, 1)
+            self.sb_y.set(self.y / altura_total, min((self.y + altura) / altura_total, 1.0))
+            total_dias = self.ultimo_dia - self.primeiro_dia
+            self.sb_x.set((self.dia_x - self.primeiro_dia) / total_dias,
+                          min((self.dia_x + largura / px - self.primeiro_dia) / total_dias, 1.0))
+
+        def _clique_barra(self, evento):
+            itens = self.canvas.find_withtag("current")
+            loc = self._loc_do_item.get(itens[0]) if itens else None
+            if loc is not None:
+                self.lbl_info.configure(text=(
+                    f"{loc['carro']['placa']} — {loc['cliente_nome']} ({loc['cliente_cpf']}): "
+                    f"{loc['data_inicio']} a {loc['data_fim']}, {loc['status']}, R$ {loc['valor_total']:.2f}"))
+
+    class App(tk.Toplevel):
+        def __init__(self, master=None):
+            # Sozinho o programa cria a própria raiz (oculta) e a encerra ao
+            # fechar; no lançador a janela é um Toplevel da raiz compartilhada.
+            self._raiz_propria = master is None
+            if master is None:
+                master = tk.Tk()
+                master.withdraw()
+            super().__init__(master)
+            self.title("Locadora - Tkinter")
+            self.geometry("980x640")
+
+            nb = ttk.Notebook(self)
+            nb.pack(fill="both", expand=True, padx=8, pady=8)
+
+            self.tab_carros = ttk.Frame(nb)
+            self.tab_clientes = ttk.Frame(nb)
+            self.tab_locacoes = ttk.Frame(nb)
+            self.tab_relatorios = ttk.Frame(nb)
+            self.calendario = CalendarioOcupacao(nb)
+
+            nb.add(self.tab_carros, text="Carros")
+            nb.add(self.tab_clientes, text="Clientes")
+            nb.add(self.tab_locacoes, text="Locações")
+            nb.add(self.calendario, text="Calendário")
+            nb.add(self.tab_relatorios, text="Relatórios")
+
+            self._build_carros()
+            self._build_clientes()
+            self._build_locacoes()
+            self._build_relatorios()
+
+            self._item_da_locacao = {}  # id(locação) -> item da tree_loc
+            self._id_monitor = None
             self.refresh_all()
-            msg = f"Devolução registrada.\nDiárias: {qtd}\nTotal: R$ {total:.2f}"
-            if forma == "Dinheiro":
-                msg += f"\nTroco: R$ {troco:.2f}"
-            messagebox.showinfo("OK", msg)
-            self.ent_data_real.delete(0, tk.END); self.ent_valor_din.delete(0, tk.END)
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    # ------ Relatórios ------
-    def _build_relatorios(self):
-        self.lbl_loc_abertas = ttk.Label(self.tab_relatorios, text="Abertas: 0")
-        self.lbl_loc_fechadas = ttk.Label(self.tab_relatorios, text="Fechadas: 0")
-        self.lbl_fat_real = ttk.Label(self.tab_relatorios, text="Faturamento realizado: R$ 0,00")
-        self.lbl_fat_prev = ttk.Label(self.tab_relatorios, text="Faturamento previsto: R$ 0,00")
-        self.lbl_total = ttk.Label(self.tab_relatorios, text="Total geral estimado: R$ 0,00")
-
-        pad = {"padx": 12, "pady": 8, "sticky": "w"}
-        ttk.Label(self.tab_relatorios, text="RELATÓRIOS", font=("TkDefaultFont", 12, "bold")).grid(row=0, column=0, **pad)
-        self.lbl_loc_abertas.grid(row=1, column=0, **pad)
-        self.lbl_loc_fechadas.grid(row=2, column=0, **pad)
-        self.lbl_fat_real.grid(row=3, column=0, **pad)
-        self.lbl_fat_prev.grid(row=4, column=0, **pad)
-        self.lbl_total.grid(row=5, column=0, **pad)
-
-        ttk.Button(self.tab_relatorios, text="Atualizar", command=self.refresh_relatorios)\
-            .grid(row=6, column=0, padx=12, pady=12, sticky="w")
-
-    # ------ Refresh helpers ------
-    def refresh_carros(self):
-        self.tree_carros.delete(*self.tree_carros.get_children())
-        for c in carros:
-            self.tree_carros.insert("", "end", values=(c["modelo"], c["placa"], c["cor"], f"{c['valor_diaria']:.2f}"))
-        self.cbo_placa["values"] = [c["placa"] for c in carros]
-
-    def refresh_clientes(self):
-        self.tree_clientes.delete(*self.tree_clientes.get_children())
-        for c in clientes:
-            self.tree_clientes.insert("", "end", values=(c["nome"], c["cpf"], c["celular"]))
-        self.cbo_cpf["values"] = [c["cpf"] for c in clientes]
-
-    def refresh_locacoes(self):
-        self.tree_loc.delete(*self.tree_loc.get_children())
-        for l in locacoes:
-            car = l["carro"]
-            self.tree_loc.insert("", "end", values=(
-                l["status"], l["cliente_nome"], l["cliente_cpf"],
-                car["modelo"], car["placa"],
-                l["data_inicio"], l["data_fim"],
-                f"{l['valor_diaria']:.2f}", f"{l['valor_total']:.2f}",
-                l.get("pagamento","-")
-            ))
-
-    def refresh_relatorios(self):
-        abertas = [l for l in locacoes if l["status"] == "aberta"]
-        fechadas = [l for l in locacoes if l["status"] == "fechada"]
-        fat_real = sum(l["valor_total"] for l in fechadas)
-        fat_prev = sum(l["valor_total"] for l in abertas)
-        self.lbl_loc_abertas.configure(text=f"Abertas: {len(abertas)}")
-        self.lbl_loc_fechadas.configure(text=f"Fechadas: {len(fechadas)}")
-        self.lbl_fat_real.configure(text=f"Faturamento realizado: R$ {fat_real:.2f}")
-        self.lbl_fat_prev.configure(text=f"Faturamento previsto: R$ {fat_prev:.2f}")
-        self.lbl_total.configure(text=f"Total geral estimado: R$ {fat_real + fat_prev:.2f}")
-
-    def refresh_all(self):
-        self.refresh_carros()
-        self.refresh_clientes()
-        self.refresh_locacoes()
-        self.refresh_relatorios()
+            self.verificar_atrasos()
+            self.protocol("WM_DELETE_WINDOW", self._fechar)
+
+        def _fechar(self):
+            if self._id_monitor is not None:
+                self.after_cancel(self._id_monitor)
+                self._id_monitor = None
+            (self.master if self._raiz_propria else self).destroy()
+
+        # ------ Carros ------
+        def _build_carros(self):
+            frm = ttk.LabelFrame(self.tab_carros, text="Cadastrar veículo")
+            frm.pack(fill="x", padx=8, pady=8)
+
+            self.ent_modelo = ttk.Entry(frm, width=30)
+            self.ent_placa  = ttk.Entry(frm, width=20)
+            self.ent_cor    = ttk.Entry(frm, width=20)
+            self.ent_diaria = ttk.Entry(frm, width=12)
+
+            ttk.Label(frm, text="Modelo:").grid(row=0, column=0, sticky="w", padx=4, pady=4)
+            self.ent_modelo.grid(row=0, column=1, sticky="w")
+            ttk.Label(frm, text="Placa:").grid(row=0, column=2, sticky="w", padx=4)
+            self.ent_placa.grid(row=0, column=3, sticky="w")
+            ttk.Label(frm, text="Cor:").grid(row=0, column=4, sticky="w", padx=4)
+            self.ent_cor.grid(row=0, column=5, sticky="w")
+            ttk.Label(frm, text="Diária (R$):").grid(row=0, column=6, sticky="w", padx=4)
+            self.ent_diaria.grid(row=0, column=7, sticky="w")
+
+            ttk.Button(frm, text="Adicionar", command=self.on_add_carro).grid(row=0, column=8, padx=8)
+
+            # tabela
+            self.tree_carros = ttk.Treeview(self.tab_carros, columns=("modelo","placa","cor","diaria"), show="headings", height=16)
+            for i, (h, w) in enumerate([("Modelo",260),("Placa",120),("Cor",120),("Diária (R$)",120)]):
+                self.tree_carros.heading(i, text=h)
+                self.tree_carros.column(i, width=w, anchor="w")
+            self.tree_carros.pack(fill="both", expand=True, padx=8, pady=4)
+
+        def on_add_carro(self):
+            try:
+                cadastrar_carro(self.ent_modelo.get(), self.ent_placa.get(), self.ent_cor.get(), self.ent_diaria.get())
+                self.ent_modelo.delete(0, tk.END); self.ent_placa.delete(0, tk.END)
+                self.ent_cor.delete(0, tk.END); self.ent_diaria.delete(0, tk.END)
+                self.refresh_all()
+                messagebox.showinfo("OK", "Veículo cadastrado.")
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
+
+        # ------ Clientes ------
+        def _build_clientes(self):
+            frm = ttk.LabelFrame(self.tab_clientes, text="Cadastrar cliente")
+            frm.pack(fill="x", padx=8, pady=8)
+
+            self.ent_nome = ttk.Entry(frm, width=30)
+            self.ent_cpf  = ttk.Entry(frm, width=20)
+            self.ent_cel  = ttk.Entry(frm, width=20)
+
+            ttk.Label(frm, text="Nome:").grid(row=0, column=0, sticky="w", padx=4, pady=4)
+            self.ent_nome.grid(row=0, column=1, sticky="w")
+            ttk.Label(frm, text="CPF:").grid(row=0, column=2, sticky="w", padx=4)
+            self.ent_cpf.grid(row=0, column=3, sticky="w")
+            ttk.Label(frm, text="Celular:").grid(row=0, column=4, sticky="w", padx=4)
+            self.ent_cel.grid(row=0, column=5, sticky="w")
+
+            ttk.Button(frm, text="Adicionar", command=self.on_add_cliente).grid(row=0, column=6, padx=8)
+
+            self.tree_clientes = ttk.Treeview(self.tab_clientes, columns=("nome","cpf","celular"), show="headings", height=18)
+            for i, (h, w) in enumerate([("Nome",320),("CPF",160),("Celular",160)]):
+                self.tree_clientes.heading(i, text=h)
+                self.tree_clientes.column(i, width=w, anchor="w")
+            self.tree_clientes.pack(fill="both", expand=True, padx=8, pady=4)
+
+        def on_add_cliente(self):
+            try:
+                cadastrar_cliente(self.ent_nome.get(), self.ent_cpf.get(), self.ent_cel.get())
+                self.ent_nome.delete(0, tk.END); self.ent_cpf.delete(0, tk.END); self.ent_cel.delete(0, tk.END)
+                self.refresh_all()
+                messagebox.showinfo("OK", "Cliente cadastrado.")
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
+
+        # ------ Locações ------
+        def _build_locacoes(self):
+            frm = ttk.LabelFrame(self.tab_locacoes, text="Agendar locação")
+            frm.pack(fill="x", padx=8, pady=8)
+
+            self.cbo_cpf = ttk.Combobox(frm, width=25, state="readonly")
+            self.cbo_placa = ttk.Combobox(frm, width=18, state="readonly")
+            self.ent_data_ini = ttk.Entry(frm, width=12)
+            self.ent_data_fim = ttk.Entry(frm, width=12)
+
+            ttk.Label(frm, text="Cliente (CPF):").grid(row=0, column=0, sticky="w", padx=4, pady=4)
+            self.cbo_cpf.grid(row=0, column=1, sticky="w")
+            ttk.Label(frm, text="Carro (placa):").grid(row=0, column=2, sticky="w", padx=6)
+            self.cbo_placa.grid(row=0, column=3, sticky="w")
+            ttk.Label(frm, text="Início (AAAA-MM-DD):").grid(row=0, column=4, sticky="w", padx=6)
+            self.ent_data_ini.grid(row=0, column=5, sticky="w")
+            ttk.Label(frm, text="Fim previsto (AAAA-MM-DD):").grid(row=0, column=6, sticky="w", padx=6)
+            self.ent_data_fim.grid(row=0, column=7, sticky="w")
+
+            ttk.Button(frm, text="Agendar", command=self.on_agendar).grid(row=0, column=8, padx=8)
+
+            self.lbl_historico = ttk.Label(frm, text="")
+            self.lbl_historico.grid(row=1, column=0, columnspan=9, sticky="w", padx=4, pady=(0, 4))
+            self.cbo_cpf.bind("<<ComboboxSelected>>", lambda e: self.mostrar_historico_cliente())
+
+            self.lbl_atrasos = ttk.Label(self.tab_locacoes, text="Atrasadas: 0", foreground="#b00020")
+            self.lbl_atrasos.pack(anchor="w", padx=12)
+
+            # tabela locações
+            cols = ("status","cliente","cpf","modelo","placa","inicio","fim","diaria","total","pgto")
+            self.tree_loc = ttk.Treeview(self.tab_locacoes, columns=cols, show="headings", height=14)
+            headers = [("Status",90),("Cliente",180),("CPF",120),("Modelo",180),("Placa",100),
+                       ("Início",100),("Fim",100),("Diária",90),("Total",90),("Pagamento",120)]
+            for i, (h, w) in enumerate(headers):
+                self.tree_loc.heading(cols[i], text=h)
+                self.tree_loc.column(cols[i], width=w, anchor="w")
+            self.tree_loc.tag_configure("atrasada", background="#ffd6d6")
+            self.tree_loc.pack(fill="both", expand=True, padx=8, pady=4)
+
+            # Receber devolução
+            frm2 = ttk.LabelFrame(self.tab_locacoes, text="Receber devolução")
+            frm2.pack(fill="x", padx=8, pady=8)
+
+            ttk.Label(frm2, text="Selecione uma locação ABERTA na tabela acima.").grid(row=0, column=0, columnspan=2, sticky="w", padx=4, pady=2)
+            ttk.Label(frm2, text="Data fim real (AAAA-MM-DD):").grid(row=1, column=0, sticky="w", padx=4, pady=4)
+            self.ent_data_real = ttk.Entry(frm2, width=14)
+            self.ent_data_real.grid(row=1, column=1, sticky="w")
+
+            ttk.Label(frm2, text="Pagamento:").grid(row=1, column=2, sticky="w", padx=12)
+            self.cbo_pgto = ttk.Combobox(frm2, values=["Dinheiro","Pix","Cartão"], width=12, state="readonly")
+            self.cbo_pgto.grid(row=1, column=3, sticky="w")
+            self.ent_valor_din = ttk.Entry(frm2, width=12)
+            ttk.Label(frm2, text="Valor recebido (se Dinheiro):").grid(row=1, column=4, sticky="w", padx=12)
+            self.ent_valor_din.grid(row=1, column=5, sticky="w")
+
+            ttk.Button(frm2, text="Confirmar devolução", command=self.on_receber).grid(row=1, column=6, padx=12)
+
+        def mostrar_historico_cliente(self):
+            cpf = self.cbo_cpf.get()
+            if not cpf:
+                self.lbl_historico.configure(text="")
+                return
+            r = HISTORICO_CLIENTES.resumo(cpf)
+            if not r.quantidade:
+                self.lbl_historico.configure(text="Primeira locação deste cliente.")
+                return
+            self.lbl_historico.configure(text=(
+                f"Histórico: {r.quantidade} locação(ões), {r.dias_alugados} diárias "
+                f"(média {r.media_dias:.1f}), R$ {r.total_pago:.2f} pagos, última em {r.ultima_locacao}"))
+
+        def on_agendar(self):
+            cpf = self.cbo_cpf.get()
+            placa = self.cbo_placa.get()
+            ini = self.ent_data_ini.get().strip()
+            fim = self.ent_data_fim.get().strip()
+            try:
+                qtd_dias, diaria, total = agendar_locacao_gui(cpf, placa, ini, fim)
+                self.refresh_all()
+                self.verificar_atrasos()  # locação lançada com fim já vencido
+                messagebox.showinfo("OK", f"Locação criada.\nDias: {qtd_dias}\nDiária: R$ {diaria:.2f}\nTotal: R$ {total:.2f}")
+                self.ent_data_ini.delete(0, tk.END); self.ent_data_fim.delete(0, tk.END)
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
+
+        def on_receber(self):
+            # pegar seleção que esteja ABERTA
+            selecionados = self.tree_loc.selection()
+            if not selecionados:
+                messagebox.showwarning("Atenção", "Selecione uma locação ABERTA na tabela.")
+                return
+            item_id = selecionados[0]
+            vals = self.tree_loc.item(item_id, "values")
+            if vals[0].lower() != "aberta":
+                messagebox.showwarning("Atenção", "A locação selecionada já está fechada.")
+                return
+
+            # localizar índice dentro da lista de abertas
+            abertas = [l for l in locacoes if l["status"] == "aberta"]
+            # mapeamos pela combinação cliente+placa+inicio
+            cliente, placa, inicio = vals[1], vals[4], vals[5]
+            idx = None
+            for i, l in enumerate(abertas):
+                if l["cliente_nome"] == cliente and l["carro"]["placa"] == placa and l["data_inicio"] == inicio:
+                    idx = i; break
+            if idx is None:
+                messagebox.showerror("Erro", "Não foi possível localizar a locação aberta selecionada.")
+                return
+
+            data_real = self.ent_data_real.get().strip()
+            forma = self.cbo_pgto.get() or "Pix"
+            valor_din = self.ent_valor_din.get().strip() if forma == "Dinheiro" else None
+
+            try:
+                qtd, total, troco = receber_carro_gui(idx, data_real, forma, valor_din)
+                self.refresh_all()
+                self.atualizar_rotulo_atrasos()
+                msg = f"Devolução registrada.\nDiárias: {qtd}\nTotal: R$ {total:.2f}"
+                if forma == "Dinheiro":
+                    msg += f"\nTroco: R$ {troco:.2f}"
+                messagebox.showinfo("OK", msg)
+                self.ent_data_real.delete(0, tk.END); self.ent_valor_din.delete(0, tk.END)
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
+
+        # ------ Relatórios ------
+        def _build_relatorios(self):
+            self.lbl_loc_abertas = ttk.Label(self.tab_relatorios, text="Abertas: 0")
+            self.lbl_loc_fechadas = ttk.Label(self.tab_relatorios, text="Fechadas: 0")
+            self.lbl_fat_real = ttk.Label(self.tab_relatorios, text="Faturamento realizado: R$ 0,00")
+            self.lbl_fat_prev = ttk.Label(self.tab_relatorios, text="Faturamento previsto: R$ 0,00")
+            self.lbl_total = ttk.Label(self.tab_relatorios, text="Total geral estimado: R$ 0,00")
+
+            pad = {"padx": 12, "pady": 8, "sticky": "w"}
+            ttk.Label(self.tab_relatorios, text="RELATÓRIOS", font=("TkDefaultFont", 12, "bold")).grid(row=0, column=0, **pad)
+            self.lbl_loc_abertas.grid(row=1, column=0, **pad)
+            self.lbl_loc_fechadas.grid(row=2, column=0, **pad)
+            self.lbl_fat_real.grid(row=3, column=0, **pad)
+            self.lbl_fat_prev.grid(row=4, column=0, **pad)
+            self.lbl_total.grid(row=5, column=0, **pad)
+
+            ttk.Button(self.tab_relatorios, text="Atualizar", command=self.refresh_relatorios)\
+                .grid(row=6, column=0, padx=12, pady=12, sticky="w")
+
+        # ------ Refresh helpers ------
+        def refresh_carros(self):
+            self.tree_carros.delete(*self.tree_carros.get_children())
+            for c in carros:
+                self.tree_carros.insert("", "end", values=(c["modelo"], c["placa"], c["cor"], f"{c['valor_diaria']:.2f}"))
+            self.cbo_placa["values"] = [c["placa"] for c in carros]
+
+        def refresh_clientes(self):
+            self.tree_clientes.delete(*self.tree_clientes.get_children())
+            for c in clientes:
+                self.tree_clientes.insert("", "end", values=(c["nome"], c["cpf"], c["celular"]))
+            self.cbo_cpf["values"] = [c["cpf"] for c in clientes]
+            self.mostrar_historico_cliente()
+
+        def refresh_locacoes(self):
+            self.tree_loc.delete(*self.tree_loc.get_children())
+            self._item_da_locacao = {}
+            for l in locacoes:
+                car = l["carro"]
+                tags = ("atrasada",) if id(l) in MONITOR_ATRASOS.atrasadas else ()
+                self._item_da_locacao[id(l)] = self.tree_loc.insert("", "end", tags=tags, values=(
+                    l["status"], l["cliente_nome"], l["cliente_cpf"],
+                    car["modelo"], car["placa"],
+                    l["data_inicio"], l["data_fim"],
+                    f"{l['valor_diaria']:.2f}", f"{l['valor_total']:.2f}",
+                    l.get("pagamento","-")
+                ))
+
+        def refresh_relatorios(self):
+            abertas = [l for l in locacoes if l["status"] == "aberta"]
+            fechadas = [l for l in locacoes if l["status"] == "fechada"]
+            fat_real = sum(l["valor_total"] for l in fechadas)
+            fat_prev = sum(l["valor_total"] for l in abertas)
+            self.lbl_loc_abertas.configure(text=f"Abertas: {len(abertas)}")
+            self.lbl_loc_fechadas.configure(text=f"Fechadas: {len(fechadas)}")
+            self.lbl_fat_real.configure(text=f"Faturamento realizado: R$ {fat_real:.2f}")
+            self.lbl_fat_prev.configure(text=f"Faturamento previsto: R$ {fat_prev:.2f}")
+            self.lbl_total.configure(text=f"Total geral estimado: R$ {fat_real + fat_prev:.2f}")
+
+        # ------ Monitor de atrasos ------
+        def verificar_atrasos(self):
+            """Retira do heap as locações que venceram, marca as linhas delas e reagenda."""
+            if self._id_monitor is not None:
+                self.after_cancel(self._id_monitor)
+            for loc in MONITOR_ATRASOS.verificar(date.today()):
+                item = self._item_da_locacao.get(id(loc))
+                if item is not None:
+                    self.tree_loc.item(item, tags=("atrasada",))
+                self.calendario.redesenhar()
+            self.atualizar_rotulo_atrasos()
+            self._id_monitor = self.after(INTERVALO_MONITOR_MS, self.verificar_atrasos)
+
+        def atualizar_rotulo_atrasos(self):
+            qtd, total = MONITOR_ATRASOS.encargos(date.today())
+            texto = f"Atrasadas: {qtd}"
+            if qtd:
+                texto += f" — encargos acumulados: R$ {total:.2f}"
+            self.lbl_atrasos.configure(text=texto)
+
+        def refresh_all(self):
+            self.refresh_carros()
+            self.refresh_clientes()
+            self.refresh_locacoes()
+            self.refresh_relatorios()
+            self.calendario.atualizar()
+    return App
 
 if __name__ == "__main__":
-    app = App()
+    app = carregar_interface()()
     # Dados de exemplo (opcional)
     # cadastrar_carro("Uno 1.0", "ABC1234", "Branco", "120")
     # cadastrar_cliente("Maria", "11122233344", "71 99999-0000")
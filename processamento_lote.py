@@ -0,0 +1,175 @@
+"""Processamento em lote (CSV/JSONL) para as calculadoras.
+
+Lê os registros em blocos, pontua cada bloco com a função da calculadora
+(opcionalmente num pool de processos) e grava os resultados à medida que
+os blocos ficam prontos, com memória constante.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+TAMANHO_BLOCO = 10_000
+INTERVALO_RELATORIO = 2.0  # segundos entre relatórios de progresso
+
+def _formato(caminho, formato=None):
+    if formato:
+        return formato
+    ext = os.path.splitext(caminho)[1].lower()
+    return "jsonl" if ext in (".jsonl", ".ndjson", ".json") else "csv"
+
+def _abrir(caminho, modo):
+    """Abre o arquivo ('-' = stdin/stdout). Devolve (arquivo, deve_fechar)."""
+    if caminho == "-":
+        return (sys.stdin if modo == "r" else sys.stdout), False
+    # utf-8-sig na leitura: planilhas salvas pelo Excel começam com BOM
+    return open(caminho, modo, newline="", encoding="utf-8-sig" if modo == "r" else "utf-8"), True
+
+def _ler_cabecalho(arquivo, formato):
+    """Lê o início da entrada. Devolve (campos, delimitador, linhas já lidas).
+    No CSV o delimitador é deduzido do cabeçalho (',', ';' ou tab); no JSONL
+    os campos vêm do primeiro registro e a linha dele volta para a fila."""
+    primeira = arquivo.readline().lstrip("\ufeff")  # stdin não passa pelo utf-8-sig
+    if formato == "jsonl":
+        campos = list(json.loads(primeira)) if primeira.strip() else []
+        return campos, None, [primeira]
+    delimitador = max((",", ";", "\t"), key=primeira.count)
+    campos = next(csv.reader([primeira], delimiter=delimitador), [])
+    return campos, delimitador, []
+
+def processar_bloco(pontuar_bloco, linhas, formato_entrada, formato_saida, campos_entrada,
+                    campos_saida, delimitador):
+    """Interpreta, pontua e serializa um bloco de linhas de texto.
+    Roda inteiro no processo de trabalho, para que o processo principal só
+    leia e grave texto. Devolve (texto, registros, registros com erro)."""
+    if formato_entrada == "jsonl":
+        registros = [json.loads(l) for l in linhas if l.strip()]
+    else:
+        registros = [dict(zip(campos_entrada, valores))
+                     for valores in csv.reader(linhas, delimiter=delimitador) if valores]
+    resultado = pontuar_bloco(registros)
+    erros = sum(1 for r in resultado if r.get("erro"))
+
+    if formato_saida == "jsonl":
+        texto = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in resultado)
+    else:
+        campos = _campos_csv(campos_entrada, campos_saida)
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=delimitador or ",", lineterminator="\n").writerows(
+            [r.get(c, "") for c in campos] for r in resultado)
+        texto = buffer.getvalue()
+    return texto, len(resultado), erros
+
+def _campos_csv(campos_entrada, campos_saida):
+    return list(dict.fromkeys(list(campos_entrada) + list(campos_saida)))
+
+def processar(entrada, saida, pontuar_bloco, campos_saida, formato_entrada=None, formato_saida=None,
+              tamanho_bloco=TAMANHO_BLOCO, processos=1, relatorio=None):
+    """Pontua `entrada` e grava em `saida`, bloco a bloco.
+
+    pontuar_bloco(lista de dicts) -> lista de dicts com os campos de
+    `campos_saida` (linhas com falha trazem o campo 'erro' preenchido); com
+    processos > 1 ela precisa ser uma função de módulo (serializável).
+    Os blocos são de `tamanho_bloco` linhas físicas, então campos CSV com
+    quebra de linha não são suportados. No pool ficam no máximo 2 blocos
+    por processo em voo, gravados na ordem de entrada.
+    relatorio(registros, erros, segundos) é chamado a cada INTERVALO_RELATORIO.
+    Devolve {'registros', 'erros', 'segundos', 'por_segundo'}."""
+    fmt_entrada = _formato(entrada, formato_entrada)
+    fmt_saida = _formato(saida, formato_saida)
+    arq_entrada, fechar_entrada = _abrir(entrada, "r")
+    arq_saida, fechar_saida = _abrir(saida, "w")
+    pool = ProcessPoolExecutor(processos) if processos > 1 else None
+
+    inicio = ultimo_relatorio = time.perf_counter()
+    total = erros = 0
+
+    def concluir(parcial):
+        nonlocal total, erros, ultimo_relatorio
+        texto, qtd, qtd_erros = parcial
+        arq_saida.write(texto)
+        total += qtd
+        erros += qtd_erros
+        agora = time.perf_counter()
+        if relatorio and agora - ultimo_relatorio >= INTERVALO_RELATORIO:
+            ultimo_relatorio = agora
+            relatorio(total, erros, agora - inicio)
+
+    try:
+        campos_entrada, delimitador, lidas = _ler_cabecalho(arq_entrada, fmt_entrada)
+        if fmt_saida == "csv":
+            csv.writer(arq_saida, delimiter=delimitador or ",", lineterminator="\n").writerow(
+                _campos_csv(campos_entrada, campos_saida))
+        linhas = chain(lidas, arq_entrada)
+        blocos = iter(lambda: list(islice(linhas, tamanho_bloco)), [])
+        argumentos = (fmt_entrada, fmt_saida, campos_entrada, campos_saida, delimitador)
+        if pool is None:
+            for bloco in blocos:
+                concluir(processar_bloco(pontuar_bloco, bloco, *argumentos))
+        else:
+            pendentes = deque()
+            for bloco in blocos:
+                pendentes.append(pool.submit(processar_bloco, pontuar_bloco, bloco, *argumentos))
+                if len(pendentes) >= 2 * processos:
+                    concluir(pendentes.popleft().result())
+            while pendentes:
+                concluir(pendentes.popleft().result())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if fechar_entrada:
+            arq_entrada.close()
+        if fechar_saida:
+            arq_saida.close()
+        else:
+            arq_saida.flush()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "registros": total,
+        "erros": erros,
+        "segundos": segundos,
+        "por_segundo": total / segundos if segundos > 0 else 0.0,
+    }
+
+def _imprimir_relatorio(registros, erros, segundos):
+    taxa = registros / segundos if segundos > 0 else 0.0
+    print(f"{registros} registros ({erros} com erro) em {segundos:.2f}s — {taxa:,.0f} registros/s",
+          file=sys.stderr)
+
+def main(argv, pontuar_bloco, campos_saida, descricao, opcoes=None):
+    """Entrada de linha de comando compartilhada pelas calculadoras.
+    opcoes(parser), se dada, acrescenta argumentos próprios e devolve
+    preparar(args, pontuar_bloco, campos_saida) -> (pontuar_bloco, campos_saida)."""
+    parser = argparse.ArgumentParser(description=descricao)
+    parser.add_argument("entrada", help="arquivo CSV ou JSONL de entrada ('-' = stdin)")
+    parser.add_argument("saida", help="arquivo CSV ou JSONL de saída ('-' = stdout)")
+    parser.add_argument("--formato-entrada", choices=("csv", "jsonl"),
+                        help="padrão: deduzido da extensão (csv se '-')")
+    parser.add_argument("--formato-saida", choices=("csv", "jsonl"))
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO,
+                        help=f"registros por bloco (padrão {TAMANHO_BLOCO})")
+    parser.add_argument("--processos", type=int, default=1,
+                        help="processos de trabalho (0 = um por CPU, padrão 1)")
+    parser.add_argument("--silencioso", action="store_true", help="não mostra o progresso")
+    preparar = opcoes(parser) if opcoes else None
+    args = parser.parse_args(argv)
+    if preparar:
+        pontuar_bloco, campos_saida = preparar(args, pontuar_bloco, campos_saida)
+
+    processos = args.processos or os.cpu_count() or 1
+    resultado = processar(
+        args.entrada, args.saida, pontuar_bloco, campos_saida,
+        formato_entrada=args.formato_entrada, formato_saida=args.formato_saida,
+        tamanho_bloco=max(1, args.bloco), processos=processos,
+        relatorio=None if args.silencioso else _imprimir_relatorio,
+    )
+    _imprimir_relatorio(resultado["registros"], resultado["erros"], resultado["segundos"])
+    return 0
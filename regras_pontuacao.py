@@ -0,0 +1,180 @@
+"""Motor de regras de pontuação compartilhado pelas calculadoras.
+
+Cada métrica (altura, gordura, IMMF, proporção ombro/cintura) é uma curva
+linear por partes declarada em regras_pontuacao.json: pontos de quebra
+(x, fração do máximo), o máximo de pontos e a fração antes do primeiro e
+depois do último ponto. Cada curva é compilada numa tabela por segmento
+(x inicial, largura, fração inicial, variação), avaliada com busca binária
+no caso escalar e com np.searchsorted no cálculo em lote.
+"""
+
+import bisect
+import json
+import os
+
+try:
+    import numpy as np
+except ImportError:  # só o cálculo em lote depende do NumPy
+    np = None
+
+ARQUIVO_REGRAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regras_pontuacao.json")
+METRICAS = ("altura", "gordura", "immf", "proporcao")
+ERRO_MEDIDAS = "Erro: Altura e cintura devem ser maiores que zero."
+
+_MODELOS = None  # cache de carregar_modelos() para o arquivo padrão
+
+class Curva:
+    """Curva linear por partes compilada.
+
+    `pontos` é uma lista de (x, fração) com x estritamente crescente. Entre
+    dois pontos a fração é interpolada; sobre o último ponto vale a fração
+    dele; antes do primeiro vale `antes` e depois do último vale `depois`.
+    O resultado é maximo * fração, nunca negativo (NaN vale 0)."""
+
+    def __init__(self, maximo, pontos, antes=0.0, depois=0.0):
+        if len(pontos) < 2:
+            raise ValueError("A curva precisa de pelo menos dois pontos.")
+        xs = [float(x) for x, _ in pontos]
+        ys = [float(y) for _, y in pontos]
+        if any(b <= a for a, b in zip(xs, xs[1:])):
+            raise ValueError("Os pontos da curva devem ter x estritamente crescente.")
+        self.maximo = float(maximo)
+        self.pontos = list(zip(xs, ys))
+        self.antes = float(antes)
+        self.depois = float(depois)
+
+        # tabela por segmento; o último ponto fecha o intervalo
+        self._xs = xs
+        self._x0 = xs[:-1]
+        self._dx = [b - a for a, b in zip(xs, xs[1:])]
+        self._y0 = ys[:-1]
+        self._dy = [b - a for a, b in zip(ys, ys[1:])]
+        self._x_ini, self._x_fim, self._y_fim = xs[0], xs[-1], ys[-1]
+        self._tabelas_np = None
+        if np is not None:
+            self._tabelas_np = tuple(np.array(t, dtype=float)
+                                     for t in (self._xs, self._x0, self._dx, self._y0, self._dy))
+
+    def __call__(self, x):
+        if x < self._x_ini:
+            fracao = self.antes
+        elif x >= self._x_fim:
+            fracao = self._y_fim if x == self._x_fim else self.depois
+        elif x >= self._x_ini:
+            i = bisect.bisect_right(self._xs, x) - 1
+            fracao = self._y0[i] + self._dy[i] * ((x - self._x0[i]) / self._dx[i])
+        else:  # NaN
+            return 0.0
+        pontos = self.maximo * fracao
+        return pontos if pontos > 0.0 else 0.0
+
+    def lote(self, x):
+        """Avalia a curva num array, com as mesmas operações de __call__."""
+        xs, x0, dx, y0, dy = self._tabelas_np
+        i = np.clip(np.searchsorted(xs, x, side="right") - 1, 0, len(x0) - 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fracao = y0[i] + dy[i] * ((x - x0[i]) / dx[i])
+        fracao = np.where(x < self._x_ini, self.antes, fracao)
+        fracao = np.where(x > self._x_fim, self.depois, fracao)
+        fracao = np.where(x == self._x_fim, self._y_fim, fracao)
+        pontos = self.maximo * fracao
+        return np.where(pontos > 0.0, pontos, 0.0)
+
+class ModeloPontuacao:
+    """Conjunto de curvas (uma por métrica) que forma uma calculadora.
+    Os pontos são somados na ordem em que as métricas aparecem na config."""
+
+    def __init__(self, nome, curvas, descricao=""):
+        desconhecidas = set(curvas) - set(METRICAS)
+        if desconhecidas:
+            raise ValueError(f"Métricas desconhecidas no modelo '{nome}': {', '.join(sorted(desconhecidas))}")
+        self.nome = nome
+        self.descricao = descricao
+        self.curvas = dict(curvas)
+        self.pontos_maximos = 0.0
+        for curva in self.curvas.values():
+            self.pontos_maximos += curva.maximo
+
+    @classmethod
+    def de_config(cls, nome, config):
+        curvas = {
+            metrica: Curva(c["maximo"], c["pontos"], c.get("antes", 0.0), c.get("depois", 0.0))
+            for metrica, c in config["metricas"].items()
+        }
+        return cls(nome, curvas, config.get("descricao", ""))
+
+    def pontuar(self, altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
+        """Retorna (dados, None) ou (None, mensagem de erro). `dados` tem
+        'immf', 'proporcao', 'pontos' (por métrica), 'pt', 'pm' e 'percentual'."""
+        quadrado_altura = altura_m * altura_m
+        if altura_m <= 0 or largura_cintura <= 0 or quadrado_altura == 0:  # 0 também por underflow
+            return None, ERRO_MEDIDAS
+
+        massa_magra = peso * (100 - percentual_gordura) / 100
+        immf = massa_magra / quadrado_altura
+        proporcao = largura_ombro / largura_cintura
+        valores = {"altura": altura_m, "gordura": percentual_gordura, "immf": immf, "proporcao": proporcao}
+
+        pontos = {metrica: curva(valores[metrica]) for metrica, curva in self.curvas.items()}
+        pontos_totais = 0.0
+        for p in pontos.values():
+            pontos_totais += p
+        dados = {
+            'immf': immf,
+            'proporcao': proporcao,
+            'pontos': pontos,
+            'pt': pontos_totais,
+            'pm': self.pontos_maximos,
+            'percentual': (pontos_totais / self.pontos_maximos) * 100,
+        }
+        return dados, None
+
+    def pontuar_lote(self, altura_m, peso, percentual_gordura, largura_ombro, largura_cintura):
+        """Versão vetorizada (NumPy) de pontuar: recebe sequências do mesmo
+        tamanho e devolve as mesmas chaves com arrays, mais 'valido' (False
+        onde altura ou cintura <= 0; nessas linhas os valores são NaN)."""
+        if np is None:
+            raise ImportError("O cálculo em lote requer o NumPy (pip install numpy).")
+        altura_m = np.asarray(altura_m, dtype=float)
+        peso = np.asarray(peso, dtype=float)
+        gordura = np.asarray(percentual_gordura, dtype=float)
+        ombro = np.asarray(largura_ombro, dtype=float)
+        cintura = np.asarray(largura_cintura, dtype=float)
+
+        quadrado_altura = altura_m * altura_m
+        valido = (altura_m > 0) & (cintura > 0) & (quadrado_altura != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            massa_magra = peso * (100 - gordura) / 100
+            immf = massa_magra / quadrado_altura
+            proporcao = ombro / cintura
+        valores = {"altura": altura_m, "gordura": gordura, "immf": immf, "proporcao": proporcao}
+
+        def invalidar(a):
+            return np.where(valido, a, np.nan)
+
+        pontos = {metrica: curva.lote(valores[metrica]) for metrica, curva in self.curvas.items()}
+        pontos_totais = np.zeros(valido.shape)
+        for p in pontos.values():
+            pontos_totais = pontos_totais + p
+        return {
+            'immf': invalidar(immf),
+            'proporcao': invalidar(proporcao),
+            'pontos': {metrica: invalidar(p) for metrica, p in pontos.items()},
+            'pt': invalidar(pontos_totais),
+            'pm': invalidar(np.full(valido.shape, self.pontos_maximos)),
+            'percentual': invalidar((pontos_totais / self.pontos_maximos) * 100),
+            'valido': valido,
+        }
+
+def carregar_modelos(caminho=ARQUIVO_REGRAS):
+    """Lê o arquivo de regras e devolve {nome: ModeloPontuacao}."""
+    with open(caminho, encoding="utf-8") as f:
+        config = json.load(f)
+    return {nome: ModeloPontuacao.de_config(nome, c) for nome, c in config.items()}
+
+def obter_modelo(nome):
+    """Modelo do arquivo de regras padrão (lido uma vez só)."""
+    global _MODELOS
+    if _MODELOS is None:
+        _MODELOS = carregar_modelos()
+    return _MODELOS[nome]
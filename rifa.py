@@ -1,43 +1,1039 @@
 # -*- coding: utf-8 -*-
+import bisect
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import os
 import random
-import tkinter as tk
-from tkinter import messagebox, scrolledtext
+import re
+import secrets
+import sys
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict
+from datetime import datetime
+
+# O Tk só é importado quando a interface abre (carregar_interface), para que
+# as funções da rifa possam ser usadas sem display, em lote ou num servidor.
+tk = ttk = filedialog = messagebox = scrolledtext = simpledialog = None
+
+
+def carregar_interface():
+    """Importa o tkinter para os nomes globais usados pelas telas."""
+    global tk, ttk, filedialog, messagebox, scrolledtext, simpledialog
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
+
 
 # -----------------------------
-# Estado do sistema
+# Inventário (bitset)
 # -----------------------------
-RIFA = {}  # {numero:int -> nome:str}
-NUMEROS_DISPONIVEIS = list(range(1, 101))
+_POPCOUNT_BYTE = bytes(bin(i).count("1") for i in range(256))
+_BLOCO_SELECAO = 4096  # bytes (32768 números) por bloco na busca por posição
+
+
+def _recortar(a: int, b: int, ini: int, fim: int):
+    """Gera (a, b) limitada a ini..fim, se sobrar algo."""
+    a, b = max(a, ini), min(b, fim)
+    if a <= b:
+        yield a, b
+
+
+class InventarioRifa:
+    """Números 1..tamanho guardados em um bitset (bit ligado = vendido).
+    Consulta/venda em O(1) e ~1 bit por número (125 KB para 1 milhão)."""
+
+    def __init__(self, tamanho: int):
+        if tamanho < 1:
+            raise ValueError("O tamanho da rifa deve ser maior que zero.")
+        self.tamanho = tamanho
+        self._bits = bytearray((tamanho + 7) // 8)
+        self._vendidos = 0
+
+    @classmethod
+    def de_bytes(cls, tamanho: int, dados: bytes) -> "InventarioRifa":
+        inv = cls(tamanho)
+        if len(dados) != len(inv._bits):
+            raise ValueError("Bitset com tamanho incompatível.")
+        inv._bits[:] = dados
+        inv._vendidos = inv.popcount()
+        return inv
+
+    def para_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+    def valido(self, numero: int) -> bool:
+        return 1 <= numero <= self.tamanho
+
+    def vendido(self, numero: int) -> bool:
+        i = numero - 1
+        return bool(self._bits[i >> 3] & (1 << (i & 7)))
+
+    def disponivel(self, numero: int) -> bool:
+        return self.valido(numero) and not self.vendido(numero)
+
+    def marcar_vendido(self, numero: int):
+        i = numero - 1
+        mascara = 1 << (i & 7)
+        if not self._bits[i >> 3] & mascara:
+            self._bits[i >> 3] |= mascara
+            self._vendidos += 1
+
+    def marcar_disponivel(self, numero: int):
+        i = numero - 1
+        mascara = 1 << (i & 7)
+        if self._bits[i >> 3] & mascara:
+            self._bits[i >> 3] &= ~mascara & 0xFF
+            self._vendidos -= 1
+
+    @property
+    def vendidos(self) -> int:
+        return self._vendidos
+
+    @property
+    def disponiveis(self) -> int:
+        return self.tamanho - self._vendidos
+
+    def popcount(self) -> int:
+        """Recontagem dos vendidos direto no bitset (usada para validar o contador)."""
+        return int.from_bytes(self._bits, "little").bit_count()
+
+    def selecionar_vendidos(self, posicoes):
+        """Para posições crescentes (0-based) na sequência de números vendidos,
+        gera os números correspondentes. Percorre o bitset uma única vez,
+        pulando blocos inteiros pela contagem de bits."""
+        it = iter(posicoes)
+        alvo = next(it, None)
+        contados = 0  # vendidos antes da posição atual da varredura
+        bits = self._bits
+        for ini in range(0, len(bits), _BLOCO_SELECAO):
+            if alvo is None:
+                return
+            bloco = bits[ini:ini + _BLOCO_SELECAO]
+            qtd = int.from_bytes(bloco, "little").bit_count()
+            if contados + qtd <= alvo:
+                contados += qtd
+                continue
+            for j, byte in enumerate(bloco):
+                c = _POPCOUNT_BYTE[byte]
+                while alvo is not None and contados + c > alvo:
+                    b = byte
+                    for _ in range(alvo - contados):
+                        b &= b - 1  # descarta os bits ligados anteriores
+                    yield (ini + j) * 8 + (b & -b).bit_length()
+                    alvo = next(it, None)
+                contados += c
+                if alvo is None:
+                    return
+
+    def _bits_da_faixa(self, ini: int, fim: int) -> int:
+        """Bits dos números ini..fim como inteiro (bit 0 = número `ini`)."""
+        i0, i1 = ini - 1, fim - 1
+        x = int.from_bytes(self._bits[i0 >> 3:(i1 >> 3) + 1], "little") >> (i0 & 7)
+        return x & ((1 << (fim - ini + 1)) - 1)
+
+    def vendidos_na_faixa(self, ini: int, fim: int) -> int:
+        return self._bits_da_faixa(ini, fim).bit_count()
+
+    def marcar_faixa_vendida(self, ini: int, fim: int) -> int:
+        """Marca ini..fim como vendidos de uma vez (bytes inteiros = 0xFF).
+        Retorna quantos números estavam livres."""
+        ja_vendidos = self.vendidos_na_faixa(ini, fim)
+        i0, i1 = ini - 1, fim - 1
+        b0, b1 = i0 >> 3, i1 >> 3
+        if b0 == b1:
+            self._bits[b0] |= ((1 << (i1 - i0 + 1)) - 1) << (i0 & 7)
+        else:
+            self._bits[b0] |= (0xFF << (i0 & 7)) & 0xFF
+            self._bits[b0 + 1:b1] = b"\xff" * (b1 - b0 - 1)
+            self._bits[b1] |= (1 << ((i1 & 7) + 1)) - 1
+        novos = (fim - ini + 1) - ja_vendidos
+        self._vendidos += novos
+        return novos
+
+    def faixas(self, vendidos: bool = False, ini: int = 1, fim: int | None = None):
+        """Gera (inicio, fim) das faixas contínuas de números livres (ou
+        vendidos) dentro de ini..fim. Bytes 0x00/0xFF (8 livres/8 vendidos)
+        são tratados sem olhar bit a bit."""
+        fim = self.tamanho if fim is None else min(fim, self.tamanho)
+        ini = max(ini, 1)
+        if ini > fim:
+            return
+        cheio, vazio = (0xFF, 0) if vendidos else (0, 0xFF)
+        alvo = 1 if vendidos else 0
+        inicio = None  # índice (0-based) onde a faixa atual começou
+        for idx in range((ini - 1) >> 3, ((fim - 1) >> 3) + 1):
+            byte = self._bits[idx]
+            base = idx * 8
+            if byte == cheio:
+                if inicio is None:
+                    inicio = base
+                continue
+            if byte == vazio:
+                if inicio is not None:
+                    yield from _recortar(inicio + 1, base, ini, fim)
+                    inicio = None
+                continue
+            for k in range(8):
+                if (byte >> k & 1) == alvo:
+                    if inicio is None:
+                        inicio = base + k
+                elif inicio is not None:
+                    yield from _recortar(inicio + 1, base + k, ini, fim)
+                    inicio = None
+        if inicio is not None:
+            yield from _recortar(inicio + 1, fim, ini, fim)
+
+    def faixas_disponiveis(self):
+        """Gera (inicio, fim) das faixas contínuas de números disponíveis."""
+        return self.faixas(vendidos=False)
+
+
+def interpretar_numeros(texto: str) -> list[tuple[int, int]]:
+    """Lê listas e faixas como "1-500, 700; 900-1200" (também "1–500" e
+    "1..500") e devolve faixas ordenadas, sem sobreposição nem repetição."""
+    texto = re.sub(r"\s*(?:-|–|\.\.)\s*", "-", texto.strip())
+    faixas = []
+    invalidos = []
+    for parte in re.split(r"[,;\s]+", texto):
+        if not parte:
+            continue
+        m = re.fullmatch(r"(\d+)(?:-(\d+))?", parte)
+        if m is None:
+            invalidos.append(parte)
+            continue
+        ini = int(m.group(1))
+        fim = int(m.group(2)) if m.group(2) else ini
+        if fim < ini:
+            invalidos.append(parte)
+            continue
+        faixas.append((ini, fim))
+    if invalidos:
+        amostra = ", ".join(invalidos[:10]) + (" ..." if len(invalidos) > 10 else "")
+        raise ValueError(f"Entrada inválida ({len(invalidos)} item(ns)): {amostra}")
+
+    faixas.sort()
+    unidas = []
+    for ini, fim in faixas:
+        if unidas and ini <= unidas[-1][1] + 1:
+            if fim > unidas[-1][1]:
+                unidas[-1] = (unidas[-1][0], fim)
+        else:
+            unidas.append((ini, fim))
+    return unidas
+
+
+def contar_faixas(faixas) -> int:
+    return sum(fim - ini + 1 for ini, fim in faixas)
+
+
+def _faixas_de_numeros(numeros_ordenados) -> list[tuple[int, int]]:
+    faixas = []
+    for n in numeros_ordenados:
+        if faixas and n == faixas[-1][1] + 1:
+            faixas[-1] = (faixas[-1][0], n)
+        else:
+            faixas.append((n, n))
+    return faixas
+
+
+def _remover_numeros(faixas, numeros_ordenados) -> list[tuple[int, int]]:
+    """Tira números (ordenados) de faixas ordenadas e disjuntas."""
+    resultado = []
+    it = iter(numeros_ordenados)
+    n = next(it, None)
+    for ini, fim in faixas:
+        while n is not None and n < ini:
+            n = next(it, None)
+        while n is not None and n <= fim:
+            if n > ini:
+                resultado.append((ini, n - 1))
+            ini = n + 1
+            n = next(it, None)
+        if ini <= fim:
+            resultado.append((ini, fim))
+    return resultado
+
+
+def resumir_erros(erros: dict, limite: int = 20) -> list[str]:
+    """{"já vendido": [(1, 10)], ...} -> ["10 número(s) já vendido: 1-10"]."""
+    return [f"{contar_faixas(fx)} número(s) {motivo}: {formatar_faixas(fx, limite)}"
+            for motivo, fx in erros.items() if fx]
+
+
+def formatar_faixas(faixas, limite: int | None = None) -> str:
+    """[(1, 5), (8, 8)] -> "1-5, 8". Com `limite`, mostra só as primeiras faixas."""
+    partes = []
+    for i, (ini, fim) in enumerate(faixas):
+        if limite is not None and i >= limite:
+            partes.append("...")
+            break
+        partes.append(str(ini) if ini == fim else f"{ini}-{fim}")
+    return ", ".join(partes)
+
+# -----------------------------
+# Configuração
+# -----------------------------
+TAMANHO_PADRAO = 100
+LIMITE_FAIXAS_EXIBIDAS = 2000
+LINHAS_POR_PAGINA = 200
+RESERVA_SEGUNDOS = 120.0
+DIRETORIO_DADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados_rifa")
+RIFA_INICIAL = "principal"
+
+
+def _chave_comprador(nome: str) -> str:
+    return nome.strip().casefold()
+
+
+class RandomAuditavel(random.Random):
+    """Gerador criptográfico e reproduzível: SHA-256 em modo contador sobre a
+    semente. Com a mesma semente e as mesmas vendas o sorteio se repete."""
+
+    def seed(self, a=None, version=2):
+        self.semente = secrets.token_hex(16) if a is None else str(a)
+        self._contador = 0
+        self._buffer = bytearray()
+
+    def _proximos_bytes(self, n: int) -> bytes:
+        while len(self._buffer) < n:
+            bloco = hashlib.sha256(f"{self.semente}:{self._contador}".encode("utf-8")).digest()
+            self._buffer += bloco
+            self._contador += 1
+        saida = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return saida
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("k deve ser não negativo.")
+        if k == 0:
+            return 0
+        n = (k + 7) // 8
+        return int.from_bytes(self._proximos_bytes(n), "big") >> (n * 8 - k)
+
+    def random(self) -> float:
+        return self.getrandbits(53) * (2.0 ** -53)
+
+    def getstate(self):
+        return self.semente, self._contador, bytes(self._buffer)
+
+    def setstate(self, state):
+        self.semente, self._contador, buf = state
+        self._buffer = bytearray(buf)
+
+
+# -----------------------------
+# Persistência (livro-razão)
+# -----------------------------
+class LivroRifa:
+    """Livro-razão da rifa em um diretório:
+    - vendas.log: log append-only, um JSON por linha, com número de sequência;
+      fsync em lotes (a cada LOTE_FSYNC registros ou INTERVALO_FSYNC segundos);
+    - snapshot.bin: foto compacta (cabeçalho JSON + bitset + números por
+      comprador em array binário). Ao gravar um snapshot o log é zerado.
+    Na carga, lê o snapshot e reaplica só os registros com seq posterior a ele.
+    """
+    ARQ_LOG = "vendas.log"
+    ARQ_SNAPSHOT = "snapshot.bin"
+    LOTE_FSYNC = 64
+    INTERVALO_FSYNC = 0.5
+    SNAPSHOT_A_CADA = 50_000
+
+    def __init__(self, diretorio: str):
+        os.makedirs(diretorio, exist_ok=True)
+        self.diretorio = diretorio
+        self.caminho_log = os.path.join(diretorio, self.ARQ_LOG)
+        self.caminho_snapshot = os.path.join(diretorio, self.ARQ_SNAPSHOT)
+        self.seq = 0
+        self._log = None
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+        self._desde_snapshot = 0
+        self._rifa = None  # rifa gravada nos snapshots periódicos
+
+    # ---- leitura ----
+    def carregar_snapshot(self):
+        """Retorna (inventario, compradores, sorteios) do snapshot ou None."""
+        if not os.path.exists(self.caminho_snapshot):
+            return None
+        with open(self.caminho_snapshot, "rb") as f:
+            cab = json.loads(f.readline())
+            inventario = InventarioRifa.de_bytes(cab["tamanho"], f.read((cab["tamanho"] + 7) // 8))
+            numeros = array("I")
+            numeros.frombytes(f.read())
+        compradores = {}
+        ini = 0
+        for nome, qtd in cab["compradores"]:
+            compradores[_chave_comprador(nome)] = {"nome": nome, "numeros": numeros[ini:ini + qtd].tolist()}
+            ini += qtd
+        self.seq = cab["seq"]
+        return inventario, compradores, cab["sorteios"]
+
+    def registros_pendentes(self):
+        """Gera os registros do log posteriores ao snapshot. Uma última linha
+        incompleta (queda no meio da escrita) é descartada do arquivo."""
+        if not os.path.exists(self.caminho_log):
+            return
+        valido_ate = 0
+        with open(self.caminho_log, "rb") as f:
+            for linha in f:
+                if not linha.endswith(b"\n"):
+                    break
+                try:
+                    reg = json.loads(linha)
+                except ValueError:
+                    break
+                valido_ate += len(linha)
+                if reg["seq"] > self.seq:
+                    self.seq = reg["seq"]
+                    self._desde_snapshot += 1
+                    yield reg
+        if valido_ate != os.path.getsize(self.caminho_log):
+            with open(self.caminho_log, "r+b") as f:
+                f.truncate(valido_ate)
+
+    # ---- escrita ----
+    def abrir(self, rifa):
+        self._rifa = rifa
+        self._log = open(self.caminho_log, "a", encoding="utf-8")
+
+    def registrar(self, registro: dict):
+        self.seq += 1
+        registro["seq"] = self.seq
+        self._log.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self._log.flush()
+        self._pendentes += 1
+        self._desde_snapshot += 1
+        if (self._pendentes >= self.LOTE_FSYNC
+                or time.monotonic() - self._ultimo_fsync >= self.INTERVALO_FSYNC):
+            self.sincronizar()
+        if self._desde_snapshot >= self.SNAPSHOT_A_CADA and self._rifa is not None:
+            self.gravar_snapshot(self._rifa)
+
+    def sincronizar(self):
+        if self._log is not None and self._pendentes:
+            os.fsync(self._log.fileno())
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def gravar_snapshot(self, rifa):
+        self._rifa = rifa
+        inventario = rifa.inventario
+        regs = list(rifa.compradores.values())
+        cab = {
+            "versao": 1,
+            "seq": self.seq,
+            "tamanho": inventario.tamanho,
+            "compradores": [[r["nome"], len(r["numeros"])] for r in regs],
+            "sorteios": rifa.sorteios,
+        }
+        numeros = array("I")
+        for r in regs:
+            numeros.extend(r["numeros"])
+        tmp = self.caminho_snapshot + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(cab, ensure_ascii=False).encode("utf-8") + b"\n")
+            f.write(inventario.para_bytes())
+            f.write(numeros.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.caminho_snapshot)
+        # registros até `seq` estão no snapshot; se cair antes de zerar o log,
+        # a carga os ignora pelo número de sequência
+        if self._log is not None:
+            self._log.truncate(0)
+            self.sincronizar()
+        self._desde_snapshot = 0
+
+    def fechar(self):
+        if self._log is None:
+            return
+        if self._rifa is not None and self._desde_snapshot:
+            self.gravar_snapshot(self._rifa)
+        self.sincronizar()
+        self._log.close()
+        self._log = None
 
-root = None
-status_label = None
 
 # -----------------------------
 # Lógica de negócio
 # -----------------------------
-def get_status_vendas() -> str:
-    if not RIFA:
-        return "Nenhuma rifa vendida ainda."
+class NumerosIndisponiveis(ValueError):
+    """Operação atômica recusada: nenhum número foi vendido/reservado."""
+
+    def __init__(self, erros: list[str]):
+        super().__init__("Números indisponíveis: " + ", ".join(erros))
+        self.erros = erros
+
+
+def _com_trava(metodo):
+    @functools.wraps(metodo)
+    def com_trava(self, *args, **kwargs):
+        with self._lock:
+            return metodo(self, *args, **kwargs)
+    return com_trava
+
+
+def _alteracao(metodo):
+    """Como _com_trava, mas recusa alterar uma rifa já descarregada."""
+    @functools.wraps(metodo)
+    def alteracao(self, *args, **kwargs):
+        with self._lock:
+            if self.fechada:
+                raise RuntimeError(f"A rifa '{self.nome}' foi descarregada; obtenha-a de novo no registro.")
+            return metodo(self, *args, **kwargs)
+    return alteracao
+
+
+class Rifa:
+    """Uma rifa isolada: vendas, inventário (bitset), índice de compradores,
+    histórico de sorteios e, se aberta de um diretório, o livro-razão.
+    Segura para vários vendedores em threads: toda alteração passa por uma trava."""
+
+    def __init__(self, nome: str = RIFA_INICIAL, tamanho: int = TAMANHO_PADRAO):
+        self.nome = nome
+        self.vendas = {}  # {numero:int -> nome:str}
+        self.inventario = InventarioRifa(tamanho)
+        # Índice reverso: nome.casefold() -> {"nome": str, "numeros": [int, ...] (ordenada)}
+        self.compradores = {}
+        self.sorteios = []  # [{"data", "semente", "vendidos", "numeros", "ganhadores"}]
+        self.livro = None
+        self.ultimo_acesso = time.monotonic()
+        self.fechada = False
+        self._lock = threading.RLock()
+        # Reservas temporárias (checkout): não vão para o livro-razão
+        self.reservas = {}        # numero -> token
+        self._reservas = {}       # token -> {"numeros": [int, ...], "expira": float (monotonic)}
+        self._expiracoes = []     # heap de (expira, token)
+
+    # ---- persistência ----
+    @classmethod
+    def abrir(cls, diretorio: str, nome: str | None = None) -> "Rifa":
+        """Carrega a rifa gravada em `diretorio` (snapshot + log) e passa a
+        registrar nele todas as operações seguintes."""
+        rifa = cls(nome or os.path.basename(os.path.normpath(diretorio)))
+        livro = LivroRifa(diretorio)
+        foto = livro.carregar_snapshot()
+        if foto is not None:
+            rifa.inventario, rifa.compradores, rifa.sorteios = foto
+            for reg in rifa.compradores.values():
+                rifa.vendas.update(dict.fromkeys(reg["numeros"], reg["nome"]))
+        for reg in livro.registros_pendentes():
+            rifa._aplicar_registro(reg)
+        livro.abrir(rifa)
+        rifa.livro = livro
+        return rifa
+
+    @_com_trava
+    def fechar(self):
+        self.fechada = True
+        if self.livro is not None:
+            self.livro.fechar()
+            self.livro = None
 
-    status_str = "--- STATUS DAS VENDAS ---\n"
-    compradores = {}
-    for numero, nome in RIFA.items():
-        compradores.setdefault(nome, []).append(numero)
+    @_com_trava
+    def sincronizar(self):
+        if self.livro is not None:
+            self.livro.sincronizar()
 
-    for nome, nums in sorted(compradores.items(), key=lambda x: x[0].lower()):
-        nums.sort()
-        status_str += f"Comprador: {nome:<20} | Números: {', '.join(map(str, nums))}\n"
+    def _registrar(self, registro: dict):
+        self.ultimo_acesso = time.monotonic()
+        if self.livro is not None:
+            self.livro.registrar(registro)
 
-    status_str += f"\nNúmeros vendidos: {len(RIFA)} de 100."
-    return status_str
+    def _aplicar_registro(self, reg: dict):
+        op = reg["op"]
+        if op == "nova":
+            self.nova(reg["tamanho"])
+        elif op == "venda" and "faixas" in reg:
+            self.vender_faixas(reg["nome"], [tuple(f) for f in reg["faixas"]])
+        elif op == "venda":
+            self.vender_numeros(reg["nome"], reg["numeros"])
+        elif op == "transferencia":
+            self.transferir(reg["numero"], reg["nome"])
+        elif op == "renomeacao":
+            self.renomear_comprador(reg["antigo"], reg["novo"])
+        elif op == "sorteio":
+            self.sorteios.append(reg["resultado"])
 
+    # ---- vendas ----
+    @_alteracao
+    def nova(self, tamanho: int):
+        """Descarta as vendas e recomeça com números de 1 a `tamanho`."""
+        self.inventario = InventarioRifa(tamanho)
+        self.vendas.clear()
+        self.compradores.clear()
+        self.sorteios.clear()
+        self.reservas.clear()
+        self._reservas.clear()
+        self._expiracoes.clear()
+        if self.livro is not None:
+            self._registrar({"op": "nova", "tamanho": tamanho})
+            self.livro.gravar_snapshot(self)
+
+    def _indexar(self, numero: int, nome: str) -> str:
+        """Inclui `numero` no índice do comprador; devolve o nome canônico
+        (a grafia do primeiro cadastro daquele comprador)."""
+        reg = self.compradores.setdefault(_chave_comprador(nome), {"nome": nome, "numeros": []})
+        bisect.insort(reg["numeros"], numero)
+        return reg["nome"]
+
+    def _desindexar(self, numero: int, nome: str):
+        chave = _chave_comprador(nome)
+        nums = self.compradores[chave]["numeros"]
+        del nums[bisect.bisect_left(nums, numero)]
+        if not nums:
+            del self.compradores[chave]
+
+    @_com_trava
+    def numeros_do_comprador(self, nome: str) -> list[int]:
+        reg = self.compradores.get(_chave_comprador(nome))
+        return list(reg["numeros"]) if reg else []
+
+    def _erro_numero(self, numero: int, token: str | None = None) -> str | None:
+        if not self.inventario.valido(numero):
+            return f"{numero} (fora do intervalo 1–{self.inventario.tamanho})"
+        if self.inventario.vendido(numero):
+            return f"{numero} (já vendido)"
+        dono = self.reservas.get(numero)
+        if dono is not None and dono != token:
+            return f"{numero} (reservado)"
+        return None
+
+    def _efetivar_venda(self, nome: str, numeros: list[int]):
+        inventario = self.inventario
+        for numero in numeros:
+            self.vendas[numero] = self._indexar(numero, nome)
+            inventario.marcar_vendido(numero)
+        if numeros:
+            self._registrar({"op": "venda", "nome": nome, "numeros": numeros})
+
+    @_alteracao
+    def vender_numeros(self, nome: str, numeros) -> tuple[int, list[str]]:
+        """Vende os números disponíveis para `nome`. Retorna (qtd_vendidos, erros)."""
+        self._limpar_reservas_expiradas()
+        erros = []
+        vendidos_agora = []
+        vistos = set()
+        for numero in numeros:
+            erro = self._erro_numero(numero) or (f"{numero} (já vendido)" if numero in vistos else None)
+            if erro:
+                erros.append(erro)
+            else:
+                vistos.add(numero)
+                vendidos_agora.append(numero)
+        self._efetivar_venda(nome, vendidos_agora)
+        return len(vendidos_agora), erros
+
+    def _verificar_todos(self, numeros, token: str | None = None) -> list[int]:
+        """Valida todos os números de uma vez; levanta NumerosIndisponiveis se algum falhar."""
+        numeros = list(numeros)
+        erros = [e for e in (self._erro_numero(n, token) for n in numeros) if e]
+        if len(set(numeros)) != len(numeros):
+            erros.append("números repetidos no pedido")
+        if not numeros:
+            erros.append("nenhum número informado")
+        if erros:
+            raise NumerosIndisponiveis(erros)
+        return numeros
+
+    def _indexar_lote(self, nome: str, faixas) -> str:
+        reg = self.compradores.setdefault(_chave_comprador(nome), {"nome": nome, "numeros": []})
+        nums = reg["numeros"]
+        for ini, fim in faixas:
+            nums.extend(range(ini, fim + 1))
+        nums.sort()  # Timsort junta as sequências já ordenadas em tempo linear
+        return reg["nome"]
+
+    @_alteracao
+    def vender_faixas(self, nome: str, faixas, tudo_ou_nada: bool = False) -> tuple[int, dict]:
+        """Venda em lote a partir de faixas ordenadas e disjuntas (ver
+        interpretar_numeros). A conferência com o inventário é feita faixa a
+        faixa no bitset. Retorna (qtd_vendidos, erros), onde erros agrupa por
+        motivo as faixas não vendidas. Com `tudo_ou_nada`, qualquer erro
+        levanta NumerosIndisponiveis e nada é vendido."""
+        self._limpar_reservas_expiradas()
+        inv = self.inventario
+        erros = {"fora do intervalo": [], "já vendido": [], "reservado": []}
+        livres = []
+        for ini, fim in faixas:
+            if ini < 1:
+                erros["fora do intervalo"].append((ini, min(fim, 0)))
+                ini = 1
+            if fim > inv.tamanho:
+                erros["fora do intervalo"].append((max(ini, inv.tamanho + 1), fim))
+                fim = inv.tamanho
+            if ini > fim:
+                continue
+            if inv.vendidos_na_faixa(ini, fim) == 0:
+                livres.append((ini, fim))
+            else:
+                livres.extend(inv.faixas(False, ini, fim))
+                erros["já vendido"].extend(inv.faixas(True, ini, fim))
 
-def sortear_ganhador() -> str:
-    if not RIFA:
-        return "Nenhum número vendido. Sorteio cancelado."
-    numero_sorteado = random.choice(list(RIFA.keys()))
-    ganhador = RIFA[numero_sorteado]
-    return f"=== SORTEIO ===\nNúmero sorteado: {numero_sorteado}\n🎉 Ganhador: {ganhador} 🎉"
+        if self.reservas and livres:
+            inicios = [f[0] for f in livres]
+            reservados = sorted(
+                n for n in self.reservas
+                if (i := bisect.bisect_right(inicios, n) - 1) >= 0 and n <= livres[i][1]
+            )
+            if reservados:
+                erros["reservado"] = _faixas_de_numeros(reservados)
+                livres = _remover_numeros(livres, reservados)
+
+        if tudo_ou_nada and any(erros.values()):
+            raise NumerosIndisponiveis(resumir_erros(erros))
+        if not livres:
+            return 0, erros
+
+        canonico = self._indexar_lote(nome, livres)
+        qtd = 0
+        for ini, fim in livres:
+            qtd += inv.marcar_faixa_vendida(ini, fim)
+            self.vendas.update(dict.fromkeys(range(ini, fim + 1), canonico))
+        self._registrar({"op": "venda", "nome": nome, "faixas": [list(f) for f in livres]})
+        return qtd, erros
+
+    @_alteracao
+    def vender_todos(self, nome: str, numeros) -> int:
+        """Venda atômica: vende todos os números para `nome` ou nenhum."""
+        self._limpar_reservas_expiradas()
+        numeros = self._verificar_todos(numeros)
+        self._efetivar_venda(nome, numeros)
+        return len(numeros)
+
+    # ---- reservas (checkout) ----
+    def _limpar_reservas_expiradas(self):
+        agora = time.monotonic()
+        while self._expiracoes and self._expiracoes[0][0] <= agora:
+            _, token = heapq.heappop(self._expiracoes)
+            self._liberar_reserva(token)
+
+    def _liberar_reserva(self, token: str) -> list[int]:
+        reserva = self._reservas.pop(token, None)
+        if reserva is None:
+            return []
+        for numero in reserva["numeros"]:
+            if self.reservas.get(numero) == token:
+                del self.reservas[numero]
+        return reserva["numeros"]
+
+    @_alteracao
+    def reservar(self, numeros, segundos: float = RESERVA_SEGUNDOS) -> str:
+        """Reserva atômica: segura todos os números por `segundos` ou nenhum.
+        Retorna o token a usar em confirmar_reserva/cancelar_reserva."""
+        self._limpar_reservas_expiradas()
+        numeros = self._verificar_todos(numeros)
+        token = secrets.token_hex(8)
+        expira = time.monotonic() + segundos
+        for numero in numeros:
+            self.reservas[numero] = token
+        self._reservas[token] = {"numeros": numeros, "expira": expira}
+        heapq.heappush(self._expiracoes, (expira, token))
+        return token
+
+    @_alteracao
+    def confirmar_reserva(self, token: str, nome: str) -> int:
+        """Vende para `nome` os números da reserva (se ainda não expirou)."""
+        self._limpar_reservas_expiradas()
+        if token not in self._reservas:
+            raise KeyError("Reserva inexistente ou expirada.")
+        numeros = self._liberar_reserva(token)
+        self._efetivar_venda(nome, numeros)
+        return len(numeros)
+
+    @_com_trava
+    def cancelar_reserva(self, token: str) -> int:
+        return len(self._liberar_reserva(token))
+
+    @_com_trava
+    def qtd_reservados(self) -> int:
+        self._limpar_reservas_expiradas()
+        return len(self.reservas)
+
+    @_alteracao
+    def transferir(self, numero: int, novo_nome: str) -> str:
+        """Passa um número vendido para outro comprador. Retorna o comprador anterior."""
+        if numero not in self.vendas:
+            raise KeyError(f"O número {numero} não foi vendido.")
+        antigo = self.vendas[numero]
+        self._desindexar(numero, antigo)
+        self.vendas[numero] = self._indexar(numero, novo_nome)
+        self._registrar({"op": "transferencia", "numero": numero, "nome": novo_nome})
+        return antigo
+
+    @_alteracao
+    def renomear_comprador(self, antigo: str, novo: str) -> int:
+        """Troca o nome de um comprador (sem diferenciar maiúsculas) em todos os
+        seus números. Só os números dele são tocados. Retorna quantos mudaram."""
+        reg = self.compradores.pop(_chave_comprador(antigo), None)
+        if reg is None:
+            return 0
+        destino = self.compradores.get(_chave_comprador(novo))
+        if destino is None:
+            destino = self.compradores[_chave_comprador(novo)] = {"nome": novo, "numeros": reg["numeros"]}
+        else:
+            # o novo nome já existe: junta os números dos dois
+            destino["numeros"] = sorted(destino["numeros"] + reg["numeros"])
+        for numero in reg["numeros"]:
+            self.vendas[numero] = destino["nome"]
+        self._registrar({"op": "renomeacao", "antigo": antigo, "novo": novo})
+        return len(reg["numeros"])
+
+    # ---- relatórios ----
+    def linhas_status_vendas(self):
+        """Gera o relatório de vendas linha a linha (sem montar uma string gigante)."""
+        with self._lock:
+            itens = [(reg["nome"], list(reg["numeros"])) for _, reg in sorted(self.compradores.items())]
+            vendidos, tamanho = self.inventario.vendidos, self.inventario.tamanho
+        if not itens:
+            yield "Nenhuma rifa vendida ainda."
+            return
+
+        yield "--- STATUS DAS VENDAS ---"
+        for nome, numeros in itens:
+            yield f"Comprador: {nome:<20} | Números: {formatar_faixas(_faixas_de_numeros(numeros))}"
+        yield ""
+        yield f"Números vendidos: {vendidos} de {tamanho}."
+
+    def exportar_status_vendas(self, caminho: str) -> int:
+        """Grava o relatório de vendas em arquivo, linha a linha. Retorna o nº de linhas."""
+        qtd = 0
+        with open(caminho, "w", encoding="utf-8") as f:
+            for linha in self.linhas_status_vendas():
+                f.write(linha)
+                f.write("\n")
+                qtd += 1
+        return qtd
+
+    # ---- sorteio ----
+    @_alteracao
+    def sortear(self, qtd_premios: int = 1, semente=None) -> dict:
+        """Sorteia `qtd_premios` números vendidos distintos (na ordem dos prêmios).
+        Sem semente, uma é gerada com `secrets` e registrada para auditoria."""
+        vendidos = self.inventario.vendidos
+        if not vendidos:
+            raise ValueError("Nenhum número vendido. Sorteio cancelado.")
+        if qtd_premios < 1 or qtd_premios > vendidos:
+            raise ValueError(f"Quantidade de prêmios deve estar entre 1 e {vendidos}.")
+
+        rng = RandomAuditavel(semente)
+        posicoes = rng.sample(range(vendidos), qtd_premios)
+        ordem = sorted(range(qtd_premios), key=posicoes.__getitem__)
+        numeros = [0] * qtd_premios
+        for i, numero in zip(ordem, self.inventario.selecionar_vendidos(posicoes[i] for i in ordem)):
+            numeros[i] = numero
+
+        resultado = {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "semente": rng.semente,
+            "vendidos": vendidos,
+            "numeros": numeros,
+            "ganhadores": [self.vendas[n] for n in numeros],
+        }
+        self.sorteios.append(resultado)
+        self._registrar({"op": "sorteio", "resultado": resultado})
+        return resultado
+
+
+class RegistroRifas:
+    """Várias rifas, cada uma em um subdiretório de `diretorio`.
+    As rifas são carregadas sob demanda e as ociosas são descarregadas
+    (com snapshot gravado); funciona sem Tk, para uso em lote."""
+
+    def __init__(self, diretorio: str, max_em_memoria: int = 8, tempo_ocioso: float = 600.0):
+        os.makedirs(diretorio, exist_ok=True)
+        self.diretorio = diretorio
+        self.max_em_memoria = max_em_memoria
+        self.tempo_ocioso = tempo_ocioso
+        self._abertas = OrderedDict()  # nome -> Rifa, da menos para a mais usada
+        self._fixadas = set()          # nunca descarregadas (ex.: rifa aberta na tela)
+        self._retidas = Counter()      # nome -> nº de janelas abertas sobre a rifa
+        self._lock = threading.RLock()
+
+    def _caminho(self, nome: str) -> str:
+        nome = nome.strip()
+        if not nome or nome in (".", "..") or any(c in nome for c in "/\\:"):
+            raise ValueError("Nome de rifa inválido.")
+        return os.path.join(self.diretorio, nome)
+
+    def nomes(self) -> list[str]:
+        return sorted(n for n in os.listdir(self.diretorio)
+                      if os.path.isdir(os.path.join(self.diretorio, n)))
+
+    def existe(self, nome: str) -> bool:
+        return nome in self._abertas or os.path.isdir(self._caminho(nome))
+
+    @_com_trava
+    def criar(self, nome: str, tamanho: int = TAMANHO_PADRAO) -> Rifa:
+        if self.existe(nome):
+            raise ValueError(f"Já existe uma rifa chamada '{nome}'.")
+        rifa = self.obter(nome)
+        rifa.nova(tamanho)
+        return rifa
+
+    @_com_trava
+    def obter(self, nome: str) -> Rifa:
+        """Devolve a rifa, carregando do disco se ainda não estiver em memória."""
+        rifa = self._abertas.get(nome)
+        if rifa is None:
+            rifa = Rifa.abrir(self._caminho(nome), nome)
+            self._abertas[nome] = rifa
+            self._descarregar_excedentes()
+        else:
+            self._abertas.move_to_end(nome)
+        rifa.ultimo_acesso = time.monotonic()
+        return rifa
+
+    @_com_trava
+    def fixar(self, nome: str | None):
+        """Mantém só `nome` fixada em memória (None = nenhuma)."""
+        self._fixadas = {nome} if nome else set()
+
+    @_com_trava
+    def reter(self, nome: str):
+        """Impede que `nome` seja descarregada até o soltar() correspondente."""
+        self._retidas[nome] += 1
+
+    @_com_trava
+    def soltar(self, nome: str):
+        self._retidas[nome] -= 1
+        if self._retidas[nome] <= 0:
+            del self._retidas[nome]
+
+    def _presa(self, nome: str) -> bool:
+        return nome in self._fixadas or nome in self._retidas
+
+    def em_memoria(self) -> list[str]:
+        return list(self._abertas)
+
+    @_com_trava
+    def descarregar(self, nome: str):
+        rifa = self._abertas.pop(nome, None)
+        if rifa is not None:
+            rifa.fechar()
+
+    def _descarregar_excedentes(self):
+        for nome in list(self._abertas):
+            if len(self._abertas) <= self.max_em_memoria:
+                break
+            if not self._presa(nome):
+                self.descarregar(nome)
+
+    @_com_trava
+    def descarregar_ociosas(self):
+        limite = time.monotonic() - self.tempo_ocioso
+        for nome, rifa in list(self._abertas.items()):
+            if not self._presa(nome) and rifa.ultimo_acesso < limite:
+                self.descarregar(nome)
+
+    @_com_trava
+    def sincronizar(self):
+        for rifa in self._abertas.values():
+            rifa.sincronizar()
+
+    @_com_trava
+    def fechar(self):
+        for nome in list(self._abertas):
+            self.descarregar(nome)
+
+    def vender_lote(self, pedidos) -> list[tuple[int, list[str]]]:
+        """Processa pedidos (rifa, comprador, números) sem interface gráfica.
+        Retorna, para cada pedido, (qtd_vendidos, erros)."""
+        resultados = []
+        for rifa, nome, numeros in pedidos:
+            # retida antes do obter(): outro thread carregando outra rifa não
+            # pode descarregá-la entre o obter() e a venda
+            self.reter(rifa)
+            try:
+                resultados.append(self.obter(rifa).vender_numeros(nome, numeros))
+            finally:
+                self.soltar(rifa)
+        return resultados
+
+
+def benchmark_vendas_concorrentes(tamanho: int = 200_000, vendedores: int = 8,
+                                  pedidos_por_vendedor: int = 20_000, lote: int = 3,
+                                  semente: int = 1) -> dict:
+    """Vários vendedores (threads) disputando os mesmos números com vendas
+    atômicas e reservas. Confere que nenhum número foi vendido duas vezes."""
+    rifa = Rifa("benchmark", tamanho)
+    vendidos_por_vendedor = [[] for _ in range(vendedores)]
+    recusados = [0] * vendedores
+    largada = threading.Barrier(vendedores)
+
+    def vendedor(i: int):
+        rng = random.Random(semente + i)
+        meus = vendidos_por_vendedor[i]
+        largada.wait()
+        for p in range(pedidos_por_vendedor):
+            numeros = rng.sample(range(1, tamanho + 1), lote)
+            try:
+                if p % 4 == 0:  # parte dos pedidos passa por reserva + confirmação
+                    token = rifa.reservar(numeros, segundos=5.0)
+                    rifa.confirmar_reserva(token, f"Vendedor {i}")
+                else:
+                    rifa.vender_todos(f"Vendedor {i}", numeros)
+                meus.extend(numeros)
+            except NumerosIndisponiveis:
+                recusados[i] += 1
+
+    threads = [threading.Thread(target=vendedor, args=(i,)) for i in range(vendedores)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duracao = time.perf_counter() - t0
+
+    todos = [n for meus in vendidos_por_vendedor for n in meus]
+    pedidos = vendedores * pedidos_por_vendedor
+    return {
+        "pedidos": pedidos,
+        "pedidos_por_segundo": pedidos / duracao,
+        "numeros_vendidos": len(todos),
+        "pedidos_recusados": sum(recusados),
+        "vendidos_em_duplicidade": len(todos) - len(set(todos)),
+        "consistente": len(todos) == len(rifa.vendas) == rifa.inventario.vendidos == rifa.inventario.popcount(),
+        "segundos": duracao,
+    }
+
+
+# -----------------------------
+# Estado da interface
+# -----------------------------
+REGISTRO = None   # RegistroRifas usado pela interface
+RIFA_ATIVA = Rifa()
+
+root = None
+_id_manutencao = None
+status_label = None
+rifa_var = None
+cbo_rifas = None
+
+
+def get_status_vendas() -> str:
+    return "\n".join(RIFA_ATIVA.linhas_status_vendas())
+
+
+def sortear_ganhador(qtd_premios: int = 1, semente=None) -> str:
+    try:
+        r = RIFA_ATIVA.sortear(qtd_premios, semente)
+    except ValueError as e:
+        return str(e)
+    if qtd_premios == 1:
+        texto = f"=== SORTEIO ===\nNúmero sorteado: {r['numeros'][0]}\n🎉 Ganhador: {r['ganhadores'][0]} 🎉"
+    else:
+        linhas = [f"{i}º prêmio: nº {n} – {g}"
+                  for i, (n, g) in enumerate(zip(r["numeros"][:20], r["ganhadores"]), start=1)]
+        if qtd_premios > 20:
+            linhas.append(f"... e mais {qtd_premios - 20} prêmio(s)")
+        texto = "=== SORTEIO ===\n🎉 Ganhadores 🎉\n" + "\n".join(linhas)
+    return texto + f"\n\nSemente (auditoria): {r['semente']}"
 
 
 # -----------------------------
@@ -45,15 +1041,29 @@ def sortear_ganhador() -> str:
 # -----------------------------
 def atualizar_status_principal():
     if status_label is not None:
-        status_label.config(text=f"Números vendidos: {len(RIFA)} de 100")
+        inv = RIFA_ATIVA.inventario
+        status_label.config(text=f"Números vendidos: {inv.vendidos} de {inv.tamanho}")
 
 
 # -----------------------------
 # Telas
 # -----------------------------
+def _reter_enquanto_aberta(janela, rifa: Rifa):
+    """A janela guarda a rifa aberta; sem isso, trocar de rifa e deixá-la
+    ociosa faria descarregar_ociosas fechá-la com a janela ainda na tela."""
+    REGISTRO.reter(rifa.nome)
+
+    def ao_destruir(evento):
+        if evento.widget is janela:
+            REGISTRO.soltar(rifa.nome)
+    janela.bind("<Destroy>", ao_destruir, add="+")
+
+
 def abrir_janela_cadastro():
+    rifa = RIFA_ATIVA
     janela = tk.Toplevel(root)
-    janela.title("Cadastrar Comprador")
+    _reter_enquanto_aberta(janela, rifa)
+    janela.title(f"Cadastrar Comprador – {rifa.nome}")
     janela.resizable(False, False)
 
     nome_var = tk.StringVar()
@@ -67,42 +1077,31 @@ def abrir_janela_cadastro():
             messagebox.showerror("Erro", "Preencha o nome e os números.")
             return
 
-        # normaliza, elimina vazios e repetidos
+        # normaliza faixas e listas, elimina vazios e repetidos
         try:
-            numeros_escolhidos = [int(x) for x in {p.strip() for p in entrada.split(',')} if x != ""]
-        except ValueError:
-            messagebox.showerror("Erro", "Números inválidos. Use apenas inteiros separados por vírgula.")
+            faixas = interpretar_numeros(entrada)
+        except ValueError as e:
+            messagebox.showerror("Erro", f"{e}\nUse inteiros e faixas, ex.: 1-500, 700, 900-1200.")
             return
 
-        if not numeros_escolhidos:
+        if not faixas:
             messagebox.showerror("Erro", "Nenhum número válido informado.")
             return
 
-        erros = []
-        vendidos = 0
-
-        for numero in numeros_escolhidos:
-            if numero < 1 or numero > 100:
-                erros.append(f"{numero} (fora do intervalo 1–100)")
-                continue
-            if numero not in NUMEROS_DISPONIVEIS:
-                erros.append(f"{numero} (já vendido)")
-                continue
-
-            RIFA[numero] = nome
-            NUMEROS_DISPONIVEIS.remove(numero)
-            vendidos += 1
+        vendidos, erros = rifa.vender_faixas(nome, faixas)
 
         if vendidos:
             messagebox.showinfo("Sucesso", f"{vendidos} número(s) cadastrado(s) para {nome}.")
-        if erros:
-            messagebox.showwarning("Atenção", "Alguns números não foram cadastrados: " + ", ".join(erros))
+        resumo = resumir_erros(erros)
+        if resumo:
+            messagebox.showwarning("Atenção", "Alguns números não foram cadastrados:\n" + "\n".join(resumo))
 
         numeros_var.set("")
         atualizar_status_principal()
 
-        # Atualiza label de disponíveis desta janela
-        lbl_disp.config(text=f"Disponíveis: {len(NUMEROS_DISPONIVEIS)}")
+        # Atualiza disponíveis desta janela
+        lbl_disp.config(text=f"Disponíveis: {rifa.inventario.disponiveis}")
+        preencher_disponiveis()
 
     # Layout
     frm = tk.Frame(janela, padx=10, pady=10)
@@ -111,30 +1110,38 @@ def abrir_janela_cadastro():
     tk.Label(frm, text="Nome do Comprador:").grid(row=0, column=0, sticky="w")
     tk.Entry(frm, textvariable=nome_var, width=38).grid(row=0, column=1, pady=4)
 
-    tk.Label(frm, text="Números (1–100, vírgula):").grid(row=1, column=0, sticky="w")
+    tk.Label(frm, text=f"Números (1–{rifa.inventario.tamanho}, ex.: 1-50, 70):").grid(row=1, column=0, sticky="w")
     tk.Entry(frm, textvariable=numeros_var, width=38).grid(row=1, column=1, pady=4)
 
     tk.Button(frm, text="Cadastrar",
               command=realizar_cadastro, bg="#4CAF50", fg="white").grid(row=2, column=0, columnspan=2, pady=8, sticky="ew")
 
     # Disponíveis (contador)
-    lbl_disp = tk.Label(frm, text=f"Disponíveis: {len(NUMEROS_DISPONIVEIS)}")
+    lbl_disp = tk.Label(frm, text=f"Disponíveis: {rifa.inventario.disponiveis}")
     lbl_disp.grid(row=3, column=0, columnspan=2, sticky="w", pady=(6, 0))
 
-    # Lista de disponíveis (opcional)
+    # Faixas de disponíveis (ex.: 1-50, 53, 60-100)
     caixa = scrolledtext.ScrolledText(frm, width=44, height=6)
     caixa.grid(row=4, column=0, columnspan=2, pady=6)
-    caixa.insert(tk.END, ", ".join(map(str, NUMEROS_DISPONIVEIS)))
-    caixa.config(state=tk.DISABLED)
+
+    def preencher_disponiveis():
+        caixa.config(state=tk.NORMAL)
+        caixa.delete("1.0", tk.END)
+        caixa.insert(tk.END, formatar_faixas(rifa.inventario.faixas_disponiveis(), LIMITE_FAIXAS_EXIBIDAS))
+        caixa.config(state=tk.DISABLED)
+
+    preencher_disponiveis()
 
 
 def abrir_janela_edicao():
-    if not RIFA:
+    rifa = RIFA_ATIVA
+    if not rifa.vendas:
         messagebox.showinfo("Aviso", "Não há números vendidos para editar.")
         return
 
     janela = tk.Toplevel(root)
-    janela.title("Editar / Transferir")
+    _reter_enquanto_aberta(janela, rifa)
+    janela.title(f"Editar / Transferir – {rifa.nome}")
     janela.resizable(False, False)
 
     # --- Alterar nome de um comprador (troca todos os números desse nome)
@@ -149,12 +1156,7 @@ def abrir_janela_edicao():
             messagebox.showerror("Erro", "Informe nome atual e novo nome.")
             return
 
-        alterado = False
-        for numero, nome in list(RIFA.items()):
-            if nome.lower() == antigo.lower():
-                RIFA[numero] = novo
-                alterado = True
-        if alterado:
+        if rifa.renomear_comprador(antigo, novo):
             messagebox.showinfo("Sucesso", f"Números de '{antigo}' atualizados para '{novo}'.")
             nome_antigo_var.set(""); nome_novo_var.set("")
         else:
@@ -181,15 +1183,14 @@ def abrir_janela_edicao():
             return
 
         novo_nome = novo_comprador_var.get().strip()
-        if numero not in RIFA:
+        if numero not in rifa.vendas:
             messagebox.showerror("Erro", f"O número {numero} não foi vendido.")
             return
         if not novo_nome:
             messagebox.showerror("Erro", "Informe o novo comprador.")
             return
 
-        antigo = RIFA[numero]
-        RIFA[numero] = novo_nome
+        antigo = rifa.transferir(numero, novo_nome)
         messagebox.showinfo("Sucesso", f"Número {numero} transferido de '{antigo}' para '{novo_nome}'.")
         numero_transferir_var.set(""); novo_comprador_var.set("")
 
@@ -203,48 +1204,187 @@ def abrir_janela_edicao():
 
 
 def abrir_janela_status():
+    rifa = RIFA_ATIVA
     janela = tk.Toplevel(root)
-    janela.title("Status das Vendas")
+    _reter_enquanto_aberta(janela, rifa)
+    janela.title(f"Status das Vendas – {rifa.nome}")
     janela.resizable(False, False)
 
     txt = scrolledtext.ScrolledText(janela, width=60, height=20, font=("Arial", 10))
-    txt.pack(padx=10, pady=10)
-    txt.insert(tk.END, get_status_vendas())
-    txt.config(state=tk.DISABLED)
+    txt.pack(padx=10, pady=(10, 4))
+
+    # Páginas são lidas do gerador só quando o usuário chega nelas
+    linhas = rifa.linhas_status_vendas()
+    paginas = []
+    estado = {"atual": 0, "fim": False}
+
+    def carregar_ate(i):
+        while len(paginas) <= i and not estado["fim"]:
+            pagina = list(itertools.islice(linhas, LINHAS_POR_PAGINA))
+            if pagina:
+                paginas.append(pagina)
+            if len(pagina) < LINHAS_POR_PAGINA:
+                estado["fim"] = True
+        return i < len(paginas)
+
+    def mostrar(i):
+        if not carregar_ate(i):
+            return
+        estado["atual"] = i
+        txt.config(state=tk.NORMAL)
+        txt.delete("1.0", tk.END)
+        txt.insert(tk.END, "\n".join(paginas[i]))
+        txt.config(state=tk.DISABLED)
+        tem_proxima = carregar_ate(i + 1)
+        btn_ant.config(state=tk.NORMAL if i > 0 else tk.DISABLED)
+        btn_prox.config(state=tk.NORMAL if tem_proxima else tk.DISABLED)
+        lbl_pag.config(text=f"Página {i + 1}" + ("" if not estado["fim"] else f" de {len(paginas)}"))
+
+    def exportar():
+        caminho = filedialog.asksaveasfilename(parent=janela, title="Exportar status",
+                                               defaultextension=".txt", filetypes=[("Texto", "*.txt")])
+        if not caminho:
+            return
+        try:
+            qtd = rifa.exportar_status_vendas(caminho)
+            messagebox.showinfo("Sucesso", f"{qtd} linha(s) exportada(s).", parent=janela)
+        except OSError as e:
+            messagebox.showerror("Erro", str(e), parent=janela)
+
+    nav = tk.Frame(janela)
+    nav.pack(fill="x", padx=10, pady=(0, 10))
+    btn_ant = tk.Button(nav, text="◀ Anterior", command=lambda: mostrar(estado["atual"] - 1))
+    btn_ant.pack(side="left")
+    lbl_pag = tk.Label(nav, text="")
+    lbl_pag.pack(side="left", padx=8)
+    btn_prox = tk.Button(nav, text="Próxima ▶", command=lambda: mostrar(estado["atual"] + 1))
+    btn_prox.pack(side="left")
+    tk.Button(nav, text="Exportar...", command=exportar).pack(side="right")
+
+    mostrar(0)
 
 
 def realizar_sorteio_gui():
-    resultado = sortear_ganhador()
+    qtd = 1
+    vendidos = RIFA_ATIVA.inventario.vendidos
+    if vendidos > 1:
+        qtd = simpledialog.askinteger("Sorteio", "Quantidade de prêmios:", parent=root,
+                                      minvalue=1, maxvalue=vendidos, initialvalue=1)
+        if qtd is None:
+            return
+    resultado = sortear_ganhador(qtd)
     if "Ganhador" in resultado:
         messagebox.showinfo("Sorteio Realizado", resultado)
     else:
         messagebox.showwarning("Sorteio Cancelado", resultado)
 
 
+def selecionar_rifa(nome: str):
+    """Torna `nome` a rifa da tela; rifas já em memória não são recarregadas."""
+    global RIFA_ATIVA
+    RIFA_ATIVA = REGISTRO.obter(nome)
+    REGISTRO.fixar(nome)
+    if rifa_var is not None:
+        rifa_var.set(nome)
+    atualizar_status_principal()
+
+
+def atualizar_lista_rifas():
+    if cbo_rifas is not None:
+        cbo_rifas["values"] = REGISTRO.nomes()
+
+
+def abrir_nova_rifa():
+    nome = simpledialog.askstring("Nova Rifa", "Nome da rifa:", parent=root)
+    if not nome:
+        return
+    tamanho = simpledialog.askinteger("Nova Rifa", "Quantidade de números:",
+                                      parent=root, minvalue=1, initialvalue=TAMANHO_PADRAO)
+    if tamanho is None:
+        return
+    try:
+        REGISTRO.criar(nome.strip(), tamanho)
+    except (ValueError, OSError) as e:
+        messagebox.showerror("Erro", str(e))
+        return
+    atualizar_lista_rifas()
+    selecionar_rifa(nome.strip())
+
+
+def manutencao_periodica():
+    global _id_manutencao
+    REGISTRO.sincronizar()
+    REGISTRO.descarregar_ociosas()
+    _id_manutencao = root.after(1000, manutencao_periodica)
+
+
+def sair():
+    global _id_manutencao
+    if _id_manutencao is not None:
+        root.after_cancel(_id_manutencao)
+        _id_manutencao = None
+    REGISTRO.fechar()
+    root.destroy()
+
+
 # -----------------------------
 # Janela principal
 # -----------------------------
-def criar_menu_principal():
-    global root, status_label
-    root = tk.Tk()
+def criar_menu_principal(master=None):
+    """Abre a janela principal. Sem `master` ela é a raiz do programa e roda o
+    mainloop; com `master` (o lançador) é um Toplevel dele. Devolve a janela."""
+    global root, status_label, rifa_var, cbo_rifas, REGISTRO
+    carregar_interface()
+    root = tk.Tk() if master is None else tk.Toplevel(master)
     root.title("Sistema de Rifas")
-    root.geometry("420x360")
+    root.geometry("420x440")
     root.resizable(False, False)
 
     tk.Label(root, text="GERENCIAMENTO DE RIFA", font=("Arial", 16, "bold")).pack(pady=12)
 
+    frm_rifa = tk.Frame(root)
+    frm_rifa.pack(pady=(0, 6))
+    tk.Label(frm_rifa, text="Rifa:").pack(side="left")
+    rifa_var = tk.StringVar()
+    cbo_rifas = ttk.Combobox(frm_rifa, textvariable=rifa_var, state="readonly", width=26)
+    cbo_rifas.pack(side="left", padx=6)
+    cbo_rifas.bind("<<ComboboxSelected>>", lambda _e: selecionar_rifa(rifa_var.get()))
+
     tk.Button(root, text="1. Cadastrar Compradores", width=36, command=abrir_janela_cadastro).pack(pady=5)
     tk.Button(root, text="2. Listar Status das Vendas", width=36, command=abrir_janela_status).pack(pady=5)
     tk.Button(root, text="3. Editar Comprador / Transferir", width=36, command=abrir_janela_edicao).pack(pady=5)
     tk.Button(root, text="4. REALIZAR SORTEIO", width=36, command=realizar_sorteio_gui, bg="orange").pack(pady=12)
 
-    status_label = tk.Label(root, text=f"Números vendidos: {len(RIFA)} de 100", fg="blue")
+    tk.Button(root, text="Nova Rifa...", width=36, command=abrir_nova_rifa).pack(pady=5)
+
+    status_label = tk.Label(root, fg="blue")
     status_label.pack(pady=6)
 
-    tk.Button(root, text="Sair", width=36, command=root.quit, bg="#cc0000", fg="white").pack(pady=6)
+    tk.Button(root, text="Sair", width=36, command=sair, bg="#cc0000", fg="white").pack(pady=6)
+    root.protocol("WM_DELETE_WINDOW", sair)
+
+    try:
+        REGISTRO = RegistroRifas(DIRETORIO_DADOS)
+        nomes = REGISTRO.nomes()
+        if not nomes:
+            REGISTRO.criar(RIFA_INICIAL)
+            nomes = [RIFA_INICIAL]
+        atualizar_lista_rifas()
+        selecionar_rifa(nomes[0])
+    except (OSError, ValueError, KeyError) as e:
+        messagebox.showerror("Erro", f"Não foi possível carregar as rifas gravadas: {e}")
+        root.destroy()
+        return None
+    manutencao_periodica()
 
-    root.mainloop()
+    if master is None:
+        root.mainloop()
+    return root
 
 
 if __name__ == "__main__":
-    criar_menu_principal()
+    if "--benchmark" in sys.argv:
+        for chave, valor in benchmark_vendas_concorrentes().items():
+            print(f"{chave}: {valor:.2f}" if isinstance(valor, float) else f"{chave}: {valor}")
+    else:
+        criar_menu_principal()
@@ -0,0 +1,284 @@
+"""Simulação de Monte Carlo da demanda e do faturamento da locadora.
+
+Para cada configuração de frota (quantidade de carros x valor da diária)
+roda milhares de cenários independentes: a cada dia chegam pedidos
+(Poisson, com a demanda caindo conforme a diária sobe), cada um com uma
+duração e um eventual atraso na devolução. Pedido sem carro livre é
+recusado. O faturamento segue as regras de dias() da locadora e só conta
+as devoluções dentro do horizonte.
+
+    python simulacao_locadora.py --frotas 20,30,40 --diarias 90,120,150
+    python simulacao_locadora.py --cenarios 200 --processos 4 --json resultado.json
+    python simulacao_locadora.py --cenarios 20 --conferir-nucleo
+
+Cada cenário tem a própria semente, derivada de --semente, da configuração
+e do número do cenário, então o resultado não depende da quantidade de
+processos. Com --nucleo os cenários passam pelas funções reais
+(agendar_locacao_gui / receber_carro_gui) em vez do caminho rápido;
+--conferir-nucleo roda os dois e compara.
+"""
+
+import argparse
+import heapq
+import importlib.util
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+CENARIOS_POR_TAREFA = 50
+DATA_BASE = date(2026, 1, 1)  # dia 0 dos cenários no caminho pelo núcleo
+
+PARAMETROS_PADRAO = {
+    "dias": 365,
+    "demanda": 8.0,            # pedidos por dia com a diária no preço de referência
+    "preco_referencia": 120.0,
+    "elasticidade": 1.2,       # demanda ~ (diária / referência) ** -elasticidade
+    "duracao_media": 4.0,      # diárias pedidas (geométrica, mínimo 1)
+    "prob_atraso": 0.1,
+    "atraso_medio": 2.0,       # dias a mais quando há atraso (geométrica)
+}
+
+_locadora = None  # módulo da locadora, carregado uma vez por processo
+
+def _carregar_locadora():
+    """Importa "locadora de veículos.py" (o nome tem espaços e acento)."""
+    global _locadora
+    if _locadora is None:
+        spec = importlib.util.spec_from_file_location(
+            "locadora_veiculos", os.path.join(DIRETORIO, "locadora de veículos.py"))
+        _locadora = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_locadora)
+    return _locadora
+
+# ===== Geração da demanda =====
+def _poisson(rng, media):
+    """Knuth; as médias diárias aqui são pequenas."""
+    limite = math.exp(-media)
+    k, produto = 0, rng.random()
+    while produto > limite:
+        k += 1
+        produto *= rng.random()
+    return k
+
+def _geometrica(rng, media):
+    """Inteiro >= 1 com a média dada."""
+    if media <= 1:
+        return 1
+    return max(1, math.ceil(math.log(1.0 - rng.random()) / math.log(1.0 - 1.0 / media)))
+
+def gerar_demanda(rng, params, diaria):
+    """Pedidos de cada dia do horizonte: lista de (diárias pedidas, dias de atraso).
+    Todos os sorteios são feitos aqui, antes do atendimento, para que o
+    caminho rápido e o do núcleo vejam exatamente os mesmos pedidos."""
+    media = params["demanda"] * (diaria / params["preco_referencia"]) ** -params["elasticidade"]
+    for _ in range(params["dias"]):
+        pedidos = []
+        for _ in range(_poisson(rng, media)):
+            duracao = _geometrica(rng, params["duracao_media"])
+            atraso = _geometrica(rng, params["atraso_medio"]) if rng.random() < params["prob_atraso"] else 0
+            pedidos.append((duracao, atraso))
+        yield pedidos
+
+def semente_cenario(semente, frota, diaria, cenario):
+    return f"{semente}:{frota}:{diaria!r}:{cenario}"
+
+# ===== Atendimento =====
+def _resultado(receita, ocupados, pedidos, recusados, frota, dias_horizonte):
+    return {
+        "receita": round(receita, 2),
+        "utilizacao": ocupados / (frota * dias_horizonte) if frota else 0.0,
+        "rejeicao": recusados / pedidos if pedidos else 0.0,
+    }
+
+def simular_rapido(frota, diaria, params, rng):
+    """Um cenário só com contadores e um heap de devoluções."""
+    dias_horizonte = params["dias"]
+    livres = frota
+    devolucoes = []  # (dia da devolução, dia do início)
+    receita = 0.0
+    ocupados = pedidos = recusados = 0
+    for dia, chegadas in enumerate(gerar_demanda(rng, params, diaria)):
+        while devolucoes and devolucoes[0][0] <= dia:
+            fim, ini = heapq.heappop(devolucoes)
+            livres += 1
+            receita += round(max(fim - ini, 1) * diaria, 2)  # mesma conta de receber_carro_gui
+            ocupados += fim - ini
+        for duracao, atraso in chegadas:
+            pedidos += 1
+            if livres:
+                livres -= 1
+                heapq.heappush(devolucoes, (dia + duracao + atraso, dia))
+            else:
+                recusados += 1
+    ocupados += sum(min(fim, dias_horizonte) - ini for fim, ini in devolucoes)
+    return _resultado(receita, ocupados, pedidos, recusados, frota, dias_horizonte)
+
+def simular_nucleo(frota, diaria, params, rng):
+    """O mesmo cenário passando pelas funções da locadora (bem mais lento)."""
+    loc = _carregar_locadora()
+    loc.limpar_dados()
+    loc.cadastrar_cliente("Simulação", "0", "-")
+    for i in range(frota):
+        loc.cadastrar_carro("Simulado", f"SIM{i:05d}", "-", str(diaria))
+
+    def data(dia):
+        return (DATA_BASE + timedelta(days=dia)).isoformat()
+
+    dias_horizonte = params["dias"]
+    devolucoes = []  # (dia da devolução, sequência, dia do início, locação)
+    sequencia = 0
+    receita = 0.0
+    ocupados = pedidos = recusados = 0
+    for dia, chegadas in enumerate(gerar_demanda(rng, params, diaria)):
+        while devolucoes and devolucoes[0][0] <= dia:
+            fim, _, ini, aberta = heapq.heappop(devolucoes)
+            abertas = [l for l in loc.locacoes if l["status"] == "aberta"]
+            idx = next(i for i, l in enumerate(abertas) if l is aberta)
+            _, total, _ = loc.receber_carro_gui(idx, data(fim), "Pix")
+            receita += total
+            ocupados += fim - ini
+        for duracao, atraso in chegadas:
+            pedidos += 1
+            if loc.carros:
+                loc.agendar_locacao_gui("0", loc.carros[0]["placa"], data(dia), data(dia + duracao))
+                sequencia += 1
+                heapq.heappush(devolucoes, (dia + duracao + atraso, sequencia, dia, loc.locacoes[-1]))
+            else:
+                recusados += 1
+    ocupados += sum(min(fim, dias_horizonte) - ini for fim, _, ini, _ in devolucoes)
+    return _resultado(receita, ocupados, pedidos, recusados, frota, dias_horizonte)
+
+def simular_tarefa(frota, diaria, params, semente, inicio, quantidade, nucleo=False):
+    """Cenários [inicio, inicio + quantidade) de uma configuração (roda no pool)."""
+    simular = simular_nucleo if nucleo else simular_rapido
+    return [simular(frota, diaria, params, random.Random(semente_cenario(semente, frota, diaria, c)))
+            for c in range(inicio, inicio + quantidade)]
+
+# ===== Agregação =====
+def _percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+def resumir(cenarios):
+    receitas = sorted(c["receita"] for c in cenarios)
+    return {
+        "cenarios": len(cenarios),
+        "receita_media": statistics.fmean(receitas),
+        "receita_desvio": statistics.pstdev(receitas),
+        "receita_p05": _percentil(receitas, 0.05),
+        "receita_p95": _percentil(receitas, 0.95),
+        "utilizacao_media": statistics.fmean(c["utilizacao"] for c in cenarios),
+        "rejeicao_media": statistics.fmean(c["rejeicao"] for c in cenarios),
+    }
+
+def simular(frotas, diarias, cenarios, params=None, semente=0, processos=1, nucleo=False,
+            por_tarefa=CENARIOS_POR_TAREFA):
+    """Roda `cenarios` cenários para cada (frota, diária). Devolve
+    ({(frota, diária): resumo}, {(frota, diária): lista de cenários})."""
+    params = {**PARAMETROS_PADRAO, **(params or {})}
+    configuracoes = [(f, d) for f in frotas for d in diarias]
+    tarefas = [(f, d, inicio, min(por_tarefa, cenarios - inicio))
+               for f, d in configuracoes for inicio in range(0, cenarios, por_tarefa)]
+    brutos = {c: [] for c in configuracoes}
+    if processos > 1:
+        with ProcessPoolExecutor(processos) as pool:
+            futuros = [pool.submit(simular_tarefa, f, d, params, semente, ini, qtd, nucleo)
+                       for f, d, ini, qtd in tarefas]
+            for (f, d, _, _), futuro in zip(tarefas, futuros):
+                brutos[(f, d)] += futuro.result()
+    else:
+        for f, d, ini, qtd in tarefas:
+            brutos[(f, d)] += simular_tarefa(f, d, params, semente, ini, qtd, nucleo)
+    return {c: resumir(r) for c, r in brutos.items()}, brutos
+
+def _positivo(tipo):
+    """Conversor do argparse que só aceita valores de `tipo` maiores que zero."""
+    def converter(texto):
+        try:
+            valor = tipo(texto)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"valor inválido: {texto!r}")
+        if not valor > 0:
+            raise argparse.ArgumentTypeError(f"deve ser maior que zero: {texto!r}")
+        return valor
+    converter.__name__ = tipo.__name__
+    return converter
+
+def _lista(tipo):
+    """Conversor do argparse para "20,30,40" (ou ';'), com valores positivos."""
+    item = _positivo(tipo)
+
+    def converter(texto):
+        valores = [item(v.strip()) for v in texto.replace(";", ",").split(",") if v.strip()]
+        if not valores:
+            raise argparse.ArgumentTypeError("informe ao menos um valor")
+        return valores
+    return converter
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação de demanda e faturamento da frota.")
+    parser.add_argument("--frotas", type=_lista(int), default="20,30,40",
+                        help="quantidades de carros (padrão 20,30,40)")
+    parser.add_argument("--diarias", type=_lista(float), default="90,120,150",
+                        help="valores de diária (padrão 90,120,150)")
+    parser.add_argument("--cenarios", type=_positivo(int), default=2000,
+                        help="cenários por configuração (padrão 2000)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--processos", type=int, default=0, help="processos de trabalho (0 = um por CPU)")
+    for nome, valor in PARAMETROS_PADRAO.items():
+        tipo = _positivo(int) if nome == "dias" else type(valor)
+        parser.add_argument("--" + nome.replace("_", "-"), type=tipo, default=valor,
+                            help=f"padrão {valor}")
+    parser.add_argument("--nucleo", action="store_true",
+                        help="atende os pedidos com as funções da locadora (lento)")
+    parser.add_argument("--conferir-nucleo", action="store_true",
+                        help="roda os dois caminhos e confere se dão o mesmo resultado")
+    parser.add_argument("--json", metavar="ARQUIVO", help="grava o resumo em JSON")
+    args = parser.parse_args(argv)
+
+    params = {nome: getattr(args, nome) for nome in PARAMETROS_PADRAO}
+    frotas, diarias = args.frotas, args.diarias
+    processos = args.processos or os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    resumo, brutos = simular(frotas, diarias, args.cenarios, params, args.semente, processos, args.nucleo)
+    segundos = time.perf_counter() - inicio
+    total = args.cenarios * len(resumo)
+    print(f"{total} cenários de {params['dias']} dias em {segundos:.2f}s ({total / segundos:,.0f} cenários/s,"
+          f" {processos} processo(s))")
+    print(f"{'frota':>6} {'diária':>8} {'receita média':>15} {'desvio':>12} {'p05':>12} {'p95':>12}"
+          f" {'utilização':>11} {'recusa':>8}")
+    for (frota, diaria), r in resumo.items():
+        print(f"{frota:>6} {diaria:>8.2f} {r['receita_media']:>15,.2f} {r['receita_desvio']:>12,.2f}"
+              f" {r['receita_p05']:>12,.2f} {r['receita_p95']:>12,.2f}"
+              f" {r['utilizacao_media']:>10.1%} {r['rejeicao_media']:>8.1%}")
+
+    falhou = False
+    if args.conferir_nucleo:
+        _, outros = simular(frotas, diarias, args.cenarios, params, args.semente, processos, not args.nucleo)
+        divergentes = sum(
+            1 for c in brutos for a, b in zip(brutos[c], outros[c])
+            if abs(a["receita"] - b["receita"]) > 0.005 or a["utilizacao"] != b["utilizacao"]
+            or a["rejeicao"] != b["rejeicao"])
+        print(f"conferência com o {'caminho rápido' if args.nucleo else 'núcleo'}: "
+              + ("OK" if not divergentes else f"{divergentes} cenários divergentes"))
+        falhou = divergentes > 0
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"parametros": {**params, "semente": args.semente, "cenarios": args.cenarios},
+                       "configuracoes": [{"frota": f_, "diaria": d, **r} for (f_, d), r in resumo.items()]},
+                      f, ensure_ascii=False, indent=2)
+        print(f"resumo gravado em {args.json}")
+    return 1 if falhou else 0
+
+if __name__ == "__main__":
+    sys.exit(main())